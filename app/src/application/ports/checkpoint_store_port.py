@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class CheckpointStorePort(ABC):
+    @abstractmethod
+    def load(self, run_id: str) -> Optional[dict]:
+        pass
+
+    @abstractmethod
+    def save(self, run_id: str, checkpoint: dict) -> None:
+        pass
@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class ChunkIndexPort(ABC):
+    @abstractmethod
+    def load(self, page_id: str) -> Optional[dict]:
+        pass
+
+    @abstractmethod
+    def save(self, page_id: str, index: dict) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, page_id: str) -> None:
+        pass
@@ -0,0 +1,14 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+
+class DocumentArchivePort(ABC):
+    @abstractmethod
+    def archive_many(self, object_names: List[str]) -> Dict[str, str]:
+        """Copia los objetos vigentes al archivo; retorna {objeto: error} de los que fallaron."""
+        pass
+
+    @abstractmethod
+    def delete_many(self, object_names: List[str]) -> Dict[str, str]:
+        """Elimina los objetos vigentes; retorna {objeto: error} de los que fallaron."""
+        pass
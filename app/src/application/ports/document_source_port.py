@@ -1,6 +1,15 @@
 from abc import ABC, abstractmethod
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 class DocumentSourcePort(ABC):
     @abstractmethod
     def get_page(self, page_id: str) -> dict:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def get_pages(self, page_ids: Iterable[str]) -> Iterator[dict]:
+        pass
+
+    @abstractmethod
+    def iter_page_batches(self, cql: str, cursor: Optional[str] = None) -> Iterator[Tuple[List[dict], Optional[str]]]:
+        pass
@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+
+
+class IngestionJobConflictError(ValueError):
+    """El data source ya tiene un ingestion job en curso."""
+
+
+class KnowledgeBaseIngestionPort(ABC):
+    @abstractmethod
+    def start_ingestion_job(self, knowledge_base_id: str, data_source_id: str, description: str = "") -> dict:
+        pass
+
+    @abstractmethod
+    def get_ingestion_job(self, knowledge_base_id: str, data_source_id: str, ingestion_job_id: str) -> dict:
+        pass
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Dict, List
 
 
 class LandingZonePort(ABC):
@@ -6,6 +7,14 @@ class LandingZonePort(ABC):
     def save(self, key: str, content: dict) -> dict:
         pass
 
+    @abstractmethod
+    def save_many(self, contents: Dict[str, dict], all_or_nothing: bool = False) -> List[dict]:
+        pass
+
+    @abstractmethod
+    def delete_many(self, keys: List[str]) -> Dict[str, str]:
+        pass
+
     @abstractmethod
     def get_document(self, document_uri: str) -> dict:
         pass
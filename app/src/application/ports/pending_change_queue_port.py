@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+
+class PendingChangeQueuePort(ABC):
+
+    @abstractmethod
+    def publish(self, changes: List[dict]) -> None:
+        pass
+
+    @abstractmethod
+    def requeue(self, changes: List[dict], delay_seconds: int) -> None:
+        pass
@@ -1,9 +1,9 @@
 from abc import ABC, abstractmethod
 
-from app.src.domain.converse.types.converse_input import ConverseInput
+from app.src.domain.model.document_event import DocumentEvent
 
 
 class ProcessUseCaseInterface(ABC):
     @abstractmethod
-    def process(self, input: ConverseInput):
+    def process(self, event: DocumentEvent):
         pass
@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+
+class SyncManifestPort(ABC):
+    @abstractmethod
+    def get(self, page_id: str) -> Optional[dict]:
+        pass
+
+    @abstractmethod
+    def put(self, page_id: str, entry: dict) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, page_id: str) -> None:
+        pass
+
+    @abstractmethod
+    def delete_many(self, page_ids: List[str]) -> Dict[str, str]:
+        """Elimina las entradas de varias páginas; retorna {page_id: error} de las que fallaron."""
+        pass
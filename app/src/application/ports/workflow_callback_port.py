@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+
+
+class WorkflowCallbackPort(ABC):
+
+    @abstractmethod
+    def notify_success(self, task_token: str, output: dict) -> None:
+        pass
+
+    @abstractmethod
+    def notify_failure(self, task_token: str, error: str, cause: str) -> None:
+        pass
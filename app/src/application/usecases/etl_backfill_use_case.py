@@ -0,0 +1,117 @@
+import logging
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from app.src.domain.model.document_event import DocumentEvent, DocumentEventType
+from app.src.domain.model.backfill_result_event import BackfillResult
+from app.src.application.ports.document_source_port import DocumentSourcePort
+from app.src.application.ports.checkpoint_store_port import CheckpointStorePort
+from app.src.application.usecases.etl_process_use_case import ProcessUseCase
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+MAX_FAILED_PAGE_IDS = 100
+
+
+class BackfillUseCase:
+    def __init__(self,
+                 document_source: DocumentSourcePort,
+                 process_use_case: ProcessUseCase,
+                 checkpoint_store: CheckpointStorePort,
+                 max_workers: int = 4):
+        self.document_source = document_source
+        self.process_use_case = process_use_case
+        self.checkpoint_store = checkpoint_store
+        self.max_workers = max_workers
+
+    @staticmethod
+    def space_cql(space_key: str) -> str:
+        return f'space = "{space_key}" and type = page'
+
+    def _process_page(self, page_data: dict) -> Tuple[str, Optional[Exception]]:
+        page_id = str(page_data.get("id", ""))
+        try:
+            event = DocumentEvent(page_id, DocumentEventType.UPDATED)
+            self.process_use_case.process_page(event, page_data)
+            return page_id, None
+        except Exception as e:
+            return page_id, e
+
+    def run(self, run_id: str, cql: str, should_continue: Callable[[], bool],
+            restart_completed: bool = False) -> BackfillResult:
+        """
+        Recorre la consulta desde el checkpoint de run_id. Un checkpoint
+        completado se devuelve tal cual, salvo con restart_completed: en ese
+        caso el recorrido vuelve a empezar desde el inicio con el mismo run_id.
+        """
+        logger.info("Iniciando backfill ETL (recorrido CQL)")
+        logger.info(f"- Run id : {run_id} ")
+
+        checkpoint = self.checkpoint_store.load(run_id) or {}
+        if checkpoint.get("cql", cql) != cql:
+            raise ValueError(f"Checkpoint {run_id} pertenece a otra consulta: {checkpoint.get('cql')}")
+        if checkpoint.get("completed"):
+            if not restart_completed:
+                logger.info("- Backfill ya completado, nada que reanudar")
+                return self._result(run_id, cql, checkpoint)
+            logger.info("- Backfill completado previamente, se reinicia el recorrido")
+            checkpoint = {}
+
+        cursor = checkpoint.get("cursor")
+        processed = checkpoint.get("processed", 0)
+        failed_page_ids: List[str] = checkpoint.get("failed_page_ids", [])
+        failed = checkpoint.get("failed", 0)
+        completed = False
+
+        logger.info(f"- Reanudando desde cursor : {cursor} ")
+
+        # Un bloque del listado a la vez: la memoria queda acotada por el tamaño de página del listado
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for pages, next_cursor in self.document_source.iter_page_batches(cql, cursor):
+                for page_id, error in executor.map(self._process_page, pages):
+                    if error is None:
+                        processed += 1
+                        continue
+                    failed += 1
+                    logger.error(f"- Error procesando página {page_id}: {error}")
+                    if len(failed_page_ids) < MAX_FAILED_PAGE_IDS:
+                        failed_page_ids.append(page_id)
+
+                cursor = next_cursor
+                completed = next_cursor is None
+                checkpoint = {
+                    "cql": cql,
+                    "cursor": cursor,
+                    "processed": processed,
+                    "failed": failed,
+                    "failed_page_ids": failed_page_ids,
+                    "completed": completed
+                }
+                self.checkpoint_store.save(run_id, checkpoint)
+                logger.info(f"- Checkpoint guardado : procesadas {processed}, fallidas {failed} ")
+
+                if not completed and not should_continue():
+                    logger.info("- Tiempo disponible agotado, se detiene el backfill en el checkpoint")
+                    break
+
+        if not completed and cursor is None:
+            # La fuente no devolvió ningún bloque: se marca como completado
+            checkpoint = {"cql": cql, "cursor": None, "processed": processed, "failed": failed,
+                          "failed_page_ids": failed_page_ids, "completed": True}
+            self.checkpoint_store.save(run_id, checkpoint)
+
+        return self._result(run_id, cql, checkpoint)
+
+    @staticmethod
+    def _result(run_id: str, cql: str, checkpoint: dict) -> BackfillResult:
+        return BackfillResult(
+            run_id,
+            cql,
+            checkpoint.get("processed", 0),
+            checkpoint.get("failed", 0),
+            checkpoint.get("cursor"),
+            checkpoint.get("completed", False),
+            checkpoint.get("failed_page_ids", [])
+        )
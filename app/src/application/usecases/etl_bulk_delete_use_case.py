@@ -0,0 +1,163 @@
+import logging
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from app.src.domain.model.bulk_delete_result_event import BulkDeleteResult
+from app.src.application.ports.document_archive_port import DocumentArchivePort
+from app.src.application.ports.chunk_index_port import ChunkIndexPort
+from app.src.application.ports.pending_change_queue_port import PendingChangeQueuePort
+from app.src.application.ports.sync_manifest_port import SyncManifestPort
+from app.src.application.ports.knowledge_base_ingestion_port import (
+    IngestionJobConflictError,
+    KnowledgeBaseIngestionPort,
+)
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class BulkDeleteUseCase:
+    """
+    Baja de muchas páginas en una sola pasada (p. ej. un espacio archivado):
+    archiva {id}.html y {id}.metadata.html en eliminado, borra ambos de
+    vigente en lotes y lanza un único ingestion job para todas las bajas.
+    Solo se borra de vigente lo que se archivó correctamente. Con índice de
+    chunks también se mueven los objetos por chunk de cada página.
+
+    Con manifiesto de sincronización se borran en lote las entradas de las
+    páginas eliminadas; si no, al restaurarse una página con la misma versión
+    el process la omitiría y no volvería a ground truth. Una entrada que no se
+    pudo borrar deja la página en failed_page_ids (además de eliminada) para
+    que un reintento la limpie.
+
+    Si el data source ya tiene un job en curso, las bajas se envían a la cola
+    de cambios pendientes del coordinador de ingesta (pending_changes); sin
+    cola se reintenta el job con backoff exponencial conflict_retries veces.
+    """
+
+    def __init__(self,
+                 archive: DocumentArchivePort,
+                 ingestion: KnowledgeBaseIngestionPort,
+                 knowledge_base_id: str,
+                 data_source_id: str,
+                 chunk_index: Optional[ChunkIndexPort] = None,
+                 index_load_workers: int = 16,
+                 pending_changes: Optional[PendingChangeQueuePort] = None,
+                 pending_delay_seconds: int = 30,
+                 sync_manifest: Optional[SyncManifestPort] = None,
+                 conflict_retries: int = 3,
+                 conflict_backoff_seconds: float = 2,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.archive = archive
+        self.ingestion = ingestion
+        self.knowledge_base_id = knowledge_base_id
+        self.data_source_id = data_source_id
+        self.chunk_index = chunk_index
+        self.index_load_workers = index_load_workers
+        self.pending_changes = pending_changes
+        self.pending_delay_seconds = pending_delay_seconds
+        self.sync_manifest = sync_manifest
+        self.conflict_retries = conflict_retries
+        self.conflict_backoff_seconds = conflict_backoff_seconds
+        self.sleep = sleep
+
+    def _page_object_names(self, page_ids: List[str]) -> Dict[str, List[str]]:
+        object_names = {page_id: [f"{page_id}.html", f"{page_id}.metadata.html"] for page_id in page_ids}
+        if self.chunk_index is None:
+            return object_names
+
+        with ThreadPoolExecutor(max_workers=max(1, self.index_load_workers)) as executor:
+            indexes = executor.map(self.chunk_index.load, page_ids)
+            for page_id, index in zip(page_ids, indexes):
+                for chunk_id in (index or {}).get("chunks", {}):
+                    object_names[page_id] += [f"{page_id}.chunk-{chunk_id}.html",
+                                              f"{page_id}.chunk-{chunk_id}.metadata.html"]
+        return object_names
+
+    @staticmethod
+    def _fail(failed: Dict[str, str], object_errors: Dict[str, str], page_ids: List[str],
+              object_names: Dict[str, List[str]]) -> List[str]:
+        remaining = []
+        for page_id in page_ids:
+            errors = [object_errors[name] for name in object_names[page_id] if name in object_errors]
+            if errors:
+                failed[page_id] = "; ".join(errors)
+            else:
+                remaining.append(page_id)
+        return remaining
+
+    def _start_ingestion_job(self, deleted: List[str]) -> dict:
+        attempts = 0 if self.pending_changes is not None else self.conflict_retries
+        for attempt in range(attempts + 1):
+            try:
+                return self.ingestion.start_ingestion_job(
+                    self.knowledge_base_id,
+                    self.data_source_id,
+                    description=f"Baja de {len(deleted)} documentos"
+                )
+            except IngestionJobConflictError:
+                if attempt == attempts:
+                    raise
+                delay = self.conflict_backoff_seconds * (2 ** attempt)
+                logger.info(f"- Ingestion job en curso, reintento {attempt + 1}/{attempts} en {delay:.0f} s")
+                self.sleep(delay)
+
+    def _defer_sync(self, deleted: List[str], failed: Dict[str, str],
+                    error: IngestionJobConflictError) -> BulkDeleteResult:
+        if self.pending_changes is None:
+            logger.warning(f"- Ingestion job en curso tras {self.conflict_retries} reintentos, "
+                           f"bajas sin sincronizar: {error}")
+            return BulkDeleteResult(deleted, failed, None, "CONFLICT")
+
+        changes = [{"document_id": page_id, "event_type": "deleted"} for page_id in deleted]
+        try:
+            self.pending_changes.requeue(changes, self.pending_delay_seconds)
+        except Exception as e:
+            logger.error(f"- No se pudieron encolar las bajas para la siguiente ingesta: {str(e)}")
+            return BulkDeleteResult(deleted, failed, None, "CONFLICT")
+        logger.info(f"- Ingestion job en curso, {len(deleted)} bajas encoladas para la siguiente ingesta")
+        return BulkDeleteResult(deleted, failed, None, "QUEUED")
+
+    def delete_pages(self, page_ids: List[str]) -> BulkDeleteResult:
+        logger.info(f"Iniciando ETL bulk delete ({len(page_ids)} páginas)")
+
+        page_ids = list(dict.fromkeys(str(page_id) for page_id in page_ids if page_id))
+        failed: Dict[str, str] = {}
+        object_names = self._page_object_names(page_ids)
+
+        logger.info("- Copia de documentos hacia eliminado")
+        archive_errors = self.archive.archive_many(
+            [name for page_id in page_ids for name in object_names[page_id]]
+        )
+        archived = self._fail(failed, archive_errors, page_ids, object_names)
+
+        logger.info("- Eliminación de documentos en vigente")
+        delete_errors = self.archive.delete_many(
+            [name for page_id in archived for name in object_names[page_id]]
+        )
+        deleted = self._fail(failed, delete_errors, archived, object_names)
+
+        if self.chunk_index is not None:
+            for page_id in deleted:
+                self.chunk_index.delete(page_id)
+
+        if self.sync_manifest is not None and deleted:
+            logger.info("- Eliminación de entradas del manifiesto de sincronización")
+            for page_id, error in self.sync_manifest.delete_many(deleted).items():
+                failed[page_id] = f"manifiesto: {error}"
+
+        if not deleted:
+            logger.info("- Ninguna página eliminada, no se lanza ingestion job")
+            return BulkDeleteResult(deleted, failed, None, "NOT_STARTED")
+
+        logger.info("- Sincronización de knowledge base")
+        try:
+            job = self._start_ingestion_job(deleted)
+        except IngestionJobConflictError as e:
+            # Las bajas ya están aplicadas en S3, pero solo un job posterior las sincroniza
+            return self._defer_sync(deleted, failed, e)
+
+        logger.info(f"- Ingestion job {job['ingestion_job_id']} iniciado para {len(deleted)} bajas")
+        return BulkDeleteResult(deleted, failed, job["ingestion_job_id"], job["status"])
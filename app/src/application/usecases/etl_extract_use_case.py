@@ -1,23 +1,38 @@
+import hashlib
+import json
 import logging
 
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from app.src.domain.model.document_event import DocumentEvent, DocumentEventType
 from app.src.application.ports.document_source_port import DocumentSourcePort
 from app.src.application.ports.landing_zone_port import LandingZonePort
 from app.src.application.ports.recourse_trigger_port import RecourseTriggerPort
+from app.src.application.ports.chunk_index_port import ChunkIndexPort
 
-from app.src.domain.model.extract_result_event import ExtractResult
+from app.src.domain.model.extract_result_event import ExtractItemResult, ExtractResult
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 class ExtractDocumentUseCase:
-    def __init__(self, landing_zone: LandingZonePort, extract_document, ground_truth_zone):
+    def __init__(self, landing_zone: LandingZonePort, extract_document, ground_truth_zone,
+                 io_workers: int = 8, parse_workers: int = 0, chunk_index: Optional[ChunkIndexPort] = None,
+                 atomic_ground_truth: bool = False):
         self.landing_zone = landing_zone
-        self.extract_document = extract_document
+        # No se guarda como self.extract_document: ocultaría el método del mismo nombre
+        self.document_extractor = extract_document
         self.ground_truth_zone = ground_truth_zone
+        self.io_workers = io_workers
+        self.parse_workers = parse_workers
+        # Con índice de chunks solo se reescriben los chunks nuevos o modificados
+        self.chunk_index = chunk_index
+        # Best-effort por defecto: un fallo parcial hace fallar la extracción y el reintento reescribe todo.
+        # all_or_nothing revierte el lote, pero sin versionado en el bucket cuesta un GET por objeto existente
+        self.atomic_ground_truth = atomic_ground_truth
 
     def extract_document(self, event: DocumentEvent) :
 
@@ -29,14 +44,254 @@ class ExtractDocumentUseCase:
         logger.info("- Obtención de documento desde landing")
         document_object = self.landing_zone.get_document(event.document_uri)
 
-        logger.info("- Extraccion data y metadata documento")
-        document_data, document_metadata = self.extract_document.extract_data(document_object)
+        return self.extract_page(event, document_object)
 
-        data_object_key = f"{event.document_id}.html"
-        metadata_object_key = f"{event.document_id}.metadata.html"
+    def extract_page(self, event: DocumentEvent, document_object: dict) -> ExtractResult:
+        logger.info("- Extraccion data y metadata documento")
+        document_data, document_metadata = self.document_extractor.extract_data(document_object)
+        content_stats = self._content_stats(document_object, document_data)
 
         logger.info("- Carga de documento hacia ground truth")
-        upload_data_response = self.ground_truth_zone.save(data_object_key, document_data)
-        upload_metadata_response = self.ground_truth_zone.save(metadata_object_key, document_metadata)
+        data_object_key, skipped, churn_ratio = self._write_ground_truth(
+            event.document_id, document_data, document_metadata
+        )
+        if skipped:
+            logger.info("- Documento sin cambios en ground truth, no requiere ingesta")
+
+        return ExtractResult(event.document_id, event.event_type, data_object_key, skipped, *content_stats,
+                             churn_ratio)
+
+    def _write_ground_truth(self, document_id: str, document_data: dict,
+                            document_metadata: dict) -> Tuple[str, bool, float]:
+        """Escribe la página en ground truth; retorna (data_object_key, skipped, churn_ratio)."""
+        if "chunks" in document_data and self.chunk_index is not None:
+            return self._write_chunk_delta(document_id, document_data, document_metadata)
+
+        objects = self._ground_truth_objects(document_id, document_data, document_metadata)
+        # Data y metadata se escriben en paralelo
+        results = self._save_ground_truth(objects)
+        return next(iter(objects)), self._all_skipped(results), 0.0
+
+    def _save_ground_truth(self, objects: Dict[str, dict]) -> List[dict]:
+        results = self.ground_truth_zone.save_many(objects, all_or_nothing=self.atomic_ground_truth)
+        errors = [result for result in results if result.get("error")]
+        if errors:
+            raise ValueError("Error al escribir ground truth: "
+                             + "; ".join(f"{result['key']}: {result['error']}" for result in errors))
+        return results
+
+    def _write_chunk_delta(self, document_id: str, document_data: dict,
+                           document_metadata: dict) -> Tuple[str, bool, float]:
+        """
+        Compara los chunks actuales con el índice de la página: escribe los
+        nuevos y modificados, elimina los que ya no existen y deja intactos los
+        idénticos. churn_ratio = chunks escritos o eliminados / chunks totales.
+        """
+        chunk_objects = self._chunk_objects(document_id, document_data, document_metadata)
+        index = self.chunk_index.load(document_id)
+        previous = (index or {}).get("chunks", {})
+        current = {chunk_id: self._chunk_hash(objects) for chunk_id, objects in chunk_objects.items()}
+
+        to_write = {
+            key: content
+            for chunk_id, objects in chunk_objects.items() if previous.get(chunk_id) != current[chunk_id]
+            for key, content in objects.items()
+        }
+        removed = [chunk_id for chunk_id in previous if chunk_id not in current]
+        to_delete = [name for chunk_id in removed for name in self._chunk_object_names(document_id, chunk_id)]
+        if index is None:
+            # Primera escritura por chunks: se retira el documento de página completa, si existía
+            to_delete += [f"{document_id}.html", f"{document_id}.metadata.html"]
+
+        results = self._save_ground_truth(to_write) if to_write else []
+        if to_delete:
+            errors = self.ground_truth_zone.delete_many(to_delete)
+            if errors:
+                raise ValueError(f"Error al eliminar chunks de ground truth: {errors}")
+        self.chunk_index.save(document_id, {"page_id": document_id, "chunks": current})
+
+        touched = sum(1 for chunk_id in current if previous.get(chunk_id) != current[chunk_id]) + len(removed)
+        churn_ratio = touched / max(1, len(set(previous) | set(current)))
+        logger.info(f"- Chunks: {len(current)} actuales, {touched} escritos o eliminados (churn {churn_ratio:.2f})")
+
+        skipped = index is not None and not removed and (not to_write or self._all_skipped(results))
+        return next(iter(next(iter(chunk_objects.values())))), skipped, churn_ratio
+
+    @staticmethod
+    def _chunk_hash(objects: Dict[str, dict]) -> str:
+        serialized = json.dumps(list(objects.values()), sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _chunk_object_names(document_id: str, chunk_id: str) -> List[str]:
+        return [f"{document_id}.chunk-{chunk_id}.html", f"{document_id}.chunk-{chunk_id}.metadata.html"]
+
+    @classmethod
+    def _ground_truth_objects(cls, document_id: str, document_data: dict, document_metadata: dict) -> Dict[str, dict]:
+        """
+        Objetos a escribir en ground truth: {id}.html + {id}.metadata.html o,
+        si el extractor entregó chunks, un par data/metadata por chunk.
+        """
+        if "chunks" not in document_data:
+            return {f"{document_id}.html": document_data, f"{document_id}.metadata.html": document_metadata}
+        return {
+            key: content
+            for objects in cls._chunk_objects(document_id, document_data, document_metadata).values()
+            for key, content in objects.items()
+        }
+
+    @classmethod
+    def _chunk_objects(cls, document_id: str, document_data: dict,
+                       document_metadata: dict) -> Dict[str, Dict[str, dict]]:
+        """
+        Par data/metadata de cada chunk, agrupado por chunk_id. Cada sidecar
+        lleva los metadataAttributes de la página más los del chunk. No se
+        incluyen la versión de la página ni la posición del chunk: cambian en
+        cada edición y obligarían a reescribir todos los chunks.
+        """
+        page_data = {key: value for key, value in document_data.items()
+                     if key not in ("chunks", "page_version_number")}
+        chunk_objects = {}
+        for chunk in document_data["chunks"]:
+            data_name, metadata_name = cls._chunk_object_names(document_id, chunk["chunk_id"])
+            chunk_objects[chunk["chunk_id"]] = {
+                data_name: {
+                    **page_data,
+                    "chunk_id": chunk["chunk_id"],
+                    "chunk_heading": chunk["heading"],
+                    "content": chunk["content"]
+                },
+                metadata_name: {
+                    "metadataAttributes": {
+                        **document_metadata.get("metadataAttributes", {}),
+                        "page_id": document_id,
+                        "chunk_id": chunk["chunk_id"],
+                        "chunk_heading": chunk["heading"]
+                    }
+                }
+            }
+        return chunk_objects
+
+    @staticmethod
+    def _content_stats(document_object: dict, document_data: dict) -> Tuple[int, int, int]:
+        """
+        Bytes del storage format original, bytes del contenido limpio y
+        cantidad de chunks; (0, 0, 0) si no hay etapa de limpieza.
+        """
+        if "chunks" in document_data:
+            contents = [chunk["content"] for chunk in document_data["chunks"]]
+        elif "content" in document_data:
+            contents = [document_data["content"]]
+        else:
+            return 0, 0, 0
+        html_body = document_object.get("body", {}).get("storage", {}).get("value", "")
+        bytes_original = len(html_body.encode("utf-8"))
+        bytes_cleaned = sum(len(content.encode("utf-8")) for content in contents)
+        chunk_count = len(document_data.get("chunks", []))
+        logger.info(f"- Contenido limpio: {bytes_original} -> {bytes_cleaned} bytes, {chunk_count} chunks")
+        return bytes_original, bytes_cleaned, chunk_count
+
+    @staticmethod
+    def _all_skipped(results: List[dict]) -> bool:
+        return bool(results) and all(result.get("skipped") for result in results)
+
+    def _download(self, event: DocumentEvent) -> Tuple[Optional[dict], str]:
+        try:
+            if not event.document_id or not event.document_uri:
+                raise ValueError("Event without necessary data")
+            return self.landing_zone.get_document(event.document_uri), ""
+        except Exception as e:
+            return None, str(e)
+
+    def _parse_all(self, documents: List[dict]) -> List[Tuple[Optional[tuple], str]]:
+        if self.parse_workers > 1 and len(documents) > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=self.parse_workers) as executor:
+                    futures = [executor.submit(self.document_extractor.extract_data, document)
+                               for document in documents]
+                results = []
+                for future in futures:
+                    error = future.exception()
+                    results.append((None, str(error)) if error else (future.result(), ""))
+                return results
+            except (OSError, NotImplementedError) as e:
+                # Lambda no expone /dev/shm: sin semáforos POSIX se parsea en el proceso actual
+                logger.info(f"- Pool de procesos no disponible ({type(e).__name__}), parseo secuencial")
+
+        results = []
+        for document in documents:
+            try:
+                results.append((self.document_extractor.extract_data(document), ""))
+            except Exception as e:
+                results.append((None, str(e)))
+        return results
+
+    def _upload(self, item: Tuple[DocumentEvent, dict, dict]) -> Tuple[str, str, bool, float]:
+        event, document_data, document_metadata = item
+        try:
+            return ("", *self._write_ground_truth(event.document_id, document_data, document_metadata))
+        except Exception as e:
+            return str(e), "", False, 0.0
+
+    def extract_documents(self, events: List[DocumentEvent]) -> List[ExtractItemResult]:
+        """
+        Extrae varios documentos en una sola invocación: descarga concurrente
+        desde landing, parseo en un pool de procesos (si el entorno lo permite)
+        y carga concurrente a ground truth. Un error en un documento no
+        interrumpe el resto; cada elemento reporta su propio estado.
+        """
+        logger.info(f"Iniciando ETL extract documents (lote de {len(events)})")
+        errors = {}
+
+        logger.info("- Obtención de documentos desde landing")
+        with ThreadPoolExecutor(max_workers=max(1, self.io_workers)) as executor:
+            downloaded = list(executor.map(self._download, events))
+
+        to_parse = []
+        for index, (document_object, error) in enumerate(downloaded):
+            if error:
+                errors[index] = error
+            else:
+                to_parse.append((index, document_object))
+
+        logger.info("- Extraccion data y metadata documentos")
+        parsed = self._parse_all([document_object for _, document_object in to_parse])
+
+        document_object_by_index = dict(to_parse)
+        content_stats = {}
+        to_upload = []
+        for (index, _), (extracted, error) in zip(to_parse, parsed):
+            if error:
+                errors[index] = error
+            else:
+                to_upload.append((index, (events[index], extracted[0], extracted[1])))
+                content_stats[index] = self._content_stats(document_object_by_index[index], extracted[0])
+
+        logger.info("- Carga de documentos hacia ground truth")
+        with ThreadPoolExecutor(max_workers=max(1, self.io_workers)) as executor:
+            uploaded = list(executor.map(self._upload, [item for _, item in to_upload]))
+        skipped = set()
+        data_object_keys = {}
+        churn_ratios = {}
+        for (index, _), (error, data_object_key, unchanged, churn_ratio) in zip(to_upload, uploaded):
+            if error:
+                errors[index] = error
+                continue
+            data_object_keys[index] = data_object_key
+            churn_ratios[index] = churn_ratio
+            if unchanged:
+                skipped.add(index)
 
-        return ExtractResult(event.document_id, event.event_type, data_object_key)
\ No newline at end of file
+        return [
+            ExtractItemResult(
+                event.document_id,
+                event.event_type,
+                data_object_keys.get(index, f"{event.document_id}.html"),
+                "ERROR" if index in errors else "OK",
+                errors.get(index, ""),
+                index in skipped,
+                *content_stats.get(index, (0, 0, 0)),
+                churn_ratios.get(index, 0.0)
+            )
+            for index, event in enumerate(events)
+        ]
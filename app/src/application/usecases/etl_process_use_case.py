@@ -1,13 +1,21 @@
+import hashlib
 import logging
+import threading
 
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
 
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from app.src.domain.model.document_event import DocumentEvent, DocumentEventType
+from app.src.domain.model.extract_result_event import ExtractResult
 from app.src.domain.model.process_result_event import ProcessResult
 from app.src.application.ports.document_source_port import DocumentSourcePort
 from app.src.application.ports.landing_zone_port import LandingZonePort
+from app.src.application.ports.pending_change_queue_port import PendingChangeQueuePort
 from app.src.application.ports.recourse_trigger_port import RecourseTriggerPort
+from app.src.application.ports.sync_manifest_port import SyncManifestPort
+from app.src.application.usecases.etl_extract_use_case import ExtractDocumentUseCase
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -17,10 +25,27 @@ class ProcessUseCase:
     def __init__(self,
                  document_source: DocumentSourcePort,
                  landing_zone: LandingZonePort,
-                 workflow_trigger: RecourseTriggerPort):
+                 workflow_trigger: RecourseTriggerPort,
+                 sync_manifest: Optional[SyncManifestPort] = None,
+                 direct_extract: Optional[ExtractDocumentUseCase] = None,
+                 audit_zone: Optional[LandingZonePort] = None,
+                 pending_changes: Optional[PendingChangeQueuePort] = None):
         self.document_source = document_source
         self.landing_zone = landing_zone
         self.workflow_trigger = workflow_trigger
+        self.sync_manifest = sync_manifest
+        # Modo directo: la extracción a ground truth se hace en este proceso con la página ya obtenida
+        self.direct_extract = direct_extract
+        # La copia de auditoría del modo directo va fuera de landing: una escritura en landing
+        # dispara el workflow y la página se extraería dos veces
+        self.audit_zone = audit_zone or landing_zone
+        # Cola del coordinador de ingesta (etl_ingestion): el modo directo le publica los cambios
+        self.pending_changes = pending_changes
+        self._landing_executor = ThreadPoolExecutor(max_workers=4) if direct_extract else None
+
+        self._stats_lock = threading.Lock()
+        self.processed_count = 0
+        self.skipped_count = 0
 
     def _build_object_key(self, page_id: str, event_type: DocumentEventType) -> str:
         ts = datetime.now(ZoneInfo("America/Lima")).strftime("%Y%m%dT%H%M%S-0500")
@@ -42,6 +67,77 @@ class ProcessUseCase:
         else:
             raise ValueError(f"Unsupported event type: {event.event_type}")
 
+    @staticmethod
+    def _page_fingerprint(page_data: dict) -> dict:
+        body_value = page_data.get("body", {}).get("storage", {}).get("value", "")
+        return {
+            "version": page_data.get("version", {}).get("number"),
+            "content_hash": hashlib.sha256(body_value.encode("utf-8")).hexdigest()
+        }
+
+    def _find_unchanged_entry(self, event: DocumentEvent, fingerprint: dict) -> Optional[dict]:
+        if not self.sync_manifest or event.event_type != DocumentEventType.UPDATED:
+            return None
+        entry = self.sync_manifest.get(event.document_id)
+        if entry and entry.get("version") == fingerprint["version"] \
+                and entry.get("content_hash") == fingerprint["content_hash"]:
+            return entry
+        return None
+
+    def _update_manifest(self, event: DocumentEvent, fingerprint: dict, object_key: str) -> None:
+        if not self.sync_manifest:
+            return
+        if event.event_type == DocumentEventType.DELETED:
+            self.sync_manifest.delete(event.document_id)
+        else:
+            self.sync_manifest.put(event.document_id, {**fingerprint, "object_key": object_key})
+
+    def _record_outcome(self, skipped: bool) -> None:
+        with self._stats_lock:
+            self.processed_count += 1
+            if skipped:
+                self.skipped_count += 1
+
+    def skip_counts(self) -> Tuple[int, int]:
+        """(procesadas, omitidas) acumuladas en este entorno de ejecución."""
+        with self._stats_lock:
+            return self.processed_count, self.skipped_count
+
+    def skip_rate(self, since: Tuple[int, int] = (0, 0)) -> float:
+        """
+        Tasa de omisión de las páginas procesadas desde el snapshot since de
+        skip_counts(); sin snapshot, la acumulada del entorno de ejecución.
+        """
+        processed, skipped = self.skip_counts()
+        processed -= since[0]
+        skipped -= since[1]
+        return skipped / processed if processed else 0.0
+
+    def _process_direct(self, event: DocumentEvent, page_data: dict, object_key: str) -> ExtractResult:
+        # La copia de auditoría se guarda en paralelo a la extracción.
+        # Se espera antes de retornar: la Lambda se congela al responder.
+        logger.info("- Carga de documento en repositorio de auditoría (asíncrona)")
+        audit_future = self._landing_executor.submit(self.audit_zone.save, object_key, page_data)
+
+        logger.info("- Extraccion directa hacia ground truth (sin workflow)")
+        try:
+            result = self.direct_extract.extract_page(event, page_data)
+        finally:
+            # La copia de auditoría se completa aunque la extracción falle
+            object_saved = audit_future.result()
+        logger.info(f"- Documento URI : {object_saved['uri']} ")
+
+        if result.skipped:
+            return result
+        if self.pending_changes is not None:
+            logger.info("- Publicando cambio para el coordinador de ingesta")
+            self.pending_changes.publish([{"document_id": result.document_id,
+                                           "event_type": result.event_type.value,
+                                           "data_object_key": result.data_object_key}])
+        else:
+            logger.warning("- Modo directo sin cola de ingesta: el cambio no se sincroniza con la knowledge base")
+        return result
+
     def process(self, event: DocumentEvent) -> ProcessResult:
         logger.info("Iniciando proceso ETL (ingesta y trigger)")
 
@@ -54,16 +150,32 @@ class ProcessUseCase:
         logger.info("- Obteniendo documento según evento")
         page_data = self._get_page_data(event)
 
+        return self.process_page(event, page_data)
+
+    def process_page(self, event: DocumentEvent, page_data: dict) -> ProcessResult:
+        fingerprint = self._page_fingerprint(page_data)
+        manifest_entry = self._find_unchanged_entry(event, fingerprint)
+        if manifest_entry:
+            logger.info(f"- Documento sin cambios (versión {fingerprint['version']}), se omite la carga")
+            self._record_outcome(skipped=True)
+            return ProcessResult(event.document_id, event.event_type, manifest_entry.get("object_key", ""), True)
+
         logger.info("- Generando nombre de objeto para almacenamiento")
         object_key = self._build_object_key(event.document_id, event.event_type)
 
-        logger.info("- Carga de documento en repositorio landing")
-        object_saved = self.landing_zone.save(object_key, page_data)
+        skipped = False
+        if self.direct_extract and event.event_type == DocumentEventType.UPDATED:
+            skipped = self._process_direct(event, page_data, object_key).skipped
+        else:
+            logger.info("- Carga de documento en repositorio landing")
+            object_saved = self.landing_zone.save(object_key, page_data)
 
-        logger.info(f"- Documento URI : {object_saved['uri']} ")
+            logger.info(f"- Documento URI : {object_saved['uri']} ")
 
-        logger.info("- Iniciando workflow de extraccion de datos")
-        #self.workflow_trigger.trigger(event.document_id, event.event_type.value, object_saved["uri"])
+            logger.info("- Iniciando workflow de extraccion de datos")
+            #self.workflow_trigger.trigger(event.document_id, event.event_type.value, object_saved["uri"])
 
-        return ProcessResult(event.document_id, event.event_type, object_key)
+        self._update_manifest(event, fingerprint, object_key)
+        self._record_outcome(skipped=skipped)
 
+        return ProcessResult(event.document_id, event.event_type, object_key, skipped)
@@ -0,0 +1,126 @@
+import logging
+import threading
+import time
+
+from typing import Callable, Dict, List, Optional
+
+from app.src.domain.model.ingestion_batch_event import IngestionBatch
+from app.src.application.ports.knowledge_base_ingestion_port import (
+    IngestionJobConflictError,
+    KnowledgeBaseIngestionPort,
+)
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class IngestionCoordinator:
+    """
+    Agrupa los cambios de ground truth y lanza un único ingestion job por lote.
+    Bedrock admite un solo job activo por data source, por lo que los
+    documentos comparten job en lugar de serializar un sync por página.
+
+    El lote se cierra al llegar a max_batch_size cambios o cuando el cambio
+    más antiguo pendiente supera window_seconds. Si el data source ya tiene un
+    job en curso, los cambios quedan pendientes para el siguiente flush.
+    Entre invocaciones Lambda lo pendiente no se conserva en memoria: el handler
+    lo libera con release_pending_changes y lo devuelve a la cola.
+    """
+
+    def __init__(self,
+                 ingestion: KnowledgeBaseIngestionPort,
+                 knowledge_base_id: str,
+                 data_source_id: str,
+                 window_seconds: float = 30,
+                 max_batch_size: int = 100,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ingestion = ingestion
+        self.knowledge_base_id = knowledge_base_id
+        self.data_source_id = data_source_id
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self.clock = clock
+
+        self._pending: Dict[str, dict] = {}
+        self._oldest_pending_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+        self.jobs_started = 0
+        self.documents_submitted = 0
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def release_pending_changes(self) -> List[dict]:
+        """Descarta los cambios pendientes (p. ej. para devolverlos a la cola) y los retorna."""
+        with self._lock:
+            changes = list(self._pending.values())
+            self._pending.clear()
+            self._oldest_pending_at = None
+            return changes
+
+    def add(self, change: dict, received_at: Optional[float] = None) -> None:
+        """
+        Registra el cambio sin lanzar el job. received_at (en la escala de clock)
+        permite que la ventana cuente desde la primera recepción del cambio
+        aunque haya pasado por varias invocaciones.
+        """
+        document_id = change.get("document_id")
+        if not document_id:
+            raise ValueError("Change without document_id")
+
+        received_at = self.clock() if received_at is None else received_at
+        with self._lock:
+            # Varios cambios de la misma página en la ventana se resuelven con el último
+            self._pending[document_id] = change
+            self.documents_submitted += 1
+            if self._oldest_pending_at is None or received_at < self._oldest_pending_at:
+                self._oldest_pending_at = received_at
+
+    def submit(self, change: dict, received_at: Optional[float] = None) -> Optional[IngestionBatch]:
+        self.add(change, received_at)
+        return self.flush_if_due()
+
+    def is_due(self) -> bool:
+        with self._lock:
+            if not self._pending:
+                return False
+            if len(self._pending) >= self.max_batch_size:
+                return True
+            return self.clock() - self._oldest_pending_at >= self.window_seconds
+
+    def flush_if_full(self) -> Optional[IngestionBatch]:
+        return self.flush() if self.pending_count() >= self.max_batch_size else None
+
+    def seconds_until_due(self) -> float:
+        with self._lock:
+            if not self._pending or len(self._pending) >= self.max_batch_size:
+                return 0.0
+            return max(0.0, self.window_seconds - (self.clock() - self._oldest_pending_at))
+
+    def flush_if_due(self) -> Optional[IngestionBatch]:
+        return self.flush() if self.is_due() else None
+
+    def flush(self) -> Optional[IngestionBatch]:
+        with self._lock:
+            if not self._pending:
+                return None
+            document_ids: List[str] = list(self._pending)
+
+            try:
+                job = self.ingestion.start_ingestion_job(
+                    self.knowledge_base_id,
+                    self.data_source_id,
+                    description=f"Lote de {len(document_ids)} documentos"
+                )
+            except IngestionJobConflictError:
+                logger.info(f"- Ingestion job en curso, {len(document_ids)} cambios quedan pendientes")
+                return None
+
+            self._pending.clear()
+            self._oldest_pending_at = None
+            self.jobs_started += 1
+
+        logger.info(f"- Ingestion job {job['ingestion_job_id']} iniciado para {len(document_ids)} documentos")
+        return IngestionBatch(job["ingestion_job_id"], job["status"], document_ids)
@@ -0,0 +1,66 @@
+import logging
+
+from typing import Dict, List, Optional
+
+from app.src.application.ports.workflow_callback_port import WorkflowCallbackPort
+from app.src.application.usecases.ingestion_job_watcher import IngestionJobWatcher
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class IngestionJobNotifier:
+    """
+    Devuelve el resultado de cada ingestion job a las ejecuciones del workflow
+    que lo esperan con task token (sqs:sendMessage.waitForTaskToken), en lugar
+    de que cada ejecución consulte el job en un bucle Wait / GetIngestionJob.
+
+    Todos los jobs comparten el ciclo de consulta adaptativo del watcher. Un
+    job COMPLETE se notifica con éxito; FAILED, STOPPED o un error persistente
+    al consultarlo, con fallo. Los que siguen en curso al agotar el timeout se
+    retornan para que el llamador los vuelva a vigilar más tarde.
+    """
+
+    def __init__(self, watcher: IngestionJobWatcher, callback: WorkflowCallbackPort):
+        self.watcher = watcher
+        self.callback = callback
+
+    def notify(self, task_tokens_by_job: Dict[str, List[str]], timeout: Optional[float] = None) -> Dict[str, str]:
+        """Espera los jobs hasta timeout; retorna el estado final de los terminados."""
+        finished = self.watcher.wait_many(list(task_tokens_by_job), timeout=timeout)
+
+        statuses = {}
+        for ingestion_job_id, future in finished.items():
+            task_tokens = task_tokens_by_job[ingestion_job_id]
+            try:
+                status = future.result().get("status")
+            except Exception as e:
+                statuses[ingestion_job_id] = "ERROR"
+                self.fail(task_tokens, "IngestionJobStatusError",
+                          f"No se pudo consultar el ingestion job {ingestion_job_id}: {str(e)}")
+                continue
+
+            statuses[ingestion_job_id] = status
+            if status == "COMPLETE":
+                self._succeed(task_tokens, {"ingestion_job_id": ingestion_job_id, "status": status})
+            else:
+                self.fail(task_tokens, "IngestionJobFailed", f"Ingestion job {ingestion_job_id} terminó en {status}")
+        return statuses
+
+    def _succeed(self, task_tokens: List[str], output: dict) -> None:
+        logger.info(f"- Ingestion job {output['ingestion_job_id']} completo, "
+                    f"notificando {len(task_tokens)} ejecuciones")
+        for task_token in task_tokens:
+            try:
+                self.callback.notify_success(task_token, output)
+            except Exception as e:
+                # La ejecución terminará por su TimeoutSeconds
+                logger.error(f"Error notificando éxito al workflow: {str(e)}")
+
+    def fail(self, task_tokens: List[str], error: str, cause: str) -> None:
+        logger.warning(f"- {cause}, notificando fallo a {len(task_tokens)} ejecuciones")
+        for task_token in task_tokens:
+            try:
+                self.callback.notify_failure(task_token, error, cause)
+            except Exception as e:
+                logger.error(f"Error notificando fallo al workflow: {str(e)}")
@@ -0,0 +1,203 @@
+import logging
+import threading
+import time
+
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError, wait
+from typing import Callable, Dict, List, Optional
+
+from app.src.application.ports.knowledge_base_ingestion_port import KnowledgeBaseIngestionPort
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+TERMINAL_STATUSES = ("COMPLETE", "FAILED", "STOPPED")
+
+
+class _WatchedJob:
+    def __init__(self, ingestion_job_id: str, started_at: float):
+        self.ingestion_job_id = ingestion_job_id
+        self.started_at = started_at
+        self.next_poll_at = started_at
+        self.polls = 0
+        self.consecutive_errors = 0
+        self.subscribers: List[Future] = []
+
+
+class IngestionJobWatcher:
+    """
+    Consulta el estado de cada ingestion job activo una sola vez por ciclo y
+    notifica a todos los suscriptores del mismo job (un Future por espera).
+
+    El intervalo entre consultas es adaptativo: la primera se programa cerca
+    de la duración típica observada (media móvil exponencial de los jobs ya
+    terminados) y, si el job sigue en curso, se reintenta con backoff
+    exponencial acotado entre min_interval y max_interval.
+
+    Un error al consultar un job se reintenta con el mismo backoff; solo tras
+    max_consecutive_errors fallos seguidos se propaga a sus suscriptores.
+    """
+
+    def __init__(self,
+                 ingestion: KnowledgeBaseIngestionPort,
+                 knowledge_base_id: str,
+                 data_source_id: str,
+                 min_interval: float = 0.5,
+                 max_interval: float = 30,
+                 initial_expected_duration: float = 5,
+                 smoothing: float = 0.3,
+                 max_consecutive_errors: int = 3,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.ingestion = ingestion
+        self.knowledge_base_id = knowledge_base_id
+        self.data_source_id = data_source_id
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.expected_duration = initial_expected_duration
+        self.smoothing = smoothing
+        self.max_consecutive_errors = max_consecutive_errors
+        self.clock = clock
+        self.sleep = sleep
+
+        self._jobs: Dict[str, _WatchedJob] = {}
+        self._lock = threading.Lock()
+        self._poller: Optional[threading.Thread] = None
+
+        self.polls = 0
+
+    def _first_poll_delay(self) -> float:
+        # Se apunta un poco antes de la duración esperada para no perder el fin de jobs cortos
+        return min(self.max_interval, max(self.min_interval, self.expected_duration * 0.8))
+
+    def _retry_delay(self, attempts: int) -> float:
+        return min(self.max_interval, max(self.min_interval, self.min_interval * (2 ** attempts)))
+
+    def subscribe(self, ingestion_job_id: str) -> Future:
+        """Retorna un Future que se resuelve con el estado final del job."""
+        future: Future = Future()
+        with self._lock:
+            job = self._jobs.get(ingestion_job_id)
+            if job is None:
+                job = _WatchedJob(ingestion_job_id, self.clock())
+                job.next_poll_at = job.started_at + self._first_poll_delay()
+                self._jobs[ingestion_job_id] = job
+            job.subscribers.append(future)
+        return future
+
+    def unsubscribe(self, ingestion_job_id: str, future: Future) -> None:
+        """Retira una espera; el job deja de consultarse si no le quedan suscriptores."""
+        with self._lock:
+            job = self._jobs.get(ingestion_job_id)
+            if job is None:
+                return
+            if future in job.subscribers:
+                job.subscribers.remove(future)
+            if not job.subscribers:
+                self._jobs.pop(ingestion_job_id, None)
+
+    def active_jobs(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+    def poll_once(self) -> Optional[float]:
+        """
+        Consulta los jobs cuyo turno ya llegó. Retorna los segundos hasta la
+        siguiente consulta pendiente, o None si no quedan jobs activos.
+        """
+        now = self.clock()
+        with self._lock:
+            due = [job for job in self._jobs.values() if job.next_poll_at <= now]
+
+        for job in due:
+            try:
+                result = self.ingestion.get_ingestion_job(
+                    self.knowledge_base_id, self.data_source_id, job.ingestion_job_id
+                )
+            except Exception as e:
+                job.consecutive_errors += 1
+                if job.consecutive_errors >= self.max_consecutive_errors:
+                    self._finish(job, error=e)
+                else:
+                    logger.warning(f"- Error consultando ingestion job {job.ingestion_job_id} "
+                                   f"({job.consecutive_errors}/{self.max_consecutive_errors}): {str(e)}")
+                    job.next_poll_at = self.clock() + self._retry_delay(job.consecutive_errors)
+                continue
+
+            self.polls += 1
+            job.polls += 1
+            job.consecutive_errors = 0
+            if result.get("status") in TERMINAL_STATUSES:
+                self._record_duration(self.clock() - job.started_at)
+                self._finish(job, result=result)
+            else:
+                job.next_poll_at = self.clock() + self._retry_delay(job.polls)
+
+        with self._lock:
+            if not self._jobs:
+                return None
+            return max(0.0, min(job.next_poll_at for job in self._jobs.values()) - self.clock())
+
+    def wait(self, ingestion_job_id: str, timeout: Optional[float] = None) -> dict:
+        """Suscribe y bloquea hasta el estado final, compartiendo el ciclo de consulta."""
+        future = self.subscribe(ingestion_job_id)
+        self._ensure_poller()
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            self.unsubscribe(ingestion_job_id, future)
+            raise
+
+    def wait_many(self, ingestion_job_ids: List[str], timeout: Optional[float] = None) -> Dict[str, Future]:
+        """
+        Espera varios jobs a la vez con el mismo ciclo de consulta. Retorna los
+        Futures resueltos dentro del timeout; los jobs que siguen en curso
+        dejan de consultarse y no se incluyen.
+        """
+        futures = {job_id: self.subscribe(job_id) for job_id in dict.fromkeys(ingestion_job_ids)}
+        if not futures:
+            return {}
+        self._ensure_poller()
+        wait(list(futures.values()), timeout=timeout)
+
+        finished = {}
+        for job_id, future in futures.items():
+            if future.done():
+                finished[job_id] = future
+            else:
+                self.unsubscribe(job_id, future)
+        return finished
+
+    def _ensure_poller(self) -> None:
+        with self._lock:
+            if self._poller is not None:
+                return
+            self._poller = threading.Thread(target=self._run, daemon=True)
+            self._poller.start()
+
+    def _run(self) -> None:
+        while True:
+            delay = self.poll_once()
+            if delay is None:
+                # Se re-verifica bajo lock: un subscribe concurrente no queda sin hilo de consulta
+                with self._lock:
+                    if not self._jobs:
+                        self._poller = None
+                        return
+                continue
+            self.sleep(delay)
+
+    def _record_duration(self, duration: float) -> None:
+        with self._lock:
+            self.expected_duration = (1 - self.smoothing) * self.expected_duration + self.smoothing * duration
+
+    def _finish(self, job: _WatchedJob, result: Optional[dict] = None, error: Optional[Exception] = None) -> None:
+        with self._lock:
+            self._jobs.pop(job.ingestion_job_id, None)
+            subscribers = list(job.subscribers)
+
+        logger.info(f"- Ingestion job {job.ingestion_job_id} finalizado tras {job.polls} consultas")
+        for future in subscribers:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
@@ -0,0 +1,13 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass(frozen=True)
+class BackfillResult:
+    run_id: str
+    cql: str
+    processed: int
+    failed: int
+    cursor: Optional[str]
+    completed: bool
+    failed_page_ids: List[str] = field(default_factory=list)
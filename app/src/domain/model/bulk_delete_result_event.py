@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class BulkDeleteResult:
+    deleted_page_ids: List[str]
+    failed_page_ids: Dict[str, str]
+    ingestion_job_id: Optional[str]
+    ingestion_status: str
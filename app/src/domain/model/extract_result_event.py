@@ -7,3 +7,22 @@ class ExtractResult:
     document_id: str
     event_type: DocumentEventType
     data_object_key: str
+    skipped: bool = False
+    content_bytes_original: int = 0
+    content_bytes_cleaned: int = 0
+    chunk_count: int = 0
+    chunk_churn_ratio: float = 0.0
+
+
+@dataclass(frozen=True)
+class ExtractItemResult:
+    document_id: str
+    event_type: DocumentEventType
+    data_object_key: str
+    status: str
+    error: str = ""
+    skipped: bool = False
+    content_bytes_original: int = 0
+    content_bytes_cleaned: int = 0
+    chunk_count: int = 0
+    chunk_churn_ratio: float = 0.0
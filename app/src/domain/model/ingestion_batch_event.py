@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+from typing import List
+
+
+@dataclass(frozen=True)
+class IngestionBatch:
+    ingestion_job_id: str
+    status: str
+    document_ids: List[str]
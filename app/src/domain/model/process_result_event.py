@@ -7,3 +7,4 @@ class ProcessResult:
     document_id: str
     event_type: DocumentEventType
     document_uri: str
+    skipped: bool = False
@@ -0,0 +1,47 @@
+import boto3
+
+from app.src.application.ports.knowledge_base_ingestion_port import (
+    IngestionJobConflictError,
+    KnowledgeBaseIngestionPort,
+)
+
+
+class BedrockIngestionAdapter(KnowledgeBaseIngestionPort):
+
+    def __init__(self, region_name):
+        self.bedrock_agent_client = boto3.client('bedrock-agent', region_name=region_name)
+
+    @staticmethod
+    def _to_job(ingestion_job: dict) -> dict:
+        return {
+            "ingestion_job_id": ingestion_job.get("ingestionJobId"),
+            "status": ingestion_job.get("status"),
+            "statistics": ingestion_job.get("statistics", {}),
+            "failure_reasons": ingestion_job.get("failureReasons", []),
+        }
+
+    def start_ingestion_job(self, knowledge_base_id: str, data_source_id: str, description: str = "") -> dict:
+        try:
+            response = self.bedrock_agent_client.start_ingestion_job(
+                knowledgeBaseId=knowledge_base_id,
+                dataSourceId=data_source_id,
+                description=description[:200]
+            )
+            return self._to_job(response.get("ingestionJob", {}))
+        except self.bedrock_agent_client.exceptions.ConflictException as e:
+            raise IngestionJobConflictError(f"Ingestion job en curso para data source {data_source_id}: {e}")
+        except Exception as e:
+            print(f"Error al iniciar ingestion job :{data_source_id}: {e}")
+            raise ValueError(f"Error al iniciar ingestion job :{data_source_id}: {e}")
+
+    def get_ingestion_job(self, knowledge_base_id: str, data_source_id: str, ingestion_job_id: str) -> dict:
+        try:
+            response = self.bedrock_agent_client.get_ingestion_job(
+                knowledgeBaseId=knowledge_base_id,
+                dataSourceId=data_source_id,
+                ingestionJobId=ingestion_job_id
+            )
+            return self._to_job(response.get("ingestionJob", {}))
+        except Exception as e:
+            print(f"Error al consultar ingestion job :{ingestion_job_id}: {e}")
+            raise ValueError(f"Error al consultar ingestion job :{ingestion_job_id}: {e}")
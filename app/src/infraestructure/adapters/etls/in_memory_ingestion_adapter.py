@@ -0,0 +1,68 @@
+import itertools
+import threading
+import time
+
+from typing import Callable, Dict, Optional
+
+from app.src.application.ports.knowledge_base_ingestion_port import (
+    IngestionJobConflictError,
+    KnowledgeBaseIngestionPort,
+)
+
+
+class InMemoryIngestionAdapter(KnowledgeBaseIngestionPort):
+    """
+    Sustituto local de la API de ingesta de Bedrock para ejecución local y
+    benchmarks. Igual que Bedrock, admite un solo job activo por data source;
+    cada job pasa por STARTING / IN_PROGRESS y termina en COMPLETE tras
+    job_duration_seconds.
+    """
+
+    ACTIVE_STATUSES = ("STARTING", "IN_PROGRESS", "STOPPING")
+
+    def __init__(self, job_duration_seconds: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        self.job_duration_seconds = job_duration_seconds
+        self.clock = clock
+        self._jobs: Dict[str, dict] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+        self.start_calls = 0
+        self.get_calls = 0
+
+    def _status(self, job: dict) -> str:
+        elapsed = self.clock() - job["started_at"]
+        if elapsed >= job["duration"]:
+            return "COMPLETE"
+        return "STARTING" if elapsed < job["duration"] * 0.1 else "IN_PROGRESS"
+
+    def _active_job(self, knowledge_base_id: str, data_source_id: str) -> Optional[dict]:
+        for job in self._jobs.values():
+            if (job["knowledge_base_id"], job["data_source_id"]) == (knowledge_base_id, data_source_id) \
+                    and self._status(job) in self.ACTIVE_STATUSES:
+                return job
+        return None
+
+    def start_ingestion_job(self, knowledge_base_id: str, data_source_id: str, description: str = "") -> dict:
+        with self._lock:
+            self.start_calls += 1
+            if self._active_job(knowledge_base_id, data_source_id):
+                raise IngestionJobConflictError(f"Ingestion job en curso para data source {data_source_id}")
+            job_id = f"job-{next(self._ids)}"
+            self._jobs[job_id] = {
+                "knowledge_base_id": knowledge_base_id,
+                "data_source_id": data_source_id,
+                "description": description,
+                "started_at": self.clock(),
+                "duration": self.job_duration_seconds,
+            }
+            return {"ingestion_job_id": job_id, "status": "STARTING", "statistics": {}, "failure_reasons": []}
+
+    def get_ingestion_job(self, knowledge_base_id: str, data_source_id: str, ingestion_job_id: str) -> dict:
+        with self._lock:
+            self.get_calls += 1
+            job = self._jobs.get(ingestion_job_id)
+            if not job:
+                raise ValueError(f"Ingestion job no encontrado: {ingestion_job_id}")
+            return {"ingestion_job_id": ingestion_job_id, "status": self._status(job),
+                    "statistics": {}, "failure_reasons": []}
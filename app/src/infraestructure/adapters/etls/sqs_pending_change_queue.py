@@ -0,0 +1,37 @@
+import boto3
+import json
+
+from app.src.application.ports.pending_change_queue_port import PendingChangeQueuePort
+from typing import List
+
+# Límites de SQS: 10 mensajes por SendMessageBatch y DelaySeconds hasta 15 minutos
+_SQS_BATCH_SIZE = 10
+_SQS_MAX_DELAY_SECONDS = 900
+
+
+class SqsPendingChangeQueueAdapter(PendingChangeQueuePort):
+
+    def __init__(self, queue_url, region_name):
+        self.sqs_client = boto3.client('sqs', region_name=region_name)
+        self.queue_url = queue_url
+
+    def _send(self, changes: List[dict], delay_seconds: int, action: str) -> None:
+        delay_seconds = max(0, min(int(delay_seconds), _SQS_MAX_DELAY_SECONDS))
+        for start in range(0, len(changes), _SQS_BATCH_SIZE):
+            entries = [
+                {"Id": str(index), "MessageBody": json.dumps(change), "DelaySeconds": delay_seconds}
+                for index, change in enumerate(changes[start:start + _SQS_BATCH_SIZE])
+            ]
+            try:
+                response = self.sqs_client.send_message_batch(QueueUrl=self.queue_url, Entries=entries)
+            except Exception as e:
+                print(f"Error al {action} cambios pendientes :{self.queue_url}: {e}")
+                raise ValueError(f"Error al {action} cambios pendientes :{self.queue_url}: {e}")
+            if response.get("Failed"):
+                raise ValueError(f"Error al {action} cambios pendientes :{self.queue_url}: {response['Failed']}")
+
+    def publish(self, changes: List[dict]) -> None:
+        self._send(changes, 0, "publicar")
+
+    def requeue(self, changes: List[dict], delay_seconds: int) -> None:
+        self._send(changes, delay_seconds, "reencolar")
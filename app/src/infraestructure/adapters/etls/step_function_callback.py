@@ -0,0 +1,33 @@
+import boto3
+import json
+
+from app.src.application.ports.workflow_callback_port import WorkflowCallbackPort
+
+# La ejecución ya terminó (timeout o cancelación): no queda nadie esperando el token
+_EXPIRED_TOKEN_ERRORS = ("TaskTimedOut", "TaskDoesNotExist", "InvalidToken")
+
+
+class StepFunctionCallbackAdapter(WorkflowCallbackPort):
+
+    def __init__(self, region_name):
+        self.step_functions_client = boto3.client('stepfunctions', region_name=region_name)
+
+    def _send(self, operation, task_token: str, **kwargs) -> None:
+        try:
+            operation(taskToken=task_token, **kwargs)
+        except self.step_functions_client.exceptions.ClientError as e:
+            if e.response.get("Error", {}).get("Code") in _EXPIRED_TOKEN_ERRORS:
+                print(f"Task token expirado, se omite la notificación: {e}")
+                return
+            print(f"Error al notificar step function: {e}")
+            raise ValueError(f"Error al notificar step function: {e}")
+        except Exception as e:
+            print(f"Error al notificar step function: {e}")
+            raise ValueError(f"Error al notificar step function: {e}")
+
+    def notify_success(self, task_token: str, output: dict) -> None:
+        self._send(self.step_functions_client.send_task_success, task_token, output=json.dumps(output))
+
+    def notify_failure(self, task_token: str, error: str, cause: str) -> None:
+        # Límites de SendTaskFailure: error hasta 256 caracteres y cause hasta 32768
+        self._send(self.step_functions_client.send_task_failure, task_token, error=error[:256], cause=cause[:32768])
@@ -0,0 +1,103 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class PooledHttpSession:
+    """
+    Sesión HTTP persistente (keep-alive) con pool de conexiones, timeouts de
+    conexión/lectura y reintentos con backoff exponencial + jitter que respetan
+    la cabecera Retry-After en 429/503.
+    """
+
+    RETRY_AFTER_STATUSES = (429, 503)
+
+    def __init__(self,
+                 pool_connections: int = 4,
+                 pool_maxsize: int = 16,
+                 connect_timeout: float = 3.05,
+                 read_timeout: float = 20,
+                 max_retries: int = 3,
+                 backoff_base: float = 0.5,
+                 backoff_max: float = 20,
+                 retry_statuses: Iterable[int] = (429, 500, 502, 503, 504),
+                 sleep: Callable[[float], None] = time.sleep):
+        self.session = requests.Session()
+        self.http_adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", self.http_adapter)
+        self.session.mount("http://", self.http_adapter)
+
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = set(retry_statuses)
+        self.sleep = sleep
+
+        self._lock = threading.Lock()
+        self.requests_sent = 0
+        self.retries = 0
+
+    def _retry_after_seconds(self, response: requests.Response) -> Optional[float]:
+        retry_after = response.headers.get("Retry-After")
+        if response.status_code not in self.RETRY_AFTER_STATUSES or not retry_after:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def _backoff_seconds(self, attempt: int) -> float:
+        # Full jitter: evita que varias invocaciones reintenten de forma sincronizada
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        attempt = 0
+        while True:
+            with self._lock:
+                self.requests_sent += 1
+            try:
+                response = self.session.get(url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                wait_seconds = self._backoff_seconds(attempt)
+            else:
+                if response.status_code not in self.retry_statuses or attempt >= self.max_retries:
+                    return response
+                retry_after = self._retry_after_seconds(response)
+                wait_seconds = min(self.backoff_max, retry_after) if retry_after is not None \
+                    else self._backoff_seconds(attempt)
+                response.close()
+
+            with self._lock:
+                self.retries += 1
+            attempt += 1
+            self.sleep(wait_seconds)
+
+    def connection_stats(self) -> Dict[str, int]:
+        pools = self.http_adapter.poolmanager.pools
+        connections_opened = 0
+        for pool_key in pools.keys():
+            pool = pools.get(pool_key)
+            if pool is not None:
+                connections_opened += pool.num_connections
+        return {
+            "requests_sent": self.requests_sent,
+            "retries": self.retries,
+            "connections_opened": connections_opened,
+            "connections_reused": max(0, self.requests_sent - connections_opened),
+        }
+
+    def close(self) -> None:
+        self.session.close()
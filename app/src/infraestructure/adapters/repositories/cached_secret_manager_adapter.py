@@ -0,0 +1,85 @@
+import threading
+import time
+from typing import Callable, Dict, Optional, Set
+
+from app.src.application.ports.secret_manager_port import SecretManagerPort
+
+
+class _CacheEntry:
+    def __init__(self, value: Dict[str, str], loaded_at: float):
+        self.value = value
+        self.loaded_at = loaded_at
+
+
+class CachedSecretManagerAdapter(SecretManagerPort):
+    """
+    Cache con TTL sobre cualquier SecretManagerPort (Secrets Manager, SSM).
+
+    - Dentro de ttl_seconds se devuelve el valor en memoria.
+    - Entre ttl_seconds y ttl_seconds + stale_seconds se devuelve el valor
+      vencido y se refresca en segundo plano (stale-while-revalidate).
+    - Pasado ese margen, o tras invalidate(), se vuelve a leer de forma síncrona.
+    """
+
+    def __init__(self, delegate: SecretManagerPort, ttl_seconds: float = 300, stale_seconds: float = 600,
+                 clock: Callable[[], float] = time.monotonic):
+        self.delegate = delegate
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.clock = clock
+        self._entries: Dict[str, _CacheEntry] = {}
+        self._refreshing: Set[str] = set()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.background_refreshes = 0
+
+    def get_secret(self, secret_name: str) -> Dict[str, str]:
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(secret_name)
+            age = now - entry.loaded_at if entry else None
+
+            if entry and age <= self.ttl_seconds:
+                self.hits += 1
+                return entry.value
+
+            if entry and age <= self.ttl_seconds + self.stale_seconds:
+                self.hits += 1
+                if secret_name not in self._refreshing:
+                    self._refreshing.add(secret_name)
+                    self.background_refreshes += 1
+                    threading.Thread(target=self._background_refresh, args=(secret_name,), daemon=True).start()
+                return entry.value
+
+            self.misses += 1
+
+        return self._load(secret_name)
+
+    def invalidate(self, secret_name: Optional[str] = None) -> None:
+        with self._lock:
+            if secret_name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(secret_name, None)
+
+    def refresh(self, secret_name: str) -> Dict[str, str]:
+        self.invalidate(secret_name)
+        return self._load(secret_name)
+
+    def _load(self, secret_name: str) -> Dict[str, str]:
+        value = self.delegate.get_secret(secret_name)
+        with self._lock:
+            self._entries[secret_name] = _CacheEntry(value, self.clock())
+        return value
+
+    def _background_refresh(self, secret_name: str) -> None:
+        try:
+            self._load(secret_name)
+        except Exception as e:
+            # Se mantiene el valor vencido; el siguiente acceso fuera de la ventana reintenta
+            print(f"Error refrescando secreto en segundo plano: {type(e).__name__}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(secret_name)
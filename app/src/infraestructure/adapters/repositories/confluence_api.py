@@ -1,16 +1,31 @@
 import requests
 from requests.auth import HTTPBasicAuth
-from typing import Dict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from app.src.application.ports.document_source_port import DocumentSourcePort
+from app.src.infraestructure.adapters.http.pooled_session import PooledHttpSession
 
 class ConfluenceAPIAdapter(DocumentSourcePort):
-    def __init__(self, base_url: str, credentials: Dict[str, str]):
+    PAGE_EXPAND = "body.storage,version,space"
+
+    def __init__(self, base_url: str, credentials: Optional[Dict[str, str]] = None,
+                 credentials_refresher: Optional[Callable[[], Dict[str, str]]] = None,
+                 http_session: Optional[PooledHttpSession] = None,
+                 bulk_batch_size: int = 50,
+                 credentials_provider: Optional[Callable[[], Dict[str, str]]] = None):
         self.base_url = base_url
-        self.credentials = credentials
+        self.credentials = credentials or {}
+        self.credentials_refresher = credentials_refresher
+        # Se consulta en cada request (p. ej. un CachedSecretManagerAdapter): una rotación se
+        # toma al vencer el TTL del cache, sin esperar a un 401
+        self.credentials_provider = credentials_provider
+        self.http_session = http_session or PooledHttpSession()
+        self.bulk_batch_size = bulk_batch_size
         self.headers = {"Accept": "application/json"}
 
     def _get_auth(self) -> HTTPBasicAuth:
+        if self.credentials_provider:
+            self.credentials = self.credentials_provider()
         api_token = self.credentials.get("api_token")
         user_email = self.credentials.get("user_api_mail")
 
@@ -19,12 +34,86 @@ class ConfluenceAPIAdapter(DocumentSourcePort):
 
         return HTTPBasicAuth(user_email, api_token)
 
+    def _get(self, url: str, params: Optional[Dict[str, str]] = None) -> requests.Response:
+        response = self.http_session.get(url, params=params, headers=self.headers, auth=self._get_auth())
+        if response.status_code == 401 and self.credentials_refresher:
+            # Credenciales rotadas: se fuerza la relectura del secreto y se reintenta una vez
+            self.credentials = self.credentials_refresher()
+            response = self.http_session.get(url, params=params, headers=self.headers, auth=self._get_auth())
+        return response
+
+    def _search_batches(self, cql: str, limit: int,
+                        next_link: Optional[str] = None) -> Iterator[Tuple[List[Dict], Optional[str]]]:
+        if next_link:
+            url, params = f"{self.base_url}{next_link}", None
+        else:
+            url = f"{self.base_url}/rest/api/content/search"
+            params = {"cql": cql, "expand": self.PAGE_EXPAND, "limit": str(limit)}
+        while url:
+            response = self._get(url, params)
+            response.raise_for_status()
+            result = response.json()
+
+            # _links.next ya incluye cql, cursor y limit; es relativo al contexto (/wiki)
+            next_link = result.get("_links", {}).get("next")
+            yield result.get("results", []), next_link
+
+            url = f"{self.base_url}{next_link}" if next_link else None
+            params = None
+
+    def _search(self, cql: str, limit: int) -> Iterator[Dict]:
+        for pages, _ in self._search_batches(cql, limit):
+            yield from pages
+
     def get_page(self, page_id: str) -> Dict:
-        url = f"{self.base_url}/rest/api/content/{page_id}?expand=body.storage,version,space"
+        url = f"{self.base_url}/rest/api/content/{page_id}?expand={self.PAGE_EXPAND}"
         try:
-            response = requests.get(url, headers=self.headers, auth=self._get_auth())
+            response = self._get(url)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
             print(f"Error al obtener la página {page_id} de Confluence: {e}")
-            raise ValueError(f"Error al obtener la página {page_id} de Confluence: {e}")
\ No newline at end of file
+            raise ValueError(f"Error al obtener la página {page_id} de Confluence: {e}")
+
+    def get_pages(self, page_ids: Iterable[str]) -> Iterator[Dict]:
+        """
+        Obtiene páginas en bloque mediante búsqueda CQL (id in (...)) agrupando
+        hasta bulk_batch_size ids por llamada. Los resultados se entregan como
+        generador; las páginas inexistentes o sin permiso no se devuelven.
+        """
+        batch: List[str] = []
+        for page_id in page_ids:
+            batch.append(str(page_id))
+            if len(batch) >= self.bulk_batch_size:
+                yield from self._get_pages_batch(batch)
+                batch = []
+        if batch:
+            yield from self._get_pages_batch(batch)
+
+    def _get_pages_batch(self, page_ids: List[str]) -> Iterator[Dict]:
+        ids = [page_id for page_id in page_ids if page_id.isdigit()]
+        if len(ids) != len(page_ids):
+            raise ValueError(f"Ids de página inválidos para búsqueda CQL: {page_ids}")
+
+        cql = f"id in ({','.join(ids)})"
+        try:
+            yield from self._search(cql, limit=len(ids))
+        except requests.exceptions.RequestException as e:
+            print(f"Error al obtener las páginas {ids} de Confluence: {e}")
+            raise ValueError(f"Error al obtener las páginas {ids} de Confluence: {e}")
+
+    def iter_page_batches(self, cql: str, cursor: Optional[str] = None) -> Iterator[Tuple[List[Dict], Optional[str]]]:
+        """
+        Recorre el resultado de una consulta CQL página a página del listado.
+        Cada elemento es (páginas, cursor); el cursor permite reanudar el
+        recorrido desde el siguiente bloque y es None al llegar al final.
+        """
+        try:
+            yield from self._search_batches(cql, self.bulk_batch_size, next_link=cursor)
+        except requests.exceptions.RequestException as e:
+            print(f"Error al recorrer la consulta CQL '{cql}' en Confluence: {e}")
+            raise ValueError(f"Error al recorrer la consulta CQL '{cql}' en Confluence: {e}")
+
+    def connection_stats(self) -> Dict[str, int]:
+        return self.http_session.connection_stats()
+
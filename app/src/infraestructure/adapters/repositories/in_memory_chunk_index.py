@@ -0,0 +1,30 @@
+import copy
+import threading
+
+from typing import Dict, Optional
+
+from app.src.application.ports.chunk_index_port import ChunkIndexPort
+
+
+class InMemoryChunkIndexAdapter(ChunkIndexPort):
+    """
+    Índice de chunks en memoria para ejecución local y pruebas; no persiste
+    entre entornos de ejecución.
+    """
+
+    def __init__(self):
+        self._indexes: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def load(self, page_id: str) -> Optional[dict]:
+        with self._lock:
+            index = self._indexes.get(page_id)
+            return copy.deepcopy(index) if index is not None else None
+
+    def save(self, page_id: str, index: dict) -> None:
+        with self._lock:
+            self._indexes[page_id] = copy.deepcopy(index)
+
+    def delete(self, page_id: str) -> None:
+        with self._lock:
+            self._indexes.pop(page_id, None)
@@ -0,0 +1,35 @@
+import threading
+
+from typing import Dict, List, Optional
+
+from app.src.application.ports.sync_manifest_port import SyncManifestPort
+
+
+class InMemorySyncManifestAdapter(SyncManifestPort):
+    """
+    Manifiesto en memoria para ejecución local y pruebas; no persiste entre
+    entornos de ejecución.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, page_id: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(page_id)
+            return dict(entry) if entry else None
+
+    def put(self, page_id: str, entry: dict) -> None:
+        with self._lock:
+            self._entries[page_id] = dict(entry)
+
+    def delete(self, page_id: str) -> None:
+        with self._lock:
+            self._entries.pop(page_id, None)
+
+    def delete_many(self, page_ids: List[str]) -> Dict[str, str]:
+        with self._lock:
+            for page_id in page_ids:
+                self._entries.pop(page_id, None)
+        return {}
@@ -0,0 +1,112 @@
+import gzip
+import importlib.util
+import logging
+import zlib
+
+from abc import ABC, abstractmethod
+from typing import Any, BinaryIO, Optional
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class ObjectCodec(ABC):
+    """
+    Compresión de los objetos JSON guardados en S3. El compresor se alimenta
+    por fragmentos (compress/flush) para no romper la escritura por streaming,
+    y el lector envuelve el cuerpo de la respuesta sin leerlo completo.
+    """
+    name = ""
+    content_encoding: Optional[str] = None
+
+    @abstractmethod
+    def compressor(self) -> Any:
+        pass
+
+    @abstractmethod
+    def open_reader(self, stream: BinaryIO) -> BinaryIO:
+        pass
+
+
+class _PassThroughCompressor:
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class IdentityCodec(ObjectCodec):
+    name = "identity"
+
+    def compressor(self) -> Any:
+        return _PassThroughCompressor()
+
+    def open_reader(self, stream: BinaryIO) -> BinaryIO:
+        return stream
+
+
+class GzipCodec(ObjectCodec):
+    name = "gzip"
+    content_encoding = "gzip"
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def compressor(self) -> Any:
+        # wbits=31 produce formato gzip (cabecera + CRC), legible con gzip.GzipFile
+        return zlib.compressobj(self.level, zlib.DEFLATED, 31)
+
+    def open_reader(self, stream: BinaryIO) -> BinaryIO:
+        return gzip.GzipFile(fileobj=stream, mode="rb")
+
+
+class ZstdCodec(ObjectCodec):
+    name = "zstd"
+    content_encoding = "zstd"
+
+    def __init__(self, level: int = 3):
+        import zstandard
+        self._zstandard = zstandard
+        self.level = level
+
+    def compressor(self) -> Any:
+        return self._zstandard.ZstdCompressor(level=self.level).compressobj()
+
+    def open_reader(self, stream: BinaryIO) -> BinaryIO:
+        return self._zstandard.ZstdDecompressor().stream_reader(stream)
+
+
+def _zstd_available() -> bool:
+    return importlib.util.find_spec("zstandard") is not None
+
+
+def create_object_codec(codec_name: Optional[str] = None) -> ObjectCodec:
+    """
+    Crea el codec de escritura solicitado ("identity", "gzip" o "zstd").
+    Si zstandard no está instalado se usa gzip.
+    """
+    requested = (codec_name or "identity").lower()
+    if requested in ("identity", "none", ""):
+        return IdentityCodec()
+    if requested == "gzip":
+        return GzipCodec()
+    if requested == "zstd":
+        if _zstd_available():
+            return ZstdCodec()
+        logger.warning("Codec 'zstd' no instalado, se usa gzip")
+        return GzipCodec()
+    raise ValueError(f"Codec de compresión no soportado: {codec_name}")
+
+
+def codec_for_content_encoding(content_encoding: Optional[str]) -> ObjectCodec:
+    """Codec para leer un objeto según su Content-Encoding; sin cabecera el objeto está sin comprimir."""
+    encoding = (content_encoding or "").lower()
+    if not encoding or encoding == "identity":
+        return IdentityCodec()
+    if encoding == "gzip":
+        return GzipCodec()
+    if encoding == "zstd":
+        return ZstdCodec()
+    raise ValueError(f"Content-Encoding no soportado: {content_encoding}")
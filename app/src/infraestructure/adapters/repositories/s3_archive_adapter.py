@@ -0,0 +1,61 @@
+import boto3
+
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from app.src.application.ports.document_archive_port import DocumentArchivePort
+from app.src.infraestructure.adapters.repositories.s3_batch_delete import delete_objects
+
+
+class S3ArchiveAdapter(DocumentArchivePort):
+    """
+    Mueve objetos de ground truth del prefijo vigente al prefijo eliminado:
+    copias server-side concurrentes (el contenido no pasa por la Lambda) y
+    borrado en lotes de hasta 1000 claves con DeleteObjects.
+    """
+
+    def __init__(self, bucket, source_path, archive_path, region_name, max_pool_connections: int = 16,
+                 archive_bucket=None):
+        self.s3_client = boto3.client('s3', region_name=region_name,
+                                      config=Config(max_pool_connections=max_pool_connections))
+        self.bucket = bucket
+        self.source_path = source_path
+        self.archive_bucket = archive_bucket or bucket
+        self.archive_path = archive_path
+        self.max_pool_connections = max_pool_connections
+        self._executor = None
+
+    def _source_key(self, object_name: str) -> str:
+        return f"{self.source_path}/{object_name}"
+
+    def _copy(self, object_name: str) -> Tuple[str, Optional[str]]:
+        try:
+            self.s3_client.copy_object(
+                Bucket=self.archive_bucket,
+                Key=f"{self.archive_path}/{object_name}",
+                CopySource={"Bucket": self.bucket, "Key": self._source_key(object_name)}
+            )
+            return object_name, None
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                # Ya no está en vigente (p. ej. reintento tras un borrado parcial): nada que archivar
+                return object_name, None
+            return object_name, str(e)
+        except Exception as e:
+            return object_name, str(e)
+
+    def archive_many(self, object_names: List[str]) -> Dict[str, str]:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_pool_connections)
+
+        errors = {}
+        for object_name, error in self._executor.map(self._copy, object_names):
+            if error:
+                print(f"Error al archivar objeto '{object_name}': {error}")
+                errors[object_name] = error
+        return errors
+
+    def delete_many(self, object_names: List[str]) -> Dict[str, str]:
+        return delete_objects(self.s3_client, self.bucket, self.source_path, object_names)
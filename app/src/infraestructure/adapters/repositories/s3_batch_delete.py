@@ -0,0 +1,29 @@
+from typing import Dict, List
+
+# Límite de claves por llamada a DeleteObjects
+DELETE_OBJECTS_MAX_KEYS = 1000
+
+
+def delete_objects(s3_client, bucket: str, path: str, object_names: List[str]) -> Dict[str, str]:
+    """
+    Elimina {path}/{nombre} en lotes de hasta 1000 claves con DeleteObjects;
+    retorna {nombre: error} de los que fallaron.
+    """
+    errors = {}
+    prefix_length = len(path) + 1
+    for start in range(0, len(object_names), DELETE_OBJECTS_MAX_KEYS):
+        chunk = object_names[start:start + DELETE_OBJECTS_MAX_KEYS]
+        try:
+            response = s3_client.delete_objects(
+                Bucket=bucket,
+                Delete={"Objects": [{"Key": f"{path}/{name}"} for name in chunk], "Quiet": True}
+            )
+        except Exception as e:
+            print(f"Error al eliminar objetos de S3: {e}")
+            errors.update({name: str(e) for name in chunk})
+            continue
+
+        # En modo Quiet solo se informan las claves que fallaron
+        for error in response.get("Errors", []):
+            errors[error["Key"][prefix_length:]] = f"{error.get('Code')}: {error.get('Message')}"
+    return errors
@@ -0,0 +1,36 @@
+import boto3
+import json
+
+from typing import Optional
+
+from app.src.application.ports.checkpoint_store_port import CheckpointStorePort
+
+
+class S3CheckpointStoreAdapter(CheckpointStorePort):
+
+    def __init__(self, bucket, path, region_name):
+        self.s3_client = boto3.client('s3', region_name=region_name)
+        self.bucket = bucket
+        self.path = path
+
+    def _object_key(self, run_id: str) -> str:
+        return f"{self.path}/{run_id}.checkpoint.json"
+
+    def load(self, run_id: str) -> Optional[dict]:
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=self._object_key(run_id))
+            return json.loads(response['Body'].read())
+        except self.s3_client.exceptions.NoSuchKey:
+            return None
+        except Exception as e:
+            print(f"Error al leer checkpoint desde S3: {e}")
+            raise ValueError(f"Error al leer checkpoint desde S3: {e}")
+
+    def save(self, run_id: str, checkpoint: dict) -> None:
+        try:
+            self.s3_client.put_object(Bucket=self.bucket, Key=self._object_key(run_id),
+                                      Body=json.dumps(checkpoint).encode("utf-8"),
+                                      ContentType='application/json')
+        except Exception as e:
+            print(f"Error al guardar checkpoint en S3: {e}")
+            raise ValueError(f"Error al guardar checkpoint en S3: {e}")
@@ -0,0 +1,48 @@
+import boto3
+import json
+
+from typing import Optional
+
+from app.src.application.ports.chunk_index_port import ChunkIndexPort
+
+
+class S3ChunkIndexAdapter(ChunkIndexPort):
+    """
+    Índice de chunks por página ({path}/{page_id}.chunks.json) con el hash
+    de contenido de cada chunk escrito en ground truth. Se guarda en un
+    prefijo propio para que la knowledge base no lo ingeste como documento.
+    """
+
+    def __init__(self, bucket, path, region_name):
+        self.s3_client = boto3.client('s3', region_name=region_name)
+        self.bucket = bucket
+        self.path = path
+
+    def _object_key(self, page_id: str) -> str:
+        return f"{self.path}/{page_id}.chunks.json"
+
+    def load(self, page_id: str) -> Optional[dict]:
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=self._object_key(page_id))
+            return json.loads(response['Body'].read())
+        except self.s3_client.exceptions.NoSuchKey:
+            return None
+        except Exception as e:
+            print(f"Error al leer índice de chunks desde S3: {e}")
+            raise ValueError(f"Error al leer índice de chunks desde S3: {e}")
+
+    def save(self, page_id: str, index: dict) -> None:
+        try:
+            self.s3_client.put_object(Bucket=self.bucket, Key=self._object_key(page_id),
+                                      Body=json.dumps(index, ensure_ascii=False).encode("utf-8"),
+                                      ContentType='application/json')
+        except Exception as e:
+            print(f"Error al guardar índice de chunks en S3: {e}")
+            raise ValueError(f"Error al guardar índice de chunks en S3: {e}")
+
+    def delete(self, page_id: str) -> None:
+        try:
+            self.s3_client.delete_object(Bucket=self.bucket, Key=self._object_key(page_id))
+        except Exception as e:
+            print(f"Error al eliminar índice de chunks en S3: {e}")
+            raise ValueError(f"Error al eliminar índice de chunks en S3: {e}")
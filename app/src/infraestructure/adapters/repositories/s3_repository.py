@@ -1,40 +1,317 @@
 import boto3
+import hashlib
 import json
 
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 from urllib.parse import urlparse
 
+try:
+    import ijson
+except ImportError:  # ijson es opcional: sin él se decodifica el cuerpo completo en bytes
+    ijson = None
+
 from app.src.application.ports.landing_zone_port import LandingZonePort
+from app.src.infraestructure.adapters.repositories.s3_batch_delete import delete_objects
+from app.src.infraestructure.adapters.repositories.object_codecs import (
+    ObjectCodec,
+    IdentityCodec,
+    codec_for_content_encoding,
+)
 
 
 # from app.src.application.ports. Ground
 
 
+# S3 exige partes de al menos 5 MiB (salvo la última) en una subida multipart
+MIN_MULTIPART_PART_SIZE = 5 * 1024 * 1024
+
+
+def _string_size(value) -> int:
+    """Cota inferior de los bytes del JSON: largo de claves y cadenas, sin comillas ni separadores."""
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(key) + _string_size(item) for key, item in value.items() if isinstance(key, str))
+    if isinstance(value, (list, tuple)):
+        return sum(_string_size(item) for item in value)
+    return 0
+
+
 class S3RepositoryAdapter(LandingZonePort):
+    """
+    Lee los documentos JSON por streaming, decodificando el cuerpo de forma
+    incremental. En la escritura, los documentos cuyas cadenas ya alcanzan
+    multipart_threshold se serializan por fragmentos y se suben en partes de
+    part_size, de modo que la memoria pico depende del tamaño de parte y no
+    del documento; el resto se serializa de una vez con el encoder en C, que
+    es más rápido que iterencode.
+
+    Con un codec de compresión los objetos se escriben comprimidos con su
+    Content-Encoding; la lectura elige el codec según la cabecera de cada
+    objeto, así que los objetos previos sin comprimir se siguen leyendo.
 
-    def __init__(self, bucket, path, region_name):
-        self.s3_client = boto3.client('s3', region_name=region_name)
+    Con skip_unchanged cada objeto guarda el sha256 de su JSON en la metadata
+    content-sha256 y, si el objeto existente ya tiene el mismo hash, se omite
+    el PUT: no cambia LastModified y el resultado se marca como skipped.
+    """
+
+    def __init__(self, bucket, path, region_name, max_pool_connections: int = 10,
+                 multipart_threshold: int = 8 * 1024 * 1024,
+                 part_size: int = 8 * 1024 * 1024,
+                 read_chunk_size: int = 64 * 1024,
+                 codec: Optional[ObjectCodec] = None,
+                 skip_unchanged: bool = False):
+        # El pool de conexiones del cliente se comparte entre las escrituras concurrentes de save_many
+        self.s3_client = boto3.client('s3', region_name=region_name,
+                                      config=Config(max_pool_connections=max_pool_connections))
         self.bucket = bucket
         self.path = path
         self.content_type = 'application/json'
+        self.max_pool_connections = max_pool_connections
+        # Los hilos del pool se crean a demanda: construirlo aquí no tiene costo y evita una carrera en save_many
+        self._executor = ThreadPoolExecutor(max_workers=max_pool_connections)
+        self.multipart_threshold = max(multipart_threshold, MIN_MULTIPART_PART_SIZE)
+        self.part_size = max(part_size, MIN_MULTIPART_PART_SIZE)
+        self.read_chunk_size = read_chunk_size
+        self.codec = codec or IdentityCodec()
+        self.skip_unchanged = skip_unchanged
 
-    def save(self, object_file_name: str, page_data: dict) -> dict:
+    def _serialize(self, page_data: dict) -> Optional[bytes]:
+        """JSON completo si el documento es pequeño; None si debe serializarse por fragmentos."""
+        if _string_size(page_data) >= self.multipart_threshold:
+            return None
+        return json.dumps(page_data, ensure_ascii=False).encode("utf-8")
+
+    @staticmethod
+    def _iter_json(page_data: dict, serialized: Optional[bytes]) -> Iterator[bytes]:
+        if serialized is not None:
+            yield serialized
+            return
+        # Misma salida que json.dumps(ensure_ascii=False), pero sin construir el documento completo
+        for fragment in json.JSONEncoder(ensure_ascii=False).iterencode(page_data):
+            yield fragment.encode("utf-8")
 
+    def _iter_encoded(self, page_data: dict, serialized: Optional[bytes]) -> Iterator[bytes]:
+        compressor = self.codec.compressor()
+        for chunk in self._iter_json(page_data, serialized):
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        tail = compressor.flush()
+        if tail:
+            yield tail
+
+    def _content_hash(self, page_data: dict, serialized: Optional[bytes]) -> str:
+        # Hash del JSON sin comprimir: no depende del codec con que se escribió el objeto
+        digest = hashlib.sha256()
+        for chunk in self._iter_json(page_data, serialized):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+    def _head(self, object_key: str) -> Optional[dict]:
+        """Cabeceras del objeto actual, o None si no existe."""
         try:
-            object_key = f"{self.path}/{object_file_name}"
-            response = self.s3_client.put_object(Bucket=self.bucket, Key=object_key, Body=json.dumps(page_data, ensure_ascii=False).encode("utf-8"),
-                                                 ContentType=self.content_type)
+            return self.s3_client.head_object(Bucket=self.bucket, Key=object_key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    def _object_headers(self, content_hash: Optional[str] = None) -> dict:
+        headers = {"ContentType": self.content_type}
+        metadata = {}
+        if self.codec.content_encoding:
+            headers["ContentEncoding"] = self.codec.content_encoding
+            metadata["codec"] = self.codec.name
+        if content_hash:
+            metadata["content-sha256"] = content_hash
+        if metadata:
+            headers["Metadata"] = metadata
+        return headers
 
-            print(f"Archivo '{object_key}' guardado en bucket '{self.bucket}'.")
+    def _put(self, object_key: str, page_data: dict, serialized: Optional[bytes], headers: dict) -> dict:
+        buffer = bytearray()
+        chunks = self._iter_encoded(page_data, serialized)
+        for chunk in chunks:
+            buffer += chunk
+            if len(buffer) >= self.multipart_threshold:
+                return self._put_multipart(object_key, buffer, chunks, headers)
 
-            return {
-                "uri": f"s3://{self.bucket}/{object_key}",
-                "request_id": response.get("ResponseMetadata").get("RequestId")
-            }
+        return self.s3_client.put_object(Bucket=self.bucket, Key=object_key, Body=bytes(buffer),
+                                         **headers)
+
+    def _put_multipart(self, object_key: str, buffer: bytearray, chunks: Iterator[bytes], headers: dict) -> dict:
+        upload = self.s3_client.create_multipart_upload(Bucket=self.bucket, Key=object_key, **headers)
+        upload_id = upload["UploadId"]
+        parts = []
+
+        def upload_part(body: bytes) -> None:
+            part_number = len(parts) + 1
+            response = self.s3_client.upload_part(Bucket=self.bucket, Key=object_key, UploadId=upload_id,
+                                                  PartNumber=part_number, Body=body)
+            parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+
+        try:
+            while True:
+                # El buffer inicial puede traer ya varias partes (documento serializado de una vez)
+                while len(buffer) >= self.part_size:
+                    upload_part(bytes(buffer[:self.part_size]))
+                    del buffer[:self.part_size]
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                buffer += chunk
+            if buffer or not parts:
+                upload_part(bytes(buffer))
+
+            return self.s3_client.complete_multipart_upload(Bucket=self.bucket, Key=object_key, UploadId=upload_id,
+                                                            MultipartUpload={"Parts": parts})
+        except Exception:
+            # Sin abortar, las partes ya subidas quedan cobrándose en el bucket
+            self.s3_client.abort_multipart_upload(Bucket=self.bucket, Key=object_key, UploadId=upload_id)
+            raise
+
+    def save(self, object_file_name: str, page_data: dict) -> dict:
+        object_key = f"{self.path}/{object_file_name}"
+        try:
+            serialized = self._serialize(page_data)
+            content_hash = self._content_hash(page_data, serialized) if self.skip_unchanged else None
+            head = self._head(object_key) if self.skip_unchanged else None
+            if self._unchanged(head, content_hash):
+                return self._skipped(object_key, head)
+            result = self._write(object_key, page_data, serialized, content_hash)
+            result.pop("version_id")
+            return result
 
         except Exception as e:
             print(f"Error al subir archivo a S3: {e}")
             raise ValueError(f"Error al subir archivo a S3: {e}")
 
+    @staticmethod
+    def _unchanged(head: Optional[dict], content_hash: Optional[str]) -> bool:
+        return (content_hash is not None and head is not None
+                and head.get("Metadata", {}).get("content-sha256") == content_hash)
+
+    def _skipped(self, object_key: str, head: dict) -> dict:
+        print(f"Archivo '{object_key}' sin cambios en bucket '{self.bucket}', se omite la escritura.")
+        return {"uri": f"s3://{self.bucket}/{object_key}",
+                "request_id": head.get("ResponseMetadata", {}).get("RequestId", ""), "skipped": True}
+
+    def _write(self, object_key: str, page_data: dict, serialized: Optional[bytes],
+               content_hash: Optional[str]) -> dict:
+        response = self._put(object_key, page_data, serialized, self._object_headers(content_hash))
+
+        print(f"Archivo '{object_key}' guardado en bucket '{self.bucket}'.")
+
+        return {
+            "uri": f"s3://{self.bucket}/{object_key}",
+            "request_id": response.get("ResponseMetadata").get("RequestId"),
+            "skipped": False,
+            "version_id": response.get("VersionId")
+        }
+
+    def _save_result(self, object_file_name: str, page_data: dict) -> dict:
+        try:
+            return {"key": object_file_name, "error": "", **self.save(object_file_name, page_data)}
+        except Exception as e:
+            return self._error_result(object_file_name, str(e))
+
+    def _snapshot(self, object_key: str, head: Optional[dict]) -> Optional[dict]:
+        """
+        Cuerpo y cabeceras del objeto para poder restaurarlo. Solo se lee si
+        el objeto existe en un bucket sin versionado: si no existía se elimina
+        y, con versionado, basta con eliminar la versión escrita.
+        """
+        if head is None or head.get("VersionId") not in (None, "null"):
+            return None
+        response = self.s3_client.get_object(Bucket=self.bucket, Key=object_key)
+        snapshot = {"Body": response["Body"].read(), "Metadata": response.get("Metadata", {})}
+        for header in ("ContentType", "ContentEncoding"):
+            if response.get(header):
+                snapshot[header] = response[header]
+        return snapshot
+
+    def _save_result_with_snapshot(self, object_file_name: str, page_data: dict) -> dict:
+        object_key = f"{self.path}/{object_file_name}"
+        try:
+            serialized = self._serialize(page_data)
+            content_hash = self._content_hash(page_data, serialized) if self.skip_unchanged else None
+        except Exception as e:
+            return self._error_result(object_file_name, f"Error al subir archivo a S3: {e}")
+        try:
+            # Un único HEAD sirve para el hash de skip_unchanged y para decidir cómo revertir
+            head = self._head(object_key)
+            if self._unchanged(head, content_hash):
+                return {"key": object_file_name, "error": "", **self._skipped(object_key, head), "snapshot": None}
+            snapshot = self._snapshot(object_key, head)
+        except Exception as e:
+            return self._error_result(object_file_name, f"No se pudo leer la versión previa: {e}")
+        try:
+            result = self._write(object_key, page_data, serialized, content_hash)
+            return {"key": object_file_name, "error": "", **result, "snapshot": snapshot}
+        except Exception as e:
+            print(f"Error al subir archivo a S3: {e}")
+            return self._error_result(object_file_name, f"Error al subir archivo a S3: {e}")
+
+    @staticmethod
+    def _error_result(object_file_name: str, error: str) -> dict:
+        return {"key": object_file_name, "uri": "", "request_id": "", "skipped": False, "error": error}
+
+    def _restore(self, result: dict) -> None:
+        object_key = f"{self.path}/{result['key']}"
+        if result["snapshot"] is not None:
+            self.s3_client.put_object(Bucket=self.bucket, Key=object_key, **result["snapshot"])
+        elif result.get("version_id"):
+            # Con versionado, eliminar la versión escrita deja vigente la anterior (o ninguna)
+            self.s3_client.delete_object(Bucket=self.bucket, Key=object_key, VersionId=result["version_id"])
+        else:
+            self.s3_client.delete_object(Bucket=self.bucket, Key=object_key)
+
+    def save_many(self, contents: Dict[str, dict], all_or_nothing: bool = False) -> List[dict]:
+        """
+        Escribe varios objetos en paralelo y retorna un resultado por objeto
+        (key, uri, request_id, skipped, error), en el orden de contents.
+
+        - best-effort (por defecto): los errores solo se reportan en el resultado.
+        - all_or_nothing: antes de escribir se hace un HEAD de cada objeto; si
+          algún objeto falla, los escritos recuperan su versión previa (o se
+          eliminan si no existían) y se lanza ValueError. Los omitidos por no
+          tener cambios no se tocan. Con versionado en el bucket se revierte
+          eliminando la versión escrita; sin versionado el cuerpo previo se lee
+          antes del PUT y se guarda en memoria, por lo que este modo es para
+          objetos pequeños y cuesta un GET extra por objeto existente.
+        """
+        save_result = self._save_result_with_snapshot if all_or_nothing else self._save_result
+        results = list(self._executor.map(lambda item: save_result(*item), contents.items()))
+        errors = [result for result in results if result["error"]]
+
+        if errors and all_or_nothing:
+            restore_errors = []
+            for result in results:
+                if result["error"] or result["skipped"]:
+                    continue
+                try:
+                    self._restore(result)
+                except Exception as e:
+                    restore_errors.append(f"{result['key']}: {e}")
+            error_detail = "; ".join(f"{result['key']}: {result['error']}" for result in errors)
+            if restore_errors:
+                raise ValueError(f"Error al subir lote a S3 (reversión incompleta: {'; '.join(restore_errors)}): "
+                                 f"{error_detail}")
+            raise ValueError(f"Error al subir lote a S3 (revertido): {error_detail}")
+
+        for result in results:
+            result.pop("snapshot", None)
+            result.pop("version_id", None)
+        return results
+
+    def delete_many(self, object_file_names: List[str]) -> Dict[str, str]:
+        """Elimina varios objetos con DeleteObjects (hasta 1000 por llamada); retorna {objeto: error}."""
+        return delete_objects(self.s3_client, self.bucket, self.path, object_file_names)
+
     def _parse_s3_uri(self, s3_uri):
 
         parsed = urlparse(s3_uri)
@@ -46,12 +323,31 @@ class S3RepositoryAdapter(LandingZonePort):
 
         return bucket, key
 
+    def _load_json(self, body, content_encoding: Optional[str] = None, streaming: bool = True) -> dict:
+        body = codec_for_content_encoding(content_encoding).open_reader(body)
+        if ijson is not None and streaming:
+            # Decodificación incremental: solo se mantiene en memoria el fragmento leído y el objeto resultante
+            return next(ijson.items(body, "", use_float=True, buf_size=self.read_chunk_size))
+        # json.loads acepta bytes: se evita la copia intermedia en str
+        return json.loads(body.read())
+
+    @staticmethod
+    def _is_integer_overflow(error: Exception) -> bool:
+        # El backend yajl2_c de ijson no admite enteros de más de 64 bits; json.loads sí
+        return ijson is not None and isinstance(error, ijson.JSONError) and "integer overflow" in str(error)
+
     def get_document(self, document_uri):
         try:
             bucket, key = self._parse_s3_uri(document_uri)
             response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
-            content = response['Body'].read().decode('utf-8')
-            return json.loads(content)
+            try:
+                return self._load_json(response['Body'], response.get('ContentEncoding'))
+            except Exception as e:
+                if not self._is_integer_overflow(e):
+                    raise
+                # El stream ya se consumió en parte: se vuelve a leer el objeto y se decodifica completo
+                response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
+                return self._load_json(response['Body'], response.get('ContentEncoding'), streaming=False)
 
         except Exception as e:
             print(f"Error al leer archivo desde S3: {e}")
@@ -0,0 +1,53 @@
+import boto3
+import json
+
+from typing import Dict, List, Optional
+
+from app.src.application.ports.sync_manifest_port import SyncManifestPort
+from app.src.infraestructure.adapters.repositories.s3_batch_delete import delete_objects
+
+
+class S3SyncManifestAdapter(SyncManifestPort):
+    """
+    Manifiesto de sincronización con un objeto por página
+    ({path}/{page_id}.json), de modo que invocaciones concurrentes
+    no compiten por un único archivo.
+    """
+
+    def __init__(self, bucket, path, region_name):
+        self.s3_client = boto3.client('s3', region_name=region_name)
+        self.bucket = bucket
+        self.path = path
+
+    def _object_key(self, page_id: str) -> str:
+        return f"{self.path}/{page_id}.json"
+
+    def get(self, page_id: str) -> Optional[dict]:
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=self._object_key(page_id))
+            return json.loads(response['Body'].read())
+        except self.s3_client.exceptions.NoSuchKey:
+            return None
+        except Exception as e:
+            print(f"Error al leer manifiesto desde S3: {e}")
+            raise ValueError(f"Error al leer manifiesto desde S3: {e}")
+
+    def put(self, page_id: str, entry: dict) -> None:
+        try:
+            self.s3_client.put_object(Bucket=self.bucket, Key=self._object_key(page_id),
+                                      Body=json.dumps(entry).encode("utf-8"),
+                                      ContentType='application/json')
+        except Exception as e:
+            print(f"Error al guardar manifiesto en S3: {e}")
+            raise ValueError(f"Error al guardar manifiesto en S3: {e}")
+
+    def delete(self, page_id: str) -> None:
+        try:
+            self.s3_client.delete_object(Bucket=self.bucket, Key=self._object_key(page_id))
+        except Exception as e:
+            print(f"Error al eliminar manifiesto en S3: {e}")
+            raise ValueError(f"Error al eliminar manifiesto en S3: {e}")
+
+    def delete_many(self, page_ids: List[str]) -> Dict[str, str]:
+        errors = delete_objects(self.s3_client, self.bucket, self.path, [f"{page_id}.json" for page_id in page_ids])
+        return {object_name[:-len(".json")]: error for object_name, error in errors.items()}
@@ -0,0 +1,19 @@
+import boto3
+import json
+
+
+from app.src.application.ports.secret_manager_port import SecretManagerPort
+
+
+class SsmParameterAdapter(SecretManagerPort):
+    def __init__(self, region_name):
+        self.ssm_client = boto3.client('ssm', region_name=region_name)
+
+    def get_secret(self, secret_name: str) -> dict:
+        try:
+            response = self.ssm_client.get_parameter(Name=secret_name, WithDecryption=True)
+            parameter_value = response.get('Parameter', {}).get('Value', '{}')
+            return json.loads(parameter_value)
+        except Exception as e:
+            print(f"Error getting ssm parameter: {type(e).__name__}")
+            raise ValueError(f"Error getting ssm parameter: {type(e).__name__}")
@@ -0,0 +1,91 @@
+import re
+import unicodedata
+
+from typing import Dict, List, Optional
+
+from app.src.infraestructure.adapters.transformer.html_content_cleaner import (
+    HtmlContentCleaner,
+    create_content_cleaner,
+)
+
+_SLUG_INVALID = re.compile(r"[^a-z0-9]+")
+_SLUG_MAX_LENGTH = 48
+FIRST_SECTION_SLUG = "inicio"
+
+
+def _slug(heading: str) -> str:
+    ascii_heading = unicodedata.normalize("NFKD", heading).encode("ascii", "ignore").decode("ascii")
+    return _SLUG_INVALID.sub("-", ascii_heading.lower()).strip("-")[:_SLUG_MAX_LENGTH].strip("-")
+
+
+class ContentChunker:
+    """
+    Divide el contenido limpio de una página en chunks por encabezado y por
+    tamaño. El id de cada chunk sale del encabezado de su sección (más un
+    ordinal si se repite o si la sección supera max_chunk_bytes), así que
+    editar una sección no cambia los ids ni el contenido de las demás.
+    """
+
+    def __init__(self, cleaner: HtmlContentCleaner, max_chunk_bytes: int = 6000):
+        self.cleaner = cleaner
+        self.max_chunk_bytes = max_chunk_bytes
+
+    def chunk(self, content_html: str) -> List[Dict[str, str]]:
+        chunks = []
+        used_ids: Dict[str, int] = {}
+        for section in self.cleaner.sections(content_html):
+            base_id = _slug(section.heading) or FIRST_SECTION_SLUG
+            for content in self._pack(section.blocks):
+                ordinal = used_ids.get(base_id, 0)
+                used_ids[base_id] = ordinal + 1
+                chunk_id = base_id if ordinal == 0 else f"{base_id}-{ordinal + 1}"
+                chunks.append({"chunk_id": chunk_id, "heading": section.heading, "content": content})
+
+        # Una página sin contenido conserva un chunk para que siga representada en ground truth
+        return chunks or [{"chunk_id": FIRST_SECTION_SLUG, "heading": "", "content": ""}]
+
+    def _pack(self, blocks: List[str]) -> List[str]:
+        pieces: List[str] = []
+        current: List[str] = []
+        current_size = 0
+
+        def emit() -> None:
+            text = self.cleaner.finish("".join(current))
+            if text:
+                pieces.append(text)
+            current.clear()
+
+        for block in blocks:
+            block_size = len(block.encode("utf-8"))
+            if current and current_size + block_size > self.max_chunk_bytes:
+                emit()
+                current_size = 0
+            if block_size > self.max_chunk_bytes and self.cleaner.mode != "html":
+                # En HTML un bloque no se corta para no dejar etiquetas abiertas
+                for part in self._split_text(block):
+                    current.append(part)
+                    emit()
+                continue
+            current.append(block)
+            current_size += block_size
+
+        if current:
+            emit()
+        return pieces
+
+    def _split_text(self, block: str) -> List[str]:
+        parts: List[str] = []
+        current = ""
+        for word in re.split(r"(?<=\s)", block):
+            if current and len((current + word).encode("utf-8")) > self.max_chunk_bytes:
+                parts.append(current)
+                current = ""
+            current += word
+        if current:
+            parts.append(current)
+        return parts
+
+
+def create_content_chunker(mode: Optional[str] = None, max_chunk_bytes: int = 6000) -> ContentChunker:
+    """Crea el chunker sobre el limpiador del modo indicado; con "off" los chunks se emiten en HTML limpio."""
+    return ContentChunker(create_content_cleaner(mode) or HtmlContentCleaner("html"), max_chunk_bytes)
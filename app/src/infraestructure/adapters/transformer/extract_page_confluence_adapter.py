@@ -3,13 +3,61 @@ import json
 
 import unicodedata
 import re
+from typing import Optional
 from bs4 import BeautifulSoup
 
+from app.src.infraestructure.adapters.transformer.html_parser_backends import (
+    HtmlParserBackend,
+    create_html_parser_backend,
+)
+from app.src.infraestructure.adapters.transformer.html_content_cleaner import HtmlContentCleaner
+from app.src.infraestructure.adapters.transformer.content_chunker import ContentChunker
+
+# Tokens relevantes para ubicar la tabla de cabecera; CDATA y comentarios se
+# consumen enteros para no confundir un "<table" dentro de un bloque de código
+_HEADER_TABLE_TOKENS = re.compile(
+    r"<!\[CDATA\[.*?\]\]>|<!--.*?-->|<table\b[^>]*>|</table\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+
 
 class ExtractPageConfluenceAdapter:
 
-    def __init__(self):
-        print("")
+    def __init__(self, parser_backend: Optional[HtmlParserBackend] = None, early_exit_header: bool = True,
+                 content_cleaner: Optional[HtmlContentCleaner] = None,
+                 content_chunker: Optional[ContentChunker] = None):
+        self.parser_backend = parser_backend or create_html_parser_backend("html.parser")
+        # Respaldo para los fragmentos que el backend no reproduce igual que html.parser
+        self.fallback_backend = create_html_parser_backend("html.parser")
+        self.early_exit_header = early_exit_header
+        # Con limpiador, el contenido (sin la tabla de cabecera) se agrega a la data como "content"
+        self.content_cleaner = content_cleaner
+        # Con chunker, en lugar de "content" se agrega la lista "chunks" (chunk_id, heading, content)
+        self.content_chunker = content_chunker
+
+    def scan_cabecera_table_html(self, page_body_value: str) -> Optional[str]:
+        """
+        Ubica la primera <table> del cuerpo tokenizando solo hasta su cierre.
+        Retorna el fragmento HTML de la tabla, "" si el cuerpo no tiene tablas,
+        o None si la tabla no cierra (se debe parsear el documento completo).
+        """
+        depth = 0
+        start = None
+        for token in _HEADER_TABLE_TOKENS.finditer(page_body_value):
+            text = token.group(0)
+            if text.startswith("<!"):
+                continue
+            if text[1] == "/":
+                if start is None:
+                    continue
+                depth -= 1
+                if depth == 0:
+                    return page_body_value[start:token.end()]
+            else:
+                if start is None:
+                    start = token.start()
+                depth += 1
+        return "" if start is None else None
 
     def split_html_content(self, page_body_value):
         page_soup_html = BeautifulSoup(page_body_value, "html.parser")
@@ -20,40 +68,49 @@ class ExtractPageConfluenceAdapter:
         contenido_html_str = str(page_soup_html)
         return cabecera_html_str, contenido_html_str
 
-    def extract_value_segun_header(self, header, cell_html):
+    def extract_value_segun_header(self, header, cell_html, backend: Optional[HtmlParserBackend] = None):
         header_formated = header.strip()
         # print(f"cell_html : {cell_html}")
+        # cell_html es el nodo del árbol ya parseado: se consulta directamente, sin re-parsear
+        backend = backend or self.parser_backend
         if header_formated.lower() in ["autores", "autor"] + ["revisado por", "revisado"]:
-            soup_cell = BeautifulSoup(str(cell_html), 'html.parser')
-            user_tags = soup_cell.find_all('ri:user')
-            cell_value = [tag['ri:account-id'] for tag in user_tags if tag.has_attr('ri:account-id')]
+            user_tags = backend.find_all(cell_html, 'ri:user')
+            cell_value = [backend.get_attr(tag, 'ri:account-id') for tag in user_tags
+                          if backend.get_attr(tag, 'ri:account-id') is not None]
         elif header_formated.lower() in ["dominio"]:
-            cell_value = cell_html.get_text(strip=True)
+            cell_value = backend.get_text(cell_html)
         elif header_formated.lower() in ["estado", "status"]:
-            soup_cell = BeautifulSoup(str(cell_html), 'html.parser')
-            status_tags = soup_cell.find_all('ac:parameter', {'ac:name': 'title'})
-            cell_value = [tag_title.get_text(strip=True) for tag_title in status_tags]
+            status_tags = backend.find_all(cell_html, 'ac:parameter', {'ac:name': 'title'})
+            cell_value = [backend.get_text(tag_title) for tag_title in status_tags]
         elif header_formated.lower() in ["fecha inicio vigencia", "fecha inicio"] + ["fecha fin vigencia", "fecha fin"]:
-            cell_text = cell_html.get_text(strip=True)
+            cell_text = backend.get_text(cell_html)
             cell_text_uni = unicodedata.normalize("NFKD", cell_text)
             cell_text_re = re.sub(r'[\u200b\u202f\u00a0]', '', cell_text_uni)
             cell_value = cell_text_re.strip()
 
         else:
-            cell_value = cell_html
+            cell_value = backend.to_html(cell_html)
 
         return cell_value
 
+    def backend_for(self, html: str) -> HtmlParserBackend:
+        """Backend configurado o, si no reproduce html.parser en este fragmento, html.parser."""
+        return self.parser_backend if self.parser_backend.supports(html) else self.fallback_backend
+
     def extract_cabecera_metadata(self, cabecera_html_str):
-        cabecera_table_html = BeautifulSoup(cabecera_html_str, "html.parser")
+        backend = self.backend_for(cabecera_html_str)
+        return self.extract_cabecera_metadata_from_table(backend.parse(cabecera_html_str), backend)
+
+    def extract_cabecera_metadata_from_table(self, cabecera_table_html, backend: Optional[HtmlParserBackend] = None):
+        backend = backend or self.parser_backend
         cabecera_table_metadata = {}
-        if cabecera_table_html:
-            for row in cabecera_table_html.find_all("tr"):
-                headers = row.find_all("th")
-                cells = row.find_all("td")
+        if cabecera_table_html is not None:
+            for row in backend.find_all(cabecera_table_html, "tr"):
+                headers = backend.find_all(row, "th")
+                cells = backend.find_all(row, "td")
                 if headers and cells:
-                    headers_text = headers[0].get_text(strip=True)
-                    cell_value = self.extract_value_segun_header(headers_text, cells[0])
+                    headers_text = backend.get_text(headers[0])
+                    cell_value = self.extract_value_segun_header(headers_text, cells[0], backend)
                     cabecera_table_metadata[headers_text] = str(cell_value)
         return cabecera_table_metadata
 
@@ -87,8 +144,23 @@ class ExtractPageConfluenceAdapter:
 
         }
 
+        # Un único parseo: la metadata se extrae del nodo de la primera tabla. Con
+        # early_exit_header solo se parsea el fragmento de esa tabla, no la página entera
         html_body = json_data.get("body", {}).get("storage", {}).get("value", "")
-        header, content = self.split_html_content(html_body)
-        metadata_general |= self.extract_cabecera_metadata(header)
+        cabecera_html_str = self.scan_cabecera_table_html(html_body) if self.early_exit_header else None
+        if cabecera_html_str != "":
+            html_to_parse = cabecera_html_str if cabecera_html_str else html_body
+            backend = self.backend_for(html_to_parse)
+            page_html = backend.parse(html_to_parse)
+            cabecera_table_html = backend.find(page_html, "table")
+            if cabecera_table_html is not None:
+                metadata_general |= self.extract_cabecera_metadata_from_table(cabecera_table_html, backend)
+
+        if self.content_chunker is not None:
+            _, contenido_html_str = self.split_html_content(html_body)
+            metadata_general["chunks"] = self.content_chunker.chunk(contenido_html_str)
+        elif self.content_cleaner is not None:
+            _, contenido_html_str = self.split_html_content(html_body)
+            metadata_general["content"] = self.content_cleaner.clean(contenido_html_str)
 
         return metadata_general, metadata_filtro
@@ -0,0 +1,251 @@
+import re
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+from bs4 import BeautifulSoup, CData, Comment, NavigableString, Tag
+
+CONTENT_MODES = ("html", "markdown", "text")
+
+# Macros sin contenido propio para la knowledge base: se eliminan con todo su cuerpo
+NON_CONTENT_MACROS = {
+    "toc", "toc-zone", "children", "pagetree", "pagetreesearch", "anchor", "recently-updated",
+    "contentbylabel", "content-report-table", "livesearch", "jira", "status", "create-from-template",
+    "profile", "gallery", "attachments", "space-details", "page-index", "roadmap", "include",
+    "excerpt-include", "view-file", "viewpdf", "widget", "iframe", "multimedia",
+}
+# Elementos de storage format sin texto útil (referencias, imágenes, emoticonos, marcadores)
+DROPPED_TAGS = {
+    "ac:parameter", "ac:image", "ac:emoticon", "ac:placeholder", "ac:inline-comment-marker-ref",
+    "ri:user", "ri:page", "ri:attachment", "ri:url", "ri:space", "ri:blog-post", "ri:content-entity",
+    "style", "script", "colgroup", "col",
+}
+# Atributos que se conservan tras la limpieza; el resto (style, class, data-*, ac:*) se descarta
+KEPT_ATTRIBUTES = {"a": {"href"}, "td": {"colspan", "rowspan"}, "th": {"colspan", "rowspan"}}
+# Envoltorios de maquetación: se conservan solo sus hijos
+UNWRAPPED_TAGS = {"div", "span", "font", "tbody", "thead", "tfoot", "section"}
+
+BLOCK_TAGS = {"p", "div", "li", "tr", "table", "ul", "ol", "pre", "blockquote",
+              "h1", "h2", "h3", "h4", "h5", "h6"}
+
+HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+# Contenedores en cuyos bordes el espacio en blanco no separa palabras
+LAYOUT_TAGS = BLOCK_TAGS | {"td", "th"}
+
+_WHITESPACE = re.compile(r"\s+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+_WHITESPACE_ONLY_LINES = re.compile(r"^[ \t]+$", re.MULTILINE)
+
+
+@dataclass
+class ContentSection:
+    heading: str
+    blocks: List[str]
+
+
+class HtmlContentCleaner:
+    """
+    Limpia el contenido de una página en storage format antes de cargarlo a
+    ground truth: elimina macros sin contenido, referencias ac:/ri:,
+    atributos de presentación y envoltorios de maquetación, y colapsa los
+    espacios. El resultado se emite como HTML mínimo, Markdown o texto plano.
+    """
+
+    def __init__(self, mode: str = "html"):
+        if mode not in CONTENT_MODES:
+            raise ValueError(f"Modo de contenido no soportado: {mode}")
+        self.mode = mode
+
+    def clean(self, content_html: str) -> str:
+        soup = BeautifulSoup(content_html or "", "html.parser")
+        self._strip_markup(soup)
+        return self.finish("".join(self._render_block(child) for child in soup.children))
+
+    def sections(self, content_html: str) -> List[ContentSection]:
+        """
+        Limpia el contenido y lo agrupa por encabezados (h1-h6) de primer
+        nivel. Cada bloque se entrega ya renderizado en el modo configurado,
+        de modo que "".join(blocks) de todas las secciones equivale a clean().
+        """
+        soup = BeautifulSoup(content_html or "", "html.parser")
+        self._strip_markup(soup)
+
+        sections = [ContentSection("", [])]
+        for child in soup.children:
+            if isinstance(child, Tag) and child.name in HEADING_TAGS:
+                sections.append(ContentSection(child.get_text(" ", strip=True), []))
+            sections[-1].blocks.append(self._render_block(child))
+        return [section for section in sections if self.finish("".join(section.blocks))]
+
+    def finish(self, rendered: str) -> str:
+        """Normaliza un fragmento renderizado (líneas en blanco repetidas y bordes)."""
+        if self.mode == "html":
+            return rendered.strip()
+        return _BLANK_LINES.sub("\n\n", _WHITESPACE_ONLY_LINES.sub("", rendered)).strip()
+
+    def _render_block(self, node) -> str:
+        if self.mode == "markdown":
+            return self._markdown(node)
+        if self.mode == "text":
+            lines: List[str] = []
+            self._collect_text_node(node, lines)
+            return "".join(lines)
+        return str(node)
+
+    def _strip_markup(self, soup: BeautifulSoup) -> None:
+        for comment in soup.find_all(string=lambda node: isinstance(node, Comment)):
+            comment.extract()
+
+        for macro in soup.find_all("ac:structured-macro"):
+            if macro.decomposed:
+                continue
+            name = (macro.get("ac:name") or "").lower()
+            if name in NON_CONTENT_MACROS:
+                macro.decompose()
+            elif name in ("code", "noformat"):
+                self._replace_code_macro(soup, macro)
+
+        # Los CDATA que quedan (p. ej. ac:plain-text-link-body) se vuelven texto antes de desenvolver su
+        # etiqueta: como CData se emitirían literalmente como <![CDATA[...]]> en el HTML resultante
+        for cdata in soup.find_all(string=lambda node: isinstance(node, CData)):
+            cdata.replace_with(NavigableString(str(cdata)))
+
+        for tag in soup.find_all(True):
+            if tag.decomposed:
+                continue
+            if tag.name in DROPPED_TAGS:
+                tag.decompose()
+            elif ":" in tag.name or tag.name in UNWRAPPED_TAGS:
+                tag.unwrap()
+            else:
+                kept = KEPT_ATTRIBUTES.get(tag.name, set())
+                tag.attrs = {key: value for key, value in tag.attrs.items() if key in kept}
+
+        for text in soup.find_all(string=True):
+            if text.find_parent("pre") is not None:
+                continue
+            collapsed = _WHITESPACE.sub(" ", text.replace("\u00a0", " "))
+            if collapsed != text:
+                text.replace_with(collapsed)
+
+        # Bloques que quedaron vacíos tras la limpieza (p. ej. un <p> que solo tenía una macro)
+        for tag in reversed(soup.find_all(BLOCK_TAGS - {"pre"})):
+            if not tag.get_text(strip=True) and tag.find(["br", "img"]) is None:
+                tag.decompose()
+
+        # Espacios entre bloques (saltos de línea del storage format): no son contenido
+        for text in soup.find_all(string=True):
+            if not text.strip() and text.find_parent("pre") is None and self._at_block_boundary(text):
+                text.extract()
+
+    @staticmethod
+    def _at_block_boundary(text: NavigableString) -> bool:
+        def is_layout(node) -> bool:
+            return isinstance(node, Tag) and node.name in LAYOUT_TAGS
+
+        parent_is_layout = isinstance(text.parent, BeautifulSoup) or is_layout(text.parent)
+        previous_sibling, next_sibling = text.previous_sibling, text.next_sibling
+        return (is_layout(previous_sibling) or is_layout(next_sibling)
+                or (previous_sibling is None and parent_is_layout)
+                or (next_sibling is None and parent_is_layout))
+
+    @staticmethod
+    def _replace_code_macro(soup: BeautifulSoup, macro: Tag) -> None:
+        body = macro.find("ac:plain-text-body")
+        code_text = ""
+        if body is not None:
+            code_text = "".join(str(node) for node in body.children if isinstance(node, (CData, NavigableString)))
+        pre = soup.new_tag("pre")
+        pre.string = code_text
+        macro.replace_with(pre)
+
+    def _collect_text(self, node: Tag, lines: List[str]) -> None:
+        for child in node.children:
+            self._collect_text_node(child, lines)
+
+    @staticmethod
+    def _break_line(lines: List[str]) -> None:
+        # Un bloque empieza y termina en línea propia, sin duplicar saltos (p. ej. listas anidadas)
+        if lines and not lines[-1].endswith("\n"):
+            lines.append("\n")
+
+    def _collect_text_node(self, child, lines: List[str]) -> None:
+        if isinstance(child, NavigableString):
+            lines.append(str(child))
+        elif child.name == "br":
+            lines.append("\n")
+        elif child.name in ("td", "th"):
+            # Cada fila en una línea: los bloques dentro de la celda se unen con espacios
+            cell: List[str] = []
+            self._collect_text(child, cell)
+            lines.append(" ".join(part.strip() for part in "".join(cell).splitlines() if part.strip()))
+            lines.append("\t")
+        elif child.name in BLOCK_TAGS:
+            self._break_line(lines)
+            self._collect_text(child, lines)
+            self._break_line(lines)
+        else:
+            self._collect_text(child, lines)
+
+    def _markdown_children(self, node: Tag, list_depth: int = 0) -> str:
+        return "".join(self._markdown(child, list_depth) for child in node.children)
+
+    def _markdown(self, node, list_depth: int = 0) -> str:
+        if isinstance(node, NavigableString):
+            return str(node)
+
+        name = node.name
+        if name == "br":
+            return "  \n"
+        if name in HEADING_TAGS:
+            return f"\n\n{'#' * int(name[1])} {self._markdown_children(node).strip()}\n\n"
+        if name in ("strong", "b", "em", "i"):
+            text = self._markdown_children(node)
+            marker = "**" if name in ("strong", "b") else "*"
+            return f"{marker}{text.strip()}{marker}" if text.strip() else text
+        if name == "code":
+            return f"`{node.get_text()}`"
+        if name == "pre":
+            return f"\n\n```\n{node.get_text()}\n```\n\n"
+        if name == "a":
+            text = self._markdown_children(node).strip()
+            href = node.get("href")
+            return f"[{text}]({href})" if href else text
+        if name in ("ul", "ol"):
+            items = []
+            for index, item in enumerate(node.find_all("li", recursive=False), start=1):
+                marker = f"{index}." if name == "ol" else "-"
+                items.append(f"{'  ' * list_depth}{marker} {self._markdown_children(item, list_depth + 1).strip()}")
+            return "\n\n" + "\n".join(items) + "\n\n" if list_depth == 0 else "\n" + "\n".join(items)
+        if name == "table":
+            return self._markdown_table(node)
+        if name in ("p", "blockquote"):
+            text = self._markdown_children(node, list_depth).strip()
+            return f"\n\n> {text}\n\n" if name == "blockquote" else f"\n\n{text}\n\n"
+        return self._markdown_children(node, list_depth)
+
+    def _markdown_table(self, table: Tag) -> str:
+        rows: List[List[str]] = []
+        for row in table.find_all("tr"):
+            if row.find_parent("table") is not table:
+                continue
+            cells = [_WHITESPACE.sub(" ", self._markdown_children(cell)).strip().replace("|", "\\|")
+                     for cell in row.find_all(["th", "td"], recursive=False)]
+            if cells:
+                rows.append(cells)
+        if not rows:
+            return ""
+
+        width = max(len(row) for row in rows)
+        rows = [row + [""] * (width - len(row)) for row in rows]
+        lines = ["| " + " | ".join(rows[0]) + " |", "|" + " --- |" * width]
+        lines.extend("| " + " | ".join(row) + " |" for row in rows[1:])
+        return "\n\n" + "\n".join(lines) + "\n\n"
+
+
+def create_content_cleaner(mode: Optional[str] = None) -> Optional[HtmlContentCleaner]:
+    """Crea el limpiador para el modo indicado; "off" (o vacío) desactiva la etapa."""
+    requested = (mode or "off").lower()
+    if requested in ("off", "none", ""):
+        return None
+    return HtmlContentCleaner(requested)
@@ -0,0 +1,168 @@
+import importlib.util
+import logging
+import re
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+_CDATA_START = "<![CDATA["
+_TABLE_WITHOUT_TBODY = re.compile(r"<table[^>]*>(?!\s*<tbody)")
+_SELF_CLOSING_WITH_SIBLINGS = re.compile(r"<(?:ac|ri):[\w-]+\b[^>]*/>\s*(?!</)")
+
+
+class HtmlParserBackend(ABC):
+    """
+    Operaciones mínimas sobre el árbol HTML que necesita el extractor de
+    Confluence. Cada backend debe conservar los tags con namespace de storage
+    format (ac:parameter, ri:user) con su nombre completo.
+    """
+    name = ""
+
+    @abstractmethod
+    def parse(self, html: str) -> Any:
+        pass
+
+    def supports(self, html: str) -> bool:
+        """
+        Indica si el backend reproduce la salida de html.parser para este
+        fragmento; si no, el extractor lo parsea con html.parser.
+        """
+        return True
+
+    @abstractmethod
+    def find(self, node: Any, tag: str) -> Optional[Any]:
+        pass
+
+    @abstractmethod
+    def find_all(self, node: Any, tag: str, attrs: Optional[Dict[str, str]] = None) -> List[Any]:
+        pass
+
+    @abstractmethod
+    def get_attr(self, node: Any, attr: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def get_text(self, node: Any) -> str:
+        pass
+
+    @abstractmethod
+    def to_html(self, node: Any) -> str:
+        pass
+
+
+class BeautifulSoupBackend(HtmlParserBackend):
+
+    def __init__(self, features: str = "html.parser"):
+        self.features = features
+        self.name = features
+
+    def parse(self, html: str) -> Any:
+        return BeautifulSoup(html, self.features)
+
+    def supports(self, html: str) -> bool:
+        # lxml convierte <![CDATA[...]]> en un comentario
+        return self.features == "html.parser" or _CDATA_START not in html
+
+    def find(self, node: Any, tag: str) -> Optional[Any]:
+        return node.find(tag)
+
+    def find_all(self, node: Any, tag: str, attrs: Optional[Dict[str, str]] = None) -> List[Any]:
+        return node.find_all(tag, attrs or {})
+
+    def get_attr(self, node: Any, attr: str) -> Optional[str]:
+        return node.get(attr)
+
+    def get_text(self, node: Any) -> str:
+        return node.get_text(strip=True)
+
+    def to_html(self, node: Any) -> str:
+        return str(node)
+
+
+class SelectolaxBackend(HtmlParserBackend):
+    """
+    Backend sobre lexbor (C). Los tags con ':' se buscan recorriendo el árbol
+    en lugar de con selectores CSS, que exigirían escapar el namespace.
+    """
+    name = "selectolax"
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser_cls = LexborHTMLParser
+
+    def parse(self, html: str) -> Any:
+        return self._parser_cls(html).body
+
+    def supports(self, html: str) -> bool:
+        # Además de convertir los CDATA en comentarios, lexbor añade <tbody> a las tablas
+        # anidadas y anida el contenido que sigue a una etiqueta ac:/ri: autocerrada
+        if _CDATA_START in html or _SELF_CLOSING_WITH_SIBLINGS.search(html):
+            return False
+        return _TABLE_WITHOUT_TBODY.search(html, html.find("<table") + 1) is None
+
+    def _iter_descendants(self, node: Any) -> Iterator[Any]:
+        if node is None:
+            return
+        descendants = node.traverse(include_text=False)
+        next(descendants, None)  # traverse() entrega primero el propio nodo
+        yield from descendants
+
+    def find(self, node: Any, tag: str) -> Optional[Any]:
+        return next((n for n in self._iter_descendants(node) if n.tag == tag), None)
+
+    def find_all(self, node: Any, tag: str, attrs: Optional[Dict[str, str]] = None) -> List[Any]:
+        attrs = attrs or {}
+        return [
+            n for n in self._iter_descendants(node)
+            if n.tag == tag and all(n.attributes.get(k) == v for k, v in attrs.items())
+        ]
+
+    def get_attr(self, node: Any, attr: str) -> Optional[str]:
+        return node.attributes.get(attr)
+
+    def get_text(self, node: Any) -> str:
+        return node.text(deep=True, separator="", strip=True)
+
+    def to_html(self, node: Any) -> str:
+        return node.html or ""
+
+
+# Orden de preferencia cuando se solicita "auto": primero los backends en C. Las cabeceras que
+# no reproducen igual que html.parser (ver supports) se parsean con html.parser
+_AUTO_ORDER = ["selectolax", "lxml", "html.parser"]
+_BACKEND_MODULES = {"selectolax": "selectolax", "lxml": "lxml", "html.parser": None}
+
+
+def _is_available(backend_name: str) -> bool:
+    module_name = _BACKEND_MODULES.get(backend_name)
+    return module_name is None or importlib.util.find_spec(module_name) is not None
+
+
+def create_html_parser_backend(backend_name: Optional[str] = None) -> HtmlParserBackend:
+    """
+    Crea el backend solicitado ("html.parser", "lxml", "selectolax" o "auto").
+    Si el paquete del backend no está instalado se usa el siguiente disponible
+    y, en último término, html.parser.
+    """
+    requested = (backend_name or "html.parser").lower()
+    if requested == "auto":
+        candidates = _AUTO_ORDER
+    elif requested in _BACKEND_MODULES:
+        candidates = [requested, "html.parser"]
+    else:
+        raise ValueError(f"Backend de parser HTML no soportado: {backend_name}")
+
+    for candidate in candidates:
+        if not _is_available(candidate):
+            logger.warning(f"Backend de parser HTML '{candidate}' no instalado, se usa el siguiente disponible")
+            continue
+        if candidate == "selectolax":
+            return SelectolaxBackend()
+        return BeautifulSoupBackend(candidate)
+
+    return BeautifulSoupBackend("html.parser")
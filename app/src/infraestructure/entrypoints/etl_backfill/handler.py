@@ -0,0 +1,171 @@
+import sys
+sys.path.append('./lib')
+
+import json
+import os
+import logging
+import hashlib
+from typing import Any, Dict
+
+from app.src.application.usecases.etl_process_use_case import ProcessUseCase
+from app.src.application.usecases.etl_backfill_use_case import BackfillUseCase
+
+from app.src.infraestructure.adapters.repositories.confluence_api import ConfluenceAPIAdapter
+from app.src.infraestructure.adapters.repositories.s3_repository import S3RepositoryAdapter
+from app.src.infraestructure.adapters.repositories.object_codecs import create_object_codec
+from app.src.infraestructure.adapters.repositories.s3_sync_manifest import S3SyncManifestAdapter
+from app.src.infraestructure.adapters.repositories.s3_checkpoint_store import S3CheckpointStoreAdapter
+from app.src.infraestructure.adapters.etls.step_function_trigger import StepFunctionTriggerAdapter
+from app.src.infraestructure.adapters.repositories.secrets_manager_adapter import SecretsManagerAdapter
+from app.src.infraestructure.adapters.repositories.cached_secret_manager_adapter import CachedSecretManagerAdapter
+from app.src.infraestructure.adapters.http.pooled_session import PooledHttpSession
+from app.src.shared.lifecycle.warm_object_graph import WarmObjectGraph
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+CONFLUENCE_SECRET_NAME = os.getenv("CONFLUENCE_SECRET_NAME", "sm-io-ipkn-kno-exchange-confluence-00")
+CONFLUENCE_BASE_URL = os.getenv("CONFLUENCE_BASE_URL", "https://matrixmvp.atlassian.net/wiki")
+AWS_REGION_NAME = os.getenv("AWS_REGION_NAME", "us-east-1")
+
+AWS_S3_BUCKET_NAME = os.getenv("AWS_S3_BUCKET_NAME", "colbert-test")
+AWS_S3_BUCKET_PATH = os.getenv("AWS_S3_BUCKET_PATH", "s3-io-ipkn-kno-exchange_landing-00/landing")
+AWS_S3_MANIFEST_PATH = os.getenv("AWS_S3_MANIFEST_PATH", "s3-io-ipkn-kno-exchange_landing-00/manifest")
+AWS_S3_CHECKPOINT_PATH = os.getenv("AWS_S3_CHECKPOINT_PATH", "s3-io-ipkn-kno-exchange_landing-00/backfill")
+# Codec de los objetos de landing ("identity", "gzip" o "zstd"); ground truth se escribe sin comprimir.
+# Activar la compresión solo después de desplegar el extract que lee Content-Encoding: uno anterior
+# no puede leer los objetos comprimidos
+LANDING_CODEC = os.getenv("LANDING_CODEC", "identity")
+
+AWS_STATE_MACHINE_ARN = os.getenv("AWS_STATE_MACHINE_ARN", "arn:aws:states:us-east-1:627912843016:stateMachine:sfn-io-ipkn-kno-exchange-mngt-etl_process-00")
+
+BACKFILL_MAX_WORKERS = int(os.getenv("BACKFILL_MAX_WORKERS", "4"))
+BACKFILL_PAGE_SIZE = int(os.getenv("BACKFILL_PAGE_SIZE", "25"))
+# Margen reservado para guardar el checkpoint y responder antes del timeout de la Lambda
+BACKFILL_SAFETY_MARGIN_MS = int(os.getenv("BACKFILL_SAFETY_MARGIN_MS", "60000"))
+
+
+def _make_use_case(config_resource: Dict[str, str]) -> BackfillUseCase:
+    secret_manager = CachedSecretManagerAdapter(SecretsManagerAdapter(config_resource["aws_region_name"]))
+    confluence_secret_name = config_resource["confluence_secret_name"]
+    document_source = ConfluenceAPIAdapter(
+        config_resource["confluence_base_url"],
+        credentials_provider=lambda: secret_manager.get_secret(confluence_secret_name),
+        credentials_refresher=lambda: secret_manager.refresh(confluence_secret_name),
+        http_session=PooledHttpSession(pool_maxsize=max(int(config_resource["backfill_max_workers"]), 4)),
+        bulk_batch_size=int(config_resource["backfill_page_size"])
+    )
+    process_use_case = ProcessUseCase(
+        document_source,
+        S3RepositoryAdapter(config_resource["aws_s3_bucket_name"], config_resource["aws_s3_bucket_path"],
+                            config_resource["aws_region_name"],
+                            codec=create_object_codec(config_resource["landing_codec"])),
+        StepFunctionTriggerAdapter(config_resource["aws_state_machine_arn"], config_resource["aws_region_name"]),
+        S3SyncManifestAdapter(config_resource["aws_s3_bucket_name"], config_resource["aws_s3_manifest_path"],
+                              config_resource["aws_region_name"])
+    )
+    return BackfillUseCase(
+        document_source,
+        process_use_case,
+        S3CheckpointStoreAdapter(config_resource["aws_s3_bucket_name"], config_resource["aws_s3_checkpoint_path"],
+                                 config_resource["aws_region_name"]),
+        max_workers=int(config_resource["backfill_max_workers"])
+    )
+
+
+# Grafo de objetos reutilizado entre invocaciones warm del mismo entorno de ejecución. La
+# configuración sale de variables de entorno, fijas durante su vida: se construye una sola vez
+_use_case_graph = WarmObjectGraph(_make_use_case, fingerprint_keys=())
+
+
+def _config_resource() -> Dict[str, str]:
+    # Todo lo que lee _make_use_case pasa por aquí
+    return {
+        "confluence_secret_name": CONFLUENCE_SECRET_NAME,
+        "confluence_base_url": CONFLUENCE_BASE_URL,
+        "aws_region_name": AWS_REGION_NAME,
+        "aws_s3_bucket_name": AWS_S3_BUCKET_NAME,
+        "aws_s3_bucket_path": AWS_S3_BUCKET_PATH,
+        "landing_codec": LANDING_CODEC,
+        "aws_s3_checkpoint_path": AWS_S3_CHECKPOINT_PATH,
+        "aws_s3_manifest_path": AWS_S3_MANIFEST_PATH,
+        "aws_state_machine_arn": AWS_STATE_MACHINE_ARN,
+        "backfill_max_workers": str(BACKFILL_MAX_WORKERS),
+        "backfill_page_size": str(BACKFILL_PAGE_SIZE)
+    }
+
+
+def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Evento: {"space_key": ...} o {"cql": ...}, con "run_id" y "restart" opcionales.
+    Sin run_id se usa un hash de la consulta: reinvocar reanuda un recorrido en curso
+    y, si ya terminó, lanza uno nuevo. Con run_id explícito un recorrido completado
+    no se repite; para forzarlo se envía el mismo run_id con "restart": true.
+    """
+
+    logger.info(f" event: {event}")
+
+    try:
+        request_id = context.aws_request_id
+        logger.info(f" RUN : ETL BACKFILL : REQUEST ID ({request_id})")
+
+        body = event
+        space_key = body.get("space_key")
+        cql = body.get("cql")
+
+        if not space_key and not cql:
+            raise ValueError("Required parameters are missing: space_key or cql")
+
+        cql = cql or BackfillUseCase.space_cql(space_key)
+        # Mismo run_id para la misma consulta: reinvocar el evento reanuda desde el checkpoint.
+        # Con el run_id por defecto, un recorrido ya completado se reinicia en la siguiente
+        # invocación; con un run_id explícito se reinicia solo si el evento trae "restart": true.
+        run_id = body.get("run_id")
+        restart_completed = bool(body.get("restart")) or not run_id
+        run_id = run_id or hashlib.sha256(cql.encode("utf-8")).hexdigest()[:16]
+
+        use_case = _use_case_graph.get(_config_resource())
+        skip_counts = use_case.process_use_case.skip_counts()
+        result = use_case.run(
+            run_id,
+            cql,
+            should_continue=lambda: context.get_remaining_time_in_millis() > BACKFILL_SAFETY_MARGIN_MS,
+            restart_completed=restart_completed
+        )
+
+        logger.info(f" RUN : ETL BACKFILL : END USE CASE")
+        logger.info(
+            f" METRIC : sync_skip_rate",
+            extra={"metric": "sync_skip_rate", "value": use_case.process_use_case.skip_rate(skip_counts)},
+        )
+
+        response_body = {
+            "run_id": result.run_id,
+            "cql": result.cql,
+            "processed": result.processed,
+            "failed": result.failed,
+            "failed_page_ids": result.failed_page_ids,
+            "cursor": result.cursor,
+            "completed": result.completed,
+            "status": "OK",
+            "request_id": request_id
+        }
+
+        return {
+            "statusCode": 200,
+            "headers": {
+                "Content-Type": "application/json",
+                "X-Correlation-Id": request_id,
+            },
+            "body": json.dumps(response_body),
+        }
+
+    except Exception as e:
+        logger.error(
+            f"Error procesando evento: {str(e)}",
+            extra={
+                "event": event,
+                "error_type": type(e).__name__
+            },
+        )
+        return {"statusCode": 500, "body": json.dumps({"error": str(e)})}
@@ -0,0 +1,154 @@
+import sys
+sys.path.append('./lib')
+
+import json
+import os
+import logging
+from typing import Any, Dict, Optional
+
+from app.src.application.usecases.etl_bulk_delete_use_case import BulkDeleteUseCase
+
+from app.src.infraestructure.adapters.etls.bedrock_ingestion_adapter import BedrockIngestionAdapter
+from app.src.infraestructure.adapters.etls.sqs_pending_change_queue import SqsPendingChangeQueueAdapter
+from app.src.infraestructure.adapters.repositories.s3_archive_adapter import S3ArchiveAdapter
+from app.src.infraestructure.adapters.repositories.s3_chunk_index import S3ChunkIndexAdapter
+from app.src.infraestructure.adapters.repositories.s3_sync_manifest import S3SyncManifestAdapter
+from app.src.infraestructure.adapters.repositories.ssm_parameter_adapter import SsmParameterAdapter
+from app.src.infraestructure.adapters.repositories.cached_secret_manager_adapter import CachedSecretManagerAdapter
+from app.src.shared.lifecycle.warm_object_graph import WarmObjectGraph
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+AWS_REGION_NAME = os.getenv("AWS_REGION_NAME", "us-east-1")
+KB_SETTINGS_PARAMETER_NAME = os.getenv("KB_SETTINGS_PARAMETER_NAME", "pm-io-ipkn-kno-exchange-settings-00")
+
+# Ground truth: los documentos se mueven de vigente a eliminado
+AWS_S3_GROUND_BUCKET = os.getenv("AWS_S3_GROUND_BUCKET", "colbert-test")
+AWS_S3_GROUND_PREFIX = os.getenv("AWS_S3_GROUND_PREFIX", "s3-io-ipkn-kno-exchange-ground-truth-00/vigente")
+AWS_S3_GROUND_DELETED_BUCKET = os.getenv("AWS_S3_GROUND_DELETED_BUCKET", "colbert-test")
+AWS_S3_GROUND_DELETED_PREFIX = os.getenv("AWS_S3_GROUND_DELETED_PREFIX", "s3-io-ipkn-kno-exchange-ground-truth-00/eliminado")
+# Índice de chunks escrito por el extract: permite mover también los objetos por chunk
+AWS_S3_GROUND_INDEX_PREFIX = os.getenv("AWS_S3_GROUND_INDEX_PREFIX", "s3-io-ipkn-kno-exchange-ground-truth-00/indice")
+
+# Manifiesto de sincronización del process: las entradas de las páginas eliminadas se borran
+AWS_S3_BUCKET_NAME = os.getenv("AWS_S3_BUCKET_NAME", "colbert-test")
+AWS_S3_MANIFEST_PATH = os.getenv("AWS_S3_MANIFEST_PATH", "s3-io-ipkn-kno-exchange_landing-00/manifest")
+
+DELETE_COPY_WORKERS = int(os.getenv("DELETE_COPY_WORKERS", "16"))
+# Lecturas concurrentes del índice de chunks al resolver los objetos de cada página
+DELETE_INDEX_LOAD_WORKERS = int(os.getenv("DELETE_INDEX_LOAD_WORKERS", "16"))
+
+# Cola del coordinador de ingesta (etl_ingestion): con un job en curso las bajas se encolan allí.
+# Sin cola, el job se reintenta con backoff DELETE_CONFLICT_RETRIES veces
+INGESTION_QUEUE_URL = os.getenv("INGESTION_QUEUE_URL", "")
+DELETE_PENDING_DELAY_SECONDS = int(os.getenv("DELETE_PENDING_DELAY_SECONDS", "30"))
+DELETE_CONFLICT_RETRIES = int(os.getenv("DELETE_CONFLICT_RETRIES", "3"))
+
+# Settings (knowledgeBaseId / dataSourceId) cacheados por entorno de ejecución
+_settings_provider = CachedSecretManagerAdapter(SsmParameterAdapter(AWS_REGION_NAME))
+SETTINGS_KEYS = ("knowledge_base_id", "data_source_id")
+
+
+def _make_pending_changes(config_resource: Dict[str, str]) -> Optional[SqsPendingChangeQueueAdapter]:
+    if not config_resource["ingestion_queue_url"]:
+        return None
+    return SqsPendingChangeQueueAdapter(config_resource["ingestion_queue_url"], config_resource["aws_region_name"])
+
+
+def _make_use_case(config_resource: Dict[str, str]) -> BulkDeleteUseCase:
+    return BulkDeleteUseCase(
+        S3ArchiveAdapter(config_resource["aws_s3_ground_bucket"], config_resource["aws_s3_ground_prefix"],
+                         config_resource["aws_s3_ground_deleted_prefix"], config_resource["aws_region_name"],
+                         max_pool_connections=int(config_resource["delete_copy_workers"]),
+                         archive_bucket=config_resource["aws_s3_ground_deleted_bucket"]),
+        BedrockIngestionAdapter(config_resource["aws_region_name"]),
+        config_resource["knowledge_base_id"],
+        config_resource["data_source_id"],
+        chunk_index=S3ChunkIndexAdapter(config_resource["aws_s3_ground_bucket"],
+                                        config_resource["aws_s3_ground_index_prefix"],
+                                        config_resource["aws_region_name"]),
+        index_load_workers=int(config_resource["delete_index_load_workers"]),
+        pending_changes=_make_pending_changes(config_resource),
+        pending_delay_seconds=int(config_resource["delete_pending_delay_seconds"]),
+        sync_manifest=S3SyncManifestAdapter(config_resource["aws_s3_bucket_name"],
+                                            config_resource["aws_s3_manifest_path"],
+                                            config_resource["aws_region_name"]),
+        conflict_retries=int(config_resource["delete_conflict_retries"])
+    )
+
+
+# Grafo de objetos reutilizado entre invocaciones warm del mismo entorno de ejecución. Solo los
+# settings de SSM se releen en cada invocación: un cambio en ellos reconstruye el grafo
+_use_case_graph = WarmObjectGraph(_make_use_case, fingerprint_keys=SETTINGS_KEYS)
+
+
+def _config_resource() -> Dict[str, str]:
+    settings = _settings_provider.get_secret(KB_SETTINGS_PARAMETER_NAME)
+    return {
+        "aws_region_name": AWS_REGION_NAME,
+        "aws_s3_ground_bucket": AWS_S3_GROUND_BUCKET,
+        "aws_s3_ground_prefix": AWS_S3_GROUND_PREFIX,
+        "aws_s3_ground_deleted_bucket": AWS_S3_GROUND_DELETED_BUCKET,
+        "aws_s3_ground_deleted_prefix": AWS_S3_GROUND_DELETED_PREFIX,
+        "aws_s3_ground_index_prefix": AWS_S3_GROUND_INDEX_PREFIX,
+        "aws_s3_bucket_name": AWS_S3_BUCKET_NAME,
+        "aws_s3_manifest_path": AWS_S3_MANIFEST_PATH,
+        "knowledge_base_id": settings["knowledgeBaseId"],
+        "data_source_id": settings["dataSourceId"],
+        "delete_copy_workers": str(DELETE_COPY_WORKERS),
+        "delete_index_load_workers": str(DELETE_INDEX_LOAD_WORKERS),
+        "ingestion_queue_url": INGESTION_QUEUE_URL,
+        "delete_pending_delay_seconds": str(DELETE_PENDING_DELAY_SECONDS),
+        "delete_conflict_retries": str(DELETE_CONFLICT_RETRIES)
+    }
+
+
+def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+
+    logger.info(f" event: {event}")
+
+    try:
+        request_id = context.aws_request_id
+        logger.info(f" RUN : ETL DELETE DOCUMENTS : REQUEST ID ({request_id})")
+
+        page_ids = event.get("page_ids")
+        if not page_ids:
+            raise ValueError("Required parameters are missing: page_ids")
+
+        use_case = _use_case_graph.get(_config_resource())
+        result = use_case.delete_pages(page_ids)
+
+        logger.info(
+            f" RUN : ETL DELETE DOCUMENTS : END USE CASE : DELETED ({len(result.deleted_page_ids)}) "
+            f": FAILED ({len(result.failed_page_ids)})"
+        )
+
+        response_body = {
+            "deleted_page_ids": result.deleted_page_ids,
+            "failed_page_ids": result.failed_page_ids,
+            "ingestion_job_id": result.ingestion_job_id,
+            "ingestion_status": result.ingestion_status,
+            "status": "OK" if not result.failed_page_ids else "PARTIAL",
+            "correlation_id": request_id,
+        }
+
+        return {
+            "statusCode": 200,
+            "headers": {
+                "Content-Type": "application/json",
+                "Access-Control-Allow-Origin": "*",
+                "X-Correlation-Id": request_id,
+            },
+            "body": json.dumps(response_body),
+        }
+
+    except Exception as e:
+        logger.error(
+            f"Error procesando evento: {str(e)}",
+            extra={
+                "event": event,
+                "error_type": type(e).__name__
+            },
+        )
+        return {"statusCode": 500, "body": json.dumps({"error": str(e)})}
@@ -6,13 +6,18 @@ import json
 import os
 import logging
 import uuid
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from app.src.domain.model.document_event import DocumentEvent, DocumentEventType
 from app.src.application.usecases.etl_extract_use_case import ExtractDocumentUseCase
 
 from app.src.infraestructure.adapters.transformer.extract_page_confluence_adapter import ExtractPageConfluenceAdapter
+from app.src.infraestructure.adapters.transformer.html_parser_backends import create_html_parser_backend
+from app.src.infraestructure.adapters.transformer.html_content_cleaner import create_content_cleaner
+from app.src.infraestructure.adapters.transformer.content_chunker import create_content_chunker
 from app.src.infraestructure.adapters.repositories.s3_repository import S3RepositoryAdapter
+from app.src.infraestructure.adapters.repositories.s3_chunk_index import S3ChunkIndexAdapter
+from app.src.shared.lifecycle.warm_object_graph import WarmObjectGraph
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -27,16 +32,136 @@ AWS_S3_LANDING_PREFIX = os.getenv("AWS_S3_LANDING_PREFIX", "s3-io-ipkn-kno-excha
 # Ground truth/target (a donde se carga el resultado)
 AWS_S3_GROUND_BUCKET = os.getenv("AWS_S3_GROUND_BUCKET", "colbert-test")
 AWS_S3_GROUND_PREFIX = os.getenv("AWS_S3_GROUND_PREFIX", "s3-io-ipkn-kno-exchange-ground-truth-00/vigente")
+# Omite el PUT a ground truth si el hash del contenido coincide con el del objeto existente
+GROUND_SKIP_UNCHANGED = os.getenv("GROUND_SKIP_UNCHANGED", "true").lower() == "true"
+# Índice de chunks por página (fuera de vigente para que la knowledge base no lo ingeste)
+AWS_S3_GROUND_INDEX_PREFIX = os.getenv("AWS_S3_GROUND_INDEX_PREFIX", "s3-io-ipkn-kno-exchange-ground-truth-00/indice")
+
+# Parser HTML del extractor: html.parser | lxml | selectolax | auto (si no está instalado se usa html.parser).
+# lxml convierte los CDATA en comentarios y selectolax, además, anida el contenido tras etiquetas ac:/ri:
+# autocerradas y añade <tbody> a tablas anidadas: esas cabeceras se parsean con html.parser (ver supports)
+HTML_PARSER_BACKEND = os.getenv("HTML_PARSER_BACKEND", "html.parser")
+# Solo se tokeniza hasta el cierre de la tabla de cabecera cuando no se necesita el cuerpo completo
+EXTRACT_EARLY_EXIT_HEADER = os.getenv("EXTRACT_EARLY_EXIT_HEADER", "true").lower() == "true"
+# Limpieza del contenido cargado a ground truth: off | html | markdown | text
+EXTRACT_CONTENT_MODE = os.getenv("EXTRACT_CONTENT_MODE", "off")
+# Pre-chunking: un objeto (y un sidecar de metadata) por chunk en lugar de uno por página
+EXTRACT_CHUNKING = os.getenv("EXTRACT_CHUNKING", "false").lower() == "true"
+EXTRACT_CHUNK_MAX_BYTES = int(os.getenv("EXTRACT_CHUNK_MAX_BYTES", "6000"))
+
+# Modo lote: descargas/cargas concurrentes y parseo en pool de procesos (0 = parseo en el proceso actual)
+EXTRACT_BATCH_IO_WORKERS = int(os.getenv("EXTRACT_BATCH_IO_WORKERS", "8"))
+EXTRACT_BATCH_PARSE_WORKERS = int(os.getenv("EXTRACT_BATCH_PARSE_WORKERS", str(os.cpu_count() or 1)))
+
+
+def _make_use_case(config_resource: Dict[str, str]) -> ExtractDocumentUseCase:
+    content_chunker = None
+    chunk_index = None
+    if config_resource["extract_chunking"] == "true":
+        content_chunker = create_content_chunker(config_resource["extract_content_mode"],
+                                                 int(config_resource["extract_chunk_max_bytes"]))
+        chunk_index = S3ChunkIndexAdapter(config_resource["aws_s3_ground_bucket"],
+                                          config_resource["aws_s3_ground_index_prefix"],
+                                          config_resource["aws_region_name"])
+    return ExtractDocumentUseCase(
+        S3RepositoryAdapter(config_resource["aws_s3_landing_bucket"], config_resource["aws_s3_landing_prefix"],
+                            config_resource["aws_region_name"]),
+        ExtractPageConfluenceAdapter(create_html_parser_backend(config_resource["html_parser_backend"]),
+                                     early_exit_header=config_resource["extract_early_exit_header"] == "true",
+                                     content_cleaner=create_content_cleaner(config_resource["extract_content_mode"]),
+                                     content_chunker=content_chunker),
+        S3RepositoryAdapter(config_resource["aws_s3_ground_bucket"], config_resource["aws_s3_ground_prefix"],
+                            config_resource["aws_region_name"],
+                            skip_unchanged=config_resource["ground_skip_unchanged"] == "true"),
+        io_workers=int(config_resource["extract_batch_io_workers"]),
+        parse_workers=int(config_resource["extract_batch_parse_workers"]),
+        chunk_index=chunk_index
+    )
 
 
-def _make_use_case() -> ExtractDocumentUseCase:
-    return ExtractDocumentUseCase(
-        S3RepositoryAdapter(AWS_S3_LANDING_BUCKET, AWS_S3_LANDING_PREFIX, AWS_REGION_NAME),
-        ExtractPageConfluenceAdapter(),
-        S3RepositoryAdapter(AWS_S3_GROUND_BUCKET, AWS_S3_GROUND_PREFIX, AWS_REGION_NAME)
+# Grafo de objetos reutilizado entre invocaciones warm del mismo entorno de ejecución. La
+# configuración sale de variables de entorno, fijas durante su vida: se construye una sola vez
+_use_case_graph = WarmObjectGraph(_make_use_case, fingerprint_keys=())
+
+
+def _config_resource() -> Dict[str, str]:
+    # Todo lo que lee _make_use_case pasa por aquí
+    return {
+        "aws_region_name": AWS_REGION_NAME,
+        "aws_s3_landing_bucket": AWS_S3_LANDING_BUCKET,
+        "aws_s3_landing_prefix": AWS_S3_LANDING_PREFIX,
+        "aws_s3_ground_bucket": AWS_S3_GROUND_BUCKET,
+        "aws_s3_ground_prefix": AWS_S3_GROUND_PREFIX,
+        "aws_s3_ground_index_prefix": AWS_S3_GROUND_INDEX_PREFIX,
+        "html_parser_backend": HTML_PARSER_BACKEND,
+        "extract_early_exit_header": str(EXTRACT_EARLY_EXIT_HEADER).lower(),
+        "extract_content_mode": EXTRACT_CONTENT_MODE,
+        "extract_chunking": str(EXTRACT_CHUNKING).lower(),
+        "extract_chunk_max_bytes": str(EXTRACT_CHUNK_MAX_BYTES),
+        "extract_batch_io_workers": str(EXTRACT_BATCH_IO_WORKERS),
+        "extract_batch_parse_workers": str(EXTRACT_BATCH_PARSE_WORKERS),
+        "ground_skip_unchanged": str(GROUND_SKIP_UNCHANGED).lower()
+    }
+
+
+def _log_content_reduction(bytes_original: int, bytes_cleaned: int) -> None:
+    if not bytes_original:
+        return
+    logger.info(
+        f" METRIC : content_bytes_reduction",
+        extra={"metric": "content_bytes_reduction", "value": 1 - bytes_cleaned / bytes_original,
+               "bytes_original": bytes_original, "bytes_cleaned": bytes_cleaned},
     )
 
 
+def _handle_batch(items: List[Dict[str, Any]], request_id: str) -> Dict[str, Any]:
+    document_events = [
+        DocumentEvent(item.get("document_id"), item.get("event_type"), item.get("document_uri"))
+        for item in items
+    ]
+
+    use_case = _use_case_graph.get(_config_resource())
+    logger.info(f" RUN : ETL EXTRACT DOCUMENTS : LIFECYCLE {_use_case_graph.stats()}")
+    results = use_case.extract_documents(document_events)
+
+    failed = sum(1 for result in results if result.status != "OK")
+    skipped = sum(1 for result in results if result.skipped)
+    logger.info(f" RUN : ETL EXTRACT DOCUMENTS : END USE CASE : FAILED ({failed}) : SKIPPED ({skipped})")
+    _log_content_reduction(sum(result.content_bytes_original for result in results),
+                           sum(result.content_bytes_cleaned for result in results))
+
+    response_body = {
+        "results": [
+            {
+                "page_id": result.document_id,
+                "event_type": result.event_type,
+                "object_key": result.data_object_key,
+                "status": result.status,
+                "error": result.error,
+                "skipped": result.skipped,
+                "content_bytes_original": result.content_bytes_original,
+                "content_bytes_cleaned": result.content_bytes_cleaned,
+                "chunk_count": result.chunk_count,
+                "chunk_churn_ratio": result.chunk_churn_ratio,
+            }
+            for result in results
+        ],
+        "failed": failed,
+        "skipped": skipped,
+        "correlation_id": request_id,
+    }
+
+    return {
+        "statusCode": 200,
+        "headers": {
+            "Content-Type": "application/json",
+            "Access-Control-Allow-Origin": "*",
+            "X-Correlation-Id": request_id,
+        },
+        "body": json.dumps(response_body),
+    }
+
+
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
     try:
@@ -44,6 +169,9 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         logger.info(f" RUN : ETL EXTRACT DOCUMENT : REQUEST ID ({request_id})" )
 
         body = event #json.loads(event.get("body") or "{}")
+        if "items" in body:
+            return _handle_batch(body["items"], request_id)
+
         document_id = body.get("document_id")
         event_type = body.get("event_type")
         document_uri = body.get("document_uri")
@@ -53,16 +181,23 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
         document_event = DocumentEvent(document_id, event_type, document_uri)
 
-        use_case = _make_use_case()
+        use_case = _use_case_graph.get(_config_resource())
+        logger.info(f" RUN : ETL EXTRACT DOCUMENT : LIFECYCLE {_use_case_graph.stats()}")
         result = use_case.extract_document(document_event)
 
         logger.info(f" RUN : ETL EXTRACT DOCUMENT : END USE CASE")
+        _log_content_reduction(result.content_bytes_original, result.content_bytes_cleaned)
 
         response_body = {
             "page_id": result.document_id,
             "event_type": result.event_type,
             "object_key": result.data_object_key,
             "status": "OK",
+            "skipped": result.skipped,
+            "content_bytes_original": result.content_bytes_original,
+            "content_bytes_cleaned": result.content_bytes_cleaned,
+            "chunk_count": result.chunk_count,
+            "chunk_churn_ratio": result.chunk_churn_ratio,
             "correlation_id": request_id,
         }
 
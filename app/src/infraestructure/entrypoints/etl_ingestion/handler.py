@@ -0,0 +1,273 @@
+import sys
+sys.path.append('./lib')
+
+import json
+import math
+import os
+import logging
+import time
+from typing import Any, Dict, List, Tuple
+
+from app.src.application.usecases.ingestion_coordinator import IngestionCoordinator
+from app.src.application.usecases.ingestion_job_notifier import IngestionJobNotifier
+from app.src.application.usecases.ingestion_job_watcher import IngestionJobWatcher
+
+from app.src.infraestructure.adapters.etls.bedrock_ingestion_adapter import BedrockIngestionAdapter
+from app.src.infraestructure.adapters.etls.step_function_callback import StepFunctionCallbackAdapter
+from app.src.infraestructure.adapters.etls.sqs_pending_change_queue import SqsPendingChangeQueueAdapter
+from app.src.infraestructure.adapters.repositories.ssm_parameter_adapter import SsmParameterAdapter
+from app.src.infraestructure.adapters.repositories.cached_secret_manager_adapter import CachedSecretManagerAdapter
+from app.src.shared.lifecycle.warm_object_graph import WarmObjectGraph
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+AWS_REGION_NAME = os.getenv("AWS_REGION_NAME", "us-east-1")
+KB_SETTINGS_PARAMETER_NAME = os.getenv("KB_SETTINGS_PARAMETER_NAME", "pm-io-ipkn-kno-exchange-settings-00")
+
+INGESTION_WINDOW_SECONDS = float(os.getenv("INGESTION_WINDOW_SECONDS", "30"))
+INGESTION_MAX_BATCH_SIZE = int(os.getenv("INGESTION_MAX_BATCH_SIZE", "100"))
+# Cola de origen: los cambios cuya ventana no ha vencido se reencolan con retardo.
+# Sin cola configurada se devuelven en batchItemFailures (SQS los reentrega tras el visibility timeout)
+INGESTION_QUEUE_URL = os.getenv("INGESTION_QUEUE_URL", "")
+# Retardo mínimo del reencolado, p. ej. cuando hay un job en curso y la ventana ya venció
+INGESTION_REQUEUE_MIN_DELAY_SECONDS = int(os.getenv("INGESTION_REQUEUE_MIN_DELAY_SECONDS", "5"))
+INGESTION_POLL_MIN_SECONDS = float(os.getenv("INGESTION_POLL_MIN_SECONDS", "1"))
+INGESTION_POLL_MAX_SECONDS = float(os.getenv("INGESTION_POLL_MAX_SECONDS", "30"))
+# Duración esperada del primer job (la primera consulta se programa al 80%); luego se ajusta con lo observado
+INGESTION_EXPECTED_DURATION_SECONDS = float(os.getenv("INGESTION_EXPECTED_DURATION_SECONDS", "5"))
+# Errores seguidos al consultar un job antes de darlo por fallido
+INGESTION_POLL_MAX_ERRORS = int(os.getenv("INGESTION_POLL_MAX_ERRORS", "3"))
+# Margen para responder antes del timeout de la Lambda cuando se espera el fin del job
+INGESTION_WAIT_SAFETY_MARGIN_MS = int(os.getenv("INGESTION_WAIT_SAFETY_MARGIN_MS", "10000"))
+# Las ejecuciones del workflow esperan el fin del job con task token. Cada invocación vigila los jobs
+# hasta INGESTION_CALLBACK_WAIT_SECONDS; los que siguen en curso se reencolan como mensajes de
+# seguimiento con retardo INGESTION_POLL_MAX_SECONDS
+INGESTION_CALLBACK_WAIT_SECONDS = float(os.getenv("INGESTION_CALLBACK_WAIT_SECONDS", "60"))
+# Igual al TimeoutSeconds de EnqueueIngestionChange: pasado este plazo el job se notifica como fallido
+INGESTION_CALLBACK_TIMEOUT_SECONDS = float(os.getenv("INGESTION_CALLBACK_TIMEOUT_SECONDS", "3600"))
+
+# Settings (knowledgeBaseId / dataSourceId) cacheados por entorno de ejecución
+_settings_provider = CachedSecretManagerAdapter(SsmParameterAdapter(AWS_REGION_NAME))
+SETTINGS_KEYS = ("knowledge_base_id", "data_source_id")
+
+
+def _make_coordinator(config_resource: Dict[str, str]) -> IngestionCoordinator:
+    return IngestionCoordinator(
+        BedrockIngestionAdapter(config_resource["aws_region_name"]),
+        config_resource["knowledge_base_id"],
+        config_resource["data_source_id"],
+        window_seconds=float(config_resource["ingestion_window_seconds"]),
+        max_batch_size=int(config_resource["ingestion_max_batch_size"]),
+        # Reloj de pared: la ventana se mide desde el SentTimestamp del mensaje entre invocaciones
+        clock=time.time
+    )
+
+
+def _make_notifier(config_resource: Dict[str, str]) -> IngestionJobNotifier:
+    watcher = IngestionJobWatcher(
+        BedrockIngestionAdapter(config_resource["aws_region_name"]),
+        config_resource["knowledge_base_id"],
+        config_resource["data_source_id"],
+        min_interval=float(config_resource["ingestion_poll_min_seconds"]),
+        max_interval=float(config_resource["ingestion_poll_max_seconds"]),
+        initial_expected_duration=float(config_resource["ingestion_expected_duration_seconds"]),
+        max_consecutive_errors=int(config_resource["ingestion_poll_max_errors"])
+    )
+    return IngestionJobNotifier(watcher, StepFunctionCallbackAdapter(config_resource["aws_region_name"]))
+
+
+def _make_queue(config_resource: Dict[str, str]) -> SqsPendingChangeQueueAdapter:
+    return SqsPendingChangeQueueAdapter(config_resource["ingestion_queue_url"], config_resource["aws_region_name"])
+
+
+# Grafos de objetos reutilizados entre invocaciones warm del mismo entorno de ejecución. Solo los
+# settings de SSM se releen en cada invocación: un cambio en ellos reconstruye los grafos que los usan
+_coordinator_graph = WarmObjectGraph(_make_coordinator, fingerprint_keys=SETTINGS_KEYS)
+_notifier_graph = WarmObjectGraph(_make_notifier, fingerprint_keys=SETTINGS_KEYS)
+_queue_graph = WarmObjectGraph(_make_queue, fingerprint_keys=())
+
+
+def _config_resource() -> Dict[str, str]:
+    settings = _settings_provider.get_secret(KB_SETTINGS_PARAMETER_NAME)
+    return {
+        "aws_region_name": AWS_REGION_NAME,
+        "knowledge_base_id": settings["knowledgeBaseId"],
+        "data_source_id": settings["dataSourceId"],
+        "ingestion_window_seconds": str(INGESTION_WINDOW_SECONDS),
+        "ingestion_max_batch_size": str(INGESTION_MAX_BATCH_SIZE),
+        "ingestion_queue_url": INGESTION_QUEUE_URL,
+        "ingestion_poll_min_seconds": str(INGESTION_POLL_MIN_SECONDS),
+        "ingestion_poll_max_seconds": str(INGESTION_POLL_MAX_SECONDS),
+        "ingestion_expected_duration_seconds": str(INGESTION_EXPECTED_DURATION_SECONDS),
+        "ingestion_poll_max_errors": str(INGESTION_POLL_MAX_ERRORS)
+    }
+
+
+def _parse_changes(event: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # Invocación directa con {"changes": [...]} o lote SQS con un cambio por mensaje
+    if "changes" in event:
+        return [dict(change) for change in event["changes"]]
+    changes = []
+    for record in event.get("Records", []):
+        change = json.loads(record.get("body") or "{}")
+        change["message_id"] = record.get("messageId")
+        sent_timestamp = record.get("attributes", {}).get("SentTimestamp")
+        if sent_timestamp:
+            # Un cambio reencolado conserva el inicio de ventana de su primer envío
+            change.setdefault("window_started_at", int(sent_timestamp) / 1000)
+        changes.append(change)
+    return changes
+
+
+def _collect_task_tokens(change: Dict[str, Any], tokens_by_document: Dict[str, List[str]],
+                         message_id_by_token: Dict[str, str]) -> None:
+    # El workflow envía task_token; un cambio reencolado trae los de todos los mensajes que agrupó
+    task_tokens = list(change.pop("task_tokens", []))
+    task_token = change.pop("task_token", None)
+    if task_token:
+        task_tokens.append(task_token)
+    for task_token in task_tokens:
+        message_id_by_token[task_token] = change.get("message_id")
+    shared = tokens_by_document.setdefault(change.get("document_id"), [])
+    shared.extend(task_tokens)
+    if shared:
+        # El coordinador conserva el último cambio de cada documento: hereda los tokens de los anteriores
+        change["task_tokens"] = shared
+
+
+def _batch_task_tokens(document_ids: List[str], tokens_by_document: Dict[str, List[str]]) -> List[str]:
+    # Un cambio posterior del mismo documento espera al job siguiente, no a este
+    return [task_token for document_id in document_ids for task_token in tokens_by_document.pop(document_id, [])]
+
+
+def _requeue(config_resource: Dict[str, str], changes: List[Dict[str, Any]], delay_seconds: int) -> bool:
+    if not changes or not config_resource["ingestion_queue_url"]:
+        return False
+    bodies = [{key: value for key, value in change.items() if key != "message_id"} for change in changes]
+    try:
+        _queue_graph.get(config_resource).requeue(bodies, delay_seconds)
+        return True
+    except Exception as e:
+        logger.error(f"Error reencolando cambios pendientes: {str(e)}")
+        return False
+
+
+def _notify_workflows(config_resource: Dict[str, str], task_tokens_by_job: Dict[str, List[str]],
+                      deadlines: Dict[str, float], message_id_by_token: Dict[str, str],
+                      context: Any) -> Tuple[Dict[str, str], List[str]]:
+    """
+    Notifica el fin de cada job a los workflows que esperan con task token. Los
+    jobs aún en curso se reencolan como mensajes de seguimiento; retorna los
+    estados finales y los mensajes a reintentar si el reencolado falla.
+    """
+    notifier = _notifier_graph.get(config_resource)
+    now = time.time()
+    for ingestion_job_id in [job_id for job_id in task_tokens_by_job if deadlines[job_id] <= now]:
+        notifier.fail(task_tokens_by_job.pop(ingestion_job_id), "IngestionJobTimeout",
+                      f"Ingestion job {ingestion_job_id} sin terminar tras "
+                      f"{INGESTION_CALLBACK_TIMEOUT_SECONDS:.0f} s")
+    if not task_tokens_by_job:
+        return {}, []
+
+    remaining_seconds = (context.get_remaining_time_in_millis() - INGESTION_WAIT_SAFETY_MARGIN_MS) / 1000
+    statuses = notifier.notify(task_tokens_by_job,
+                               timeout=max(0.0, min(INGESTION_CALLBACK_WAIT_SECONDS, remaining_seconds)))
+
+    running = [job_id for job_id in task_tokens_by_job if job_id not in statuses]
+    watches = [
+        {"ingestion_job_id": job_id, "task_tokens": task_tokens_by_job[job_id], "watch_until": deadlines[job_id]}
+        for job_id in running
+    ]
+    if not watches or _requeue(config_resource, watches, math.ceil(INGESTION_POLL_MAX_SECONDS)):
+        return statuses, []
+    # Sin seguimiento reencolado, SQS reentrega los mensajes que trajeron los tokens
+    message_ids = {message_id_by_token.get(task_token) for job_id in running for task_token in task_tokens_by_job[job_id]}
+    return statuses, sorted(message_id for message_id in message_ids if message_id)
+
+
+def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+
+    logger.info(f" event: {event}")
+
+    request_id = context.aws_request_id
+    logger.info(f" RUN : ETL INGESTION : REQUEST ID ({request_id})")
+
+    messages = _parse_changes(event)
+    # Mensajes de seguimiento: jobs ya lanzados cuyos workflows siguen esperando
+    watches = [message for message in messages if message.get("ingestion_job_id")]
+    changes = [message for message in messages if not message.get("ingestion_job_id")]
+    config_resource = _config_resource()
+    coordinator = _coordinator_graph.get(config_resource)
+
+    now = time.time()
+    batches = []
+    tokens_by_document: Dict[str, List[str]] = {}
+    message_id_by_token: Dict[str, str] = {}
+    task_tokens_by_job: Dict[str, List[str]] = {}
+    for change in changes:
+        if change.get("skipped"):
+            # El extract no reescribió ground truth: el contenido indexado ya está al día
+            logger.info(f"- Cambio sin contenido nuevo, no requiere ingesta: {change.get('document_id')}")
+            continue
+        received_at = change.setdefault("window_started_at", now)
+        _collect_task_tokens(change, tokens_by_document, message_id_by_token)
+        try:
+            coordinator.add(change, received_at=received_at)
+        except ValueError as e:
+            # Un cambio mal formado no se reintenta: reentregarlo fallaría igual
+            logger.error(f"Cambio descartado: {str(e)}", extra={"change": change})
+            continue
+        # Dentro del lote solo se corta por tamaño; la ventana se evalúa con todo el lote registrado
+        batch = coordinator.flush_if_full()
+        if batch:
+            batches.append(batch)
+            task_tokens_by_job[batch.ingestion_job_id] = _batch_task_tokens(batch.document_ids, tokens_by_document)
+
+    # Solo se lanza el job si la ventana del cambio más antiguo venció o se alcanzó el tamaño máximo;
+    # una invocación directa con "flush": true lo fuerza
+    batch = coordinator.flush() if event.get("flush") else coordinator.flush_if_due()
+    if batch:
+        batches.append(batch)
+        task_tokens_by_job[batch.ingestion_job_id] = _batch_task_tokens(batch.document_ids, tokens_by_document)
+
+    # Lo no enviado (ventana abierta o job en curso) vuelve a la cola hasta que venza la ventana
+    delay_seconds = max(INGESTION_REQUEUE_MIN_DELAY_SECONDS, math.ceil(coordinator.seconds_until_due()))
+    pending_changes = coordinator.release_pending_changes()
+    released_ids = {change["document_id"] for change in pending_changes}
+    requeued = _requeue(config_resource, pending_changes, delay_seconds)
+    failed_message_ids = [
+        change["message_id"]
+        for change in changes
+        if not requeued and change.get("message_id") and change.get("document_id") in released_ids
+    ]
+
+    task_tokens_by_job = {job_id: task_tokens for job_id, task_tokens in task_tokens_by_job.items() if task_tokens}
+    deadlines = {job_id: now + INGESTION_CALLBACK_TIMEOUT_SECONDS for job_id in task_tokens_by_job}
+    for watch in watches:
+        ingestion_job_id = watch["ingestion_job_id"]
+        for task_token in watch.get("task_tokens", []):
+            message_id_by_token[task_token] = watch.get("message_id")
+        task_tokens_by_job.setdefault(ingestion_job_id, []).extend(watch.get("task_tokens", []))
+        deadlines[ingestion_job_id] = watch.get("watch_until", now + INGESTION_CALLBACK_TIMEOUT_SECONDS)
+
+    statuses = {batch.ingestion_job_id: batch.status for batch in batches}
+    if task_tokens_by_job:
+        # Todas las esperas comparten un único ciclo de consulta con intervalo adaptativo
+        callback_statuses, callback_failures = _notify_workflows(config_resource, task_tokens_by_job, deadlines,
+                                                                 message_id_by_token, context)
+        statuses.update(callback_statuses)
+        failed_message_ids += [message_id for message_id in callback_failures if message_id not in failed_message_ids]
+
+    logger.info(f" RUN : ETL INGESTION : END : JOBS ({len(batches)}) : PENDING ({len(released_ids)}) "
+                f": WATCHED ({len(task_tokens_by_job)}) : REQUEUED ({requeued})")
+
+    return {
+        "ingestionJobs": [
+            {"ingestion_job_id": b.ingestion_job_id, "status": statuses[b.ingestion_job_id],
+             "documents": len(b.document_ids)}
+            for b in batches
+        ],
+        "pending_document_ids": sorted(released_ids),
+        "batchItemFailures": [{"itemIdentifier": message_id} for message_id in failed_message_ids],
+    }
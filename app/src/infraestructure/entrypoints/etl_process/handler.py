@@ -5,15 +5,28 @@ import json
 import os
 import logging
 import uuid
-from typing import Any, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
 
 from app.src.domain.model.document_event import DocumentEvent, DocumentEventType
 from app.src.application.usecases.etl_process_use_case import ProcessUseCase
+from app.src.application.usecases.etl_extract_use_case import ExtractDocumentUseCase
 
 from app.src.infraestructure.adapters.repositories.confluence_api import ConfluenceAPIAdapter
 from app.src.infraestructure.adapters.repositories.s3_repository import S3RepositoryAdapter
+from app.src.infraestructure.adapters.repositories.object_codecs import create_object_codec
+from app.src.infraestructure.adapters.repositories.s3_sync_manifest import S3SyncManifestAdapter
+from app.src.infraestructure.adapters.repositories.s3_chunk_index import S3ChunkIndexAdapter
 from app.src.infraestructure.adapters.etls.step_function_trigger import StepFunctionTriggerAdapter
+from app.src.infraestructure.adapters.etls.sqs_pending_change_queue import SqsPendingChangeQueueAdapter
 from app.src.infraestructure.adapters.repositories.secrets_manager_adapter import SecretsManagerAdapter
+from app.src.infraestructure.adapters.repositories.cached_secret_manager_adapter import CachedSecretManagerAdapter
+from app.src.infraestructure.adapters.http.pooled_session import PooledHttpSession
+from app.src.infraestructure.adapters.transformer.extract_page_confluence_adapter import ExtractPageConfluenceAdapter
+from app.src.infraestructure.adapters.transformer.html_parser_backends import create_html_parser_backend
+from app.src.infraestructure.adapters.transformer.html_content_cleaner import create_content_cleaner
+from app.src.infraestructure.adapters.transformer.content_chunker import create_content_chunker
+from app.src.shared.lifecycle.warm_object_graph import WarmObjectGraph
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -24,18 +37,169 @@ AWS_REGION_NAME = os.getenv("AWS_REGION_NAME", "us-east-1")
 
 AWS_S3_BUCKET_NAME = os.getenv("AWS_S3_BUCKET_NAME", "colbert-test")
 AWS_S3_BUCKET_PATH = os.getenv("AWS_S3_BUCKET_PATH", "s3-io-ipkn-kno-exchange_landing-00/landing")
+AWS_S3_MANIFEST_PATH = os.getenv("AWS_S3_MANIFEST_PATH", "s3-io-ipkn-kno-exchange_landing-00/manifest")
+# Codec de los objetos de landing ("identity", "gzip" o "zstd"); ground truth se escribe sin comprimir.
+# Activar la compresión solo después de desplegar el extract que lee Content-Encoding: uno anterior
+# no puede leer los objetos comprimidos
+LANDING_CODEC = os.getenv("LANDING_CODEC", "identity")
+
+# Modo directo: extracción y carga a ground truth en esta misma Lambda, sin pasar por el workflow
+PROCESS_DIRECT_MODE = os.getenv("PROCESS_DIRECT_MODE", "false").lower() == "true"
+AWS_S3_GROUND_BUCKET = os.getenv("AWS_S3_GROUND_BUCKET", "colbert-test")
+AWS_S3_GROUND_PREFIX = os.getenv("AWS_S3_GROUND_PREFIX", "s3-io-ipkn-kno-exchange-ground-truth-00/vigente")
+# Copia de auditoría del modo directo: fuera de landing para no disparar el workflow de extracción
+AWS_S3_AUDIT_PATH = os.getenv("AWS_S3_AUDIT_PATH", "s3-io-ipkn-kno-exchange_landing-00/auditoria")
+# Cola del coordinador de ingesta (etl_ingestion): el modo directo publica allí los cambios en ground truth
+INGESTION_QUEUE_URL = os.getenv("INGESTION_QUEUE_URL", "")
+# Parser HTML del extractor: html.parser | lxml | selectolax | auto. Las cabeceras que lxml o
+# selectolax no reproducen igual (CDATA, tablas anidadas, ac:/ri: autocerradas) se parsean con html.parser
+HTML_PARSER_BACKEND = os.getenv("HTML_PARSER_BACKEND", "html.parser")
+EXTRACT_CONTENT_MODE = os.getenv("EXTRACT_CONTENT_MODE", "off")
+EXTRACT_CHUNKING = os.getenv("EXTRACT_CHUNKING", "false").lower() == "true"
+EXTRACT_CHUNK_MAX_BYTES = int(os.getenv("EXTRACT_CHUNK_MAX_BYTES", "6000"))
+AWS_S3_GROUND_INDEX_PREFIX = os.getenv("AWS_S3_GROUND_INDEX_PREFIX", "s3-io-ipkn-kno-exchange-ground-truth-00/indice")
+GROUND_SKIP_UNCHANGED = os.getenv("GROUND_SKIP_UNCHANGED", "true").lower() == "true"
 
 AWS_STATE_MACHINE_ARN = os.getenv("AWS_S3_BUCKET_NAME", "arn:aws:states:us-east-1:627912843016:stateMachine:sfn-io-ipkn-kno-exchange-mngt-etl_process-00")
 
-def _make_use_case() -> ProcessUseCase:
-    secret_manager = SecretsManagerAdapter(AWS_REGION_NAME)
-    confluence_credential_api = secret_manager.get_secret(CONFLUENCE_SECRET_NAME)
+SECRET_CACHE_TTL_SECONDS = float(os.getenv("SECRET_CACHE_TTL_SECONDS", "300"))
+SECRET_CACHE_STALE_SECONDS = float(os.getenv("SECRET_CACHE_STALE_SECONDS", "600"))
+
+CONFLUENCE_POOL_MAXSIZE = int(os.getenv("CONFLUENCE_POOL_MAXSIZE", "16"))
+CONFLUENCE_CONNECT_TIMEOUT_SECONDS = float(os.getenv("CONFLUENCE_CONNECT_TIMEOUT_SECONDS", "3.05"))
+CONFLUENCE_READ_TIMEOUT_SECONDS = float(os.getenv("CONFLUENCE_READ_TIMEOUT_SECONDS", "20"))
+CONFLUENCE_MAX_RETRIES = int(os.getenv("CONFLUENCE_MAX_RETRIES", "3"))
+
+# Workers concurrentes por lote SQS; se limitan a CONFLUENCE_POOL_MAXSIZE para no esperar conexiones del pool
+PROCESS_BATCH_MAX_WORKERS = int(os.getenv("PROCESS_BATCH_MAX_WORKERS", "8"))
+
+
+def _make_use_case(config_resource: Dict[str, str]) -> ProcessUseCase:
+    secret_manager = CachedSecretManagerAdapter(
+        SecretsManagerAdapter(config_resource["aws_region_name"]),
+        ttl_seconds=float(config_resource["secret_cache_ttl_seconds"]),
+        stale_seconds=float(config_resource["secret_cache_stale_seconds"])
+    )
+    confluence_secret_name = config_resource["confluence_secret_name"]
+    landing_zone = S3RepositoryAdapter(config_resource["aws_s3_bucket_name"], config_resource["aws_s3_bucket_path"],
+                                       config_resource["aws_region_name"],
+                                       codec=create_object_codec(config_resource["landing_codec"]))
+
+    direct_extract = None
+    audit_zone = None
+    pending_changes = None
+    if config_resource["process_direct_mode"] == "true":
+        audit_zone = S3RepositoryAdapter(config_resource["aws_s3_bucket_name"], config_resource["aws_s3_audit_path"],
+                                         config_resource["aws_region_name"],
+                                         codec=create_object_codec(config_resource["landing_codec"]))
+        if config_resource["ingestion_queue_url"]:
+            pending_changes = SqsPendingChangeQueueAdapter(config_resource["ingestion_queue_url"],
+                                                           config_resource["aws_region_name"])
+        content_chunker = None
+        chunk_index = None
+        if config_resource["extract_chunking"] == "true":
+            content_chunker = create_content_chunker(config_resource["extract_content_mode"],
+                                                     int(config_resource["extract_chunk_max_bytes"]))
+            chunk_index = S3ChunkIndexAdapter(config_resource["aws_s3_ground_bucket"],
+                                              config_resource["aws_s3_ground_index_prefix"],
+                                              config_resource["aws_region_name"])
+        direct_extract = ExtractDocumentUseCase(
+            landing_zone,
+            ExtractPageConfluenceAdapter(create_html_parser_backend(config_resource["html_parser_backend"]),
+                                         content_cleaner=create_content_cleaner(config_resource["extract_content_mode"]),
+                                         content_chunker=content_chunker),
+            S3RepositoryAdapter(config_resource["aws_s3_ground_bucket"], config_resource["aws_s3_ground_prefix"],
+                                config_resource["aws_region_name"],
+                                skip_unchanged=config_resource["ground_skip_unchanged"] == "true"),
+            chunk_index=chunk_index
+        )
+
     return ProcessUseCase(
-        ConfluenceAPIAdapter(CONFLUENCE_BASE_URL, confluence_credential_api),
-        S3RepositoryAdapter(AWS_S3_BUCKET_NAME, AWS_S3_BUCKET_PATH, AWS_REGION_NAME),
-        StepFunctionTriggerAdapter(AWS_STATE_MACHINE_ARN, AWS_REGION_NAME)
+        ConfluenceAPIAdapter(config_resource["confluence_base_url"],
+                             credentials_provider=lambda: secret_manager.get_secret(confluence_secret_name),
+                             credentials_refresher=lambda: secret_manager.refresh(confluence_secret_name),
+                             http_session=PooledHttpSession(
+                                 pool_maxsize=int(config_resource["confluence_pool_maxsize"]),
+                                 connect_timeout=float(config_resource["confluence_connect_timeout_seconds"]),
+                                 read_timeout=float(config_resource["confluence_read_timeout_seconds"]),
+                                 max_retries=int(config_resource["confluence_max_retries"]))),
+        landing_zone,
+        StepFunctionTriggerAdapter(config_resource["aws_state_machine_arn"], config_resource["aws_region_name"]),
+        S3SyncManifestAdapter(config_resource["aws_s3_bucket_name"], config_resource["aws_s3_manifest_path"],
+                              config_resource["aws_region_name"]),
+        direct_extract=direct_extract,
+        audit_zone=audit_zone,
+        pending_changes=pending_changes
+    )
+
+
+# Grafo de objetos reutilizado entre invocaciones warm del mismo entorno de ejecución. La
+# configuración sale de variables de entorno, fijas durante su vida: se construye una sola vez
+_use_case_graph = WarmObjectGraph(_make_use_case, fingerprint_keys=())
+
+
+def _config_resource() -> Dict[str, str]:
+    # Todo lo que lee _make_use_case pasa por aquí
+    return {
+        "confluence_secret_name": CONFLUENCE_SECRET_NAME,
+        "confluence_base_url": CONFLUENCE_BASE_URL,
+        "confluence_pool_maxsize": str(CONFLUENCE_POOL_MAXSIZE),
+        "confluence_connect_timeout_seconds": str(CONFLUENCE_CONNECT_TIMEOUT_SECONDS),
+        "confluence_read_timeout_seconds": str(CONFLUENCE_READ_TIMEOUT_SECONDS),
+        "confluence_max_retries": str(CONFLUENCE_MAX_RETRIES),
+        "secret_cache_ttl_seconds": str(SECRET_CACHE_TTL_SECONDS),
+        "secret_cache_stale_seconds": str(SECRET_CACHE_STALE_SECONDS),
+        "aws_region_name": AWS_REGION_NAME,
+        "aws_s3_bucket_name": AWS_S3_BUCKET_NAME,
+        "aws_s3_bucket_path": AWS_S3_BUCKET_PATH,
+        "landing_codec": LANDING_CODEC,
+        "aws_s3_manifest_path": AWS_S3_MANIFEST_PATH,
+        "aws_state_machine_arn": AWS_STATE_MACHINE_ARN,
+        "process_direct_mode": str(PROCESS_DIRECT_MODE).lower(),
+        "aws_s3_ground_bucket": AWS_S3_GROUND_BUCKET,
+        "aws_s3_ground_prefix": AWS_S3_GROUND_PREFIX,
+        "aws_s3_audit_path": AWS_S3_AUDIT_PATH,
+        "ingestion_queue_url": INGESTION_QUEUE_URL,
+        "aws_s3_ground_index_prefix": AWS_S3_GROUND_INDEX_PREFIX,
+        "ground_skip_unchanged": str(GROUND_SKIP_UNCHANGED).lower(),
+        "html_parser_backend": HTML_PARSER_BACKEND,
+        "extract_content_mode": EXTRACT_CONTENT_MODE,
+        "extract_chunking": str(EXTRACT_CHUNKING).lower(),
+        "extract_chunk_max_bytes": str(EXTRACT_CHUNK_MAX_BYTES)
+    }
+
+
+def _build_document_event(body: Dict[str, Any]) -> DocumentEvent:
+    page_id = body.get("page_id")
+    event_type_str = body.get("event_type")
+
+    if not page_id or not event_type_str:
+        raise ValueError("Required parameters are missing: page_id or event_type")
+
+    try:
+        event_type = DocumentEventType(event_type_str)
+    except ValueError:
+        raise ValueError(f"Invalid event_type: {event_type_str}")
+
+    return DocumentEvent(page_id, event_type)
+
+
+def _record_body(record: Dict[str, Any]) -> Dict[str, Any]:
+    # SQS entrega el body como string; si viene de EventBridge el payload está en "detail"
+    body = json.loads(record.get("body") or "{}")
+    return body.get("detail", body)
+
+
+def _log_skip_rate(use_case: ProcessUseCase, since: Tuple[int, int], **extra: Any) -> None:
+    # Solo las páginas de esta invocación: los contadores del use case son del entorno warm completo
+    processed, skipped = use_case.skip_counts()
+    logger.info(
+        f" METRIC : sync_skip_rate",
+        extra={"metric": "sync_skip_rate", "value": use_case.skip_rate(since),
+               "processed": processed - since[0], "skipped_count": skipped - since[1], **extra},
     )
 
+
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
     print(f" event: {event}")
@@ -46,27 +210,20 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         logger.info(f" RUN : ETL PROCESS DOCUMENT : REQUEST ID ({request_id})")
 
         body = event #json.loads(event.get("body") or "{}")
-        page_id = body.get("page_id")
-        event_type_str = body.get("event_type")
-
-        if not page_id or not event_type_str:
-            raise ValueError("Required parameters are missing: page_id or event_type")
-
-        try:
-            event_type = DocumentEventType(event_type_str)
-        except ValueError:
-            raise ValueError(f"Invalid event_type: {event_type_str}")
-
-        document_event = DocumentEvent(page_id, event_type)
-        use_case = _make_use_case()
+        document_event = _build_document_event(body)
+        use_case = _use_case_graph.get(_config_resource())
+        logger.info(f" RUN : ETL PROCESS DOCUMENT : LIFECYCLE {_use_case_graph.stats()}")
+        skip_counts = use_case.skip_counts()
         result = use_case.process(document_event)
 
         logger.info(f" RUN : ETL PROCESS DOCUMENT : END USE CASE")
+        _log_skip_rate(use_case, skip_counts, skipped=result.skipped)
 
         response_body = {
             "page_id": result.document_id,
             "event_type": result.event_type.value,
             "object_key": result.document_uri,
+            "skipped": result.skipped,
             "status": "OK",
             "request_id": request_id
         }
@@ -90,3 +247,53 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             },
         )
         return {"statusCode": 500, "body": json.dumps({"error": str(e)})}
+
+
+def _batch_workers(record_count: int) -> int:
+    return max(1, min(PROCESS_BATCH_MAX_WORKERS, CONFLUENCE_POOL_MAXSIZE, record_count))
+
+
+def batch_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Entrada para lotes SQS (o EventBridge -> SQS). Procesa los registros de
+    forma concurrente con el mismo ProcessUseCase y reporta los fallidos en
+    batchItemFailures para que solo esos mensajes se reintenten.
+    Requiere ReportBatchItemFailures en el event source mapping. Un registro
+    fallido sin messageId no se puede reportar: se lanza la excepción y SQS
+    reintenta el lote completo en vez de darlo por procesado.
+    """
+    records = event.get("Records", [])
+    request_id = context.aws_request_id
+    logger.info(f" RUN : ETL PROCESS BATCH : REQUEST ID ({request_id}) : RECORDS ({len(records)})")
+
+    use_case = _use_case_graph.get(_config_resource())
+    logger.info(f" RUN : ETL PROCESS BATCH : LIFECYCLE {_use_case_graph.stats()}")
+    skip_counts = use_case.skip_counts()
+
+    def process_record(record: Dict[str, Any]) -> Optional[Tuple[Optional[str], Exception]]:
+        message_id = record.get("messageId")
+        try:
+            use_case.process(_build_document_event(_record_body(record)))
+            return None
+        except Exception as e:
+            logger.error(
+                f"Error procesando mensaje {message_id}: {str(e)}",
+                extra={
+                    "record": record,
+                    "error_type": type(e).__name__
+                },
+            )
+            return message_id, e
+
+    with ThreadPoolExecutor(max_workers=_batch_workers(len(records))) as executor:
+        failures = [failure for failure in executor.map(process_record, records) if failure]
+
+    logger.info(f" RUN : ETL PROCESS BATCH : END USE CASE : FAILED ({len(failures)})")
+    _log_skip_rate(use_case, skip_counts)
+
+    unidentified = [error for message_id, error in failures if not message_id]
+    if unidentified:
+        raise ValueError(f"{len(unidentified)} registros fallidos sin messageId: {unidentified[0]}") \
+            from unidentified[0]
+
+    return {"batchItemFailures": [{"itemIdentifier": message_id} for message_id, _ in failures]}
@@ -1,12 +1,12 @@
-from typing import Any, Dict, Optional
-from rodi import Container
+from typing import Dict
+from rodi import ActivationScope, Container
 
 from app.src.application.ports.process.process_use_case import ProcessUseCaseInterface
 
-from app.src.application.ports.document_source_port import DocumentSourceInterface
-from app.src.application.ports.landing_zone_port import LandingZoneInterface
-from app.src.application.ports.recourse_trigger_port import RecourseTriggerInterface
-from app.src.application.ports.secret_manager_port import SecretManagerInterface
+from app.src.application.ports.document_source_port import DocumentSourcePort
+from app.src.application.ports.landing_zone_port import LandingZonePort
+from app.src.application.ports.recourse_trigger_port import RecourseTriggerPort
+from app.src.application.ports.secret_manager_port import SecretManagerPort
 
 from app.src.application.ports.shared.logger_interface import LoggerInterface
 from app.src.shared.logger.powertools_logger import IOLambdaLogger
@@ -17,6 +17,7 @@ from app.src.infraestructure.adapters.repositories.confluence_api import Conflue
 from app.src.infraestructure.adapters.repositories.s3_repository import S3RepositoryAdapter
 from app.src.infraestructure.adapters.etls.step_function_trigger import StepFunctionTriggerAdapter
 from app.src.infraestructure.adapters.repositories.secrets_manager_adapter import SecretsManagerAdapter
+from app.src.infraestructure.adapters.repositories.cached_secret_manager_adapter import CachedSecretManagerAdapter
 
 
 def create_container(
@@ -24,35 +25,51 @@ def create_container(
         logger: IOLambdaLogger,
         config_resource: Dict[str, str]
 ) -> Container:
+    """
+    Contenedor construido una vez por entorno de ejecución: clientes boto3,
+    secretos y adapters son singletons reutilizados en invocaciones warm;
+    el logger hijo y el use case que lo recibe se crean por invocación (scoped).
+    """
     container = Container()
 
-    # LOGGER - resolve with LoggerInterface
+    # LOGGER - resolve with LoggerInterface, one per invocation scope
     def create_logger_child() -> LoggerInterface:
         return logger.create_child({"author": author, "loggerName": "Process"})
 
-    container.add_transient_by_factory(create_logger_child)
+    container.add_scoped_by_factory(create_logger_child)
 
-    def confluence_api_factory() -> DocumentSourceInterface:
-        secret_manager = SecretsManagerAdapter(config_resource["aws_region_name"])
-        confluence_credential_api = secret_manager.get_secret(config_resource["confluence_secret_name"])
-        return ConfluenceAPIAdapter(config_resource["confluence_base_url"], confluence_credential_api)
+    def secret_manager_factory() -> SecretManagerPort:
+        return CachedSecretManagerAdapter(SecretsManagerAdapter(config_resource["aws_region_name"]))
 
-    container.add_transient_by_factory(confluence_api_factory, DocumentSourceInterface)
+    container.add_singleton_by_factory(secret_manager_factory, SecretManagerPort)
 
-    def s3_landing_factory() -> LandingZoneInterface:
+    def confluence_api_factory(context: ActivationScope) -> DocumentSourcePort:
+        secret_manager = context.provider.get(SecretManagerPort, context)
+        confluence_secret_name = config_resource["confluence_secret_name"]
+        return ConfluenceAPIAdapter(config_resource["confluence_base_url"],
+                                    credentials_provider=lambda: secret_manager.get_secret(confluence_secret_name),
+                                    credentials_refresher=lambda: secret_manager.refresh(confluence_secret_name))
+
+    container.add_singleton_by_factory(confluence_api_factory, DocumentSourcePort)
+
+    def s3_landing_factory() -> LandingZonePort:
         return S3RepositoryAdapter(config_resource["aws_s3_bucket_name"], config_resource["aws_s3_bucket_path"],
                                    config_resource["aws_region_name"])
 
-    container.add_transient_by_factory(s3_landing_factory, LandingZoneInterface)
+    container.add_singleton_by_factory(s3_landing_factory, LandingZonePort)
 
-    def step_function_factory() -> RecourseTriggerInterface:
+    def step_function_factory() -> RecourseTriggerPort:
         return StepFunctionTriggerAdapter(config_resource["aws_state_machine_arn"],
                                           config_resource["aws_region_name"])
 
-    container.add_transient_by_factory(step_function_factory, RecourseTriggerInterface)
+    container.add_singleton_by_factory(step_function_factory, RecourseTriggerPort)
+
+    # Use Cases - scoped para recibir el logger hijo de la invocación; los adapters son singletons
+    def process_use_case_factory(context: ActivationScope) -> ProcessUseCaseInterface:
+        return ProcessUseCase(context.provider.get(DocumentSourcePort, context),
+                              context.provider.get(LandingZonePort, context),
+                              context.provider.get(RecourseTriggerPort, context),
+                              logger=context.provider.get(LoggerInterface, context))
 
-    # Use Cases
-    container.add_transient(
-        ProcessUseCaseInterface, ProcessUseCase
-    )
+    container.add_scoped_by_factory(process_use_case_factory, ProcessUseCaseInterface)
     return container
@@ -51,6 +51,22 @@ def _make_use_case() -> ProcessUseCase:
         StepFunctionTriggerAdapter(AWS_STATE_MACHINE_ARN, AWS_REGION_NAME)
     )'''
 
+# Contenedor construido una vez por entorno de ejecución y reutilizado en invocaciones warm
+_container = create_container(
+    author="",
+    logger=io_logger,
+    config_resource={
+        "confluence_secret_name": CONFLUENCE_SECRET_NAME,
+        "confluence_base_url": CONFLUENCE_BASE_URL,
+        "aws_region_name": AWS_REGION_NAME,
+        "aws_s3_bucket_name": AWS_S3_BUCKET_NAME,
+        "aws_s3_bucket_path": AWS_S3_BUCKET_PATH,
+        "aws_state_machine_arn": AWS_STATE_MACHINE_ARN
+    }
+)
+_services = _container.build_provider()
+
+
 @tracer.capture_lambda_handler
 @logger.inject_lambda_context(log_event=True)
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -59,21 +75,6 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     logger.info(f" event: {event}")
 
     try:
-        config_resource = {
-            "confluence_secret_name": CONFLUENCE_SECRET_NAME,
-            "confluence_base_url": CONFLUENCE_BASE_URL,
-            "aws_region_name": AWS_REGION_NAME,
-            "aws_s3_bucket_name": AWS_S3_BUCKET_NAME,
-            "aws_s3_bucket_path": AWS_S3_BUCKET_PATH,
-            "aws_state_machine_arn": AWS_STATE_MACHINE_ARN
-        }
-
-        container = create_container(
-            author="",
-            logger=io_logger,
-            config_resource=config_resource
-        )
-
         request_id = context.aws_request_id
         logger.info(f" RUN : ETL PROCESS DOCUMENT : REQUEST ID ({request_id})")
 
@@ -81,10 +82,11 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         page_id = body.get("page_id")
         event_type = body.get("event_type")
 
-        document_event = DocumentEvent.from_process(page_id, event_type)
+        document_event = DocumentEvent(page_id, DocumentEventType(event_type))
 
-        process_entry_point = container.resolve(ProcessUseCaseInterface)
-        result = process_entry_point.process(document_event)
+        with _services.create_scope() as scope:
+            process_entry_point = _services.get(ProcessUseCaseInterface, scope)
+            result = process_entry_point.process(document_event)
 
         logger.info(f" RUN : ETL PROCESS DOCUMENT : END USE CASE")
 
@@ -0,0 +1,78 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Generic, Iterable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class WarmObjectGraph(Generic[T]):
+    """
+    Mantiene el grafo de objetos (use case, adapters, clientes boto3) construido
+    una sola vez por entorno de ejecución Lambda y lo reutiliza en invocaciones
+    warm. Se reconstruye cuando cambia la configuración recibida.
+
+    fingerprint_keys limita la comparación a los valores que se vuelven a leer
+    en cada invocación (p. ej. settings de SSM); con una tupla vacía el grafo
+    se construye una sola vez, como corresponde a la configuración tomada de
+    variables de entorno. Sin fingerprint_keys se compara la configuración
+    completa.
+    """
+
+    def __init__(self, builder: Callable[[Dict[str, str]], T], fingerprint_keys: Optional[Iterable[str]] = None):
+        self._builder = builder
+        self._fingerprint_keys = tuple(fingerprint_keys) if fingerprint_keys is not None else None
+        self._lock = threading.Lock()
+        self._instance: Optional[T] = None
+        self._config_fingerprint: Optional[str] = None
+
+        self.build_count = 0
+        self.invocation_count = 0
+        self.cold_start_ms: Optional[float] = None
+        self.last_build_ms: Optional[float] = None
+        self.last_resolve_ms: Optional[float] = None
+        self.last_was_cold = False
+
+    def _fingerprint(self, config: Dict[str, str]) -> str:
+        if self._fingerprint_keys is not None:
+            if not self._fingerprint_keys:
+                return ""
+            config = {key: config.get(key) for key in self._fingerprint_keys}
+        config_str = json.dumps(config, sort_keys=True, default=str)
+        return hashlib.sha256(config_str.encode("utf-8")).hexdigest()
+
+    def get(self, config: Dict[str, str]) -> T:
+        started = time.perf_counter()
+        fingerprint = self._fingerprint(config)
+
+        with self._lock:
+            self.invocation_count += 1
+            if self._instance is None or fingerprint != self._config_fingerprint:
+                self._instance = self._builder(config)
+                self._config_fingerprint = fingerprint
+                self.build_count += 1
+                self.last_was_cold = True
+                self.last_build_ms = (time.perf_counter() - started) * 1000
+                if self.cold_start_ms is None:
+                    self.cold_start_ms = self.last_build_ms
+            else:
+                self.last_was_cold = False
+
+            self.last_resolve_ms = (time.perf_counter() - started) * 1000
+            return self._instance
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._instance = None
+            self._config_fingerprint = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cold": self.last_was_cold,
+            "build_count": self.build_count,
+            "invocation_count": self.invocation_count,
+            "cold_start_ms": self.cold_start_ms,
+            "last_build_ms": self.last_build_ms,
+            "last_resolve_ms": self.last_resolve_ms,
+        }
@@ -49,7 +49,30 @@ def determinate_log_level(
     return LogLevel.SILENT
 
 
+# Claves de Powertools que se mapean al evento propio o que no se emiten
+POWERTOOLS_MAPPED_KEYS = frozenset({
+    "level",
+    "location",
+    "message",
+    "timestamp",
+    "service",
+    "function_request_id",
+    "function_memory_size",
+    "cold_start",
+    "function_name",
+    "xray_trace_id",
+    "exception",
+    "exception_name",
+    "stack_trace",
+})
+
+
 class CustomPowertoolsFormatter(LambdaPowertoolsFormatter):
+    """
+    Emite el evento de log propio armándolo en una sola pasada desde el
+    LogRecord: sin serializar el JSON de Powertools para volver a leerlo.
+    Las variables de entorno fijas del entorno de ejecución se leen una vez.
+    """
 
     def __init__(self, service: str, author: str = ""):
         super().__init__(
@@ -59,66 +82,53 @@ class CustomPowertoolsFormatter(LambdaPowertoolsFormatter):
         )
         self.author = author
         self.service = service
+        self.env = os.getenv("ENV", "dev")
+        self.function_version = os.getenv("AWS_LAMBDA_FUNCTION_VERSION", "$LATEST")
+        self.function_memory_size = os.getenv("AWS_LAMBDA_FUNCTION_MEMORY_SIZE", "256")
+        self.function_name = os.getenv("AWS_LAMBDA_FUNCTION_NAME", "")
 
     def set_author(self, author: str) -> None:
         self.author = author
 
     def format(self, record: LogRecord) -> str:
-        formatted_log_str = super().format(record)
+        powertools_data = self._extract_log_keys(log_record=record)
 
-        try:
-            powertools_data = json.loads(formatted_log_str)
-        except:
-            powertools_data = {}
+        message = self._extract_log_message(log_record=record)
+        if "exception_notes" not in powertools_data and isinstance(record.exc_info, tuple):
+            # El texto de la excepción y su stack trace no se emiten: solo las notas
+            powertools_data["exception_notes"] = getattr(record.exc_info[1], "__notes__", None)
 
         custom_event = {
-            "message": powertools_data.get("message", record.getMessage()),
-            "xRayTraceId": powertools_data.get("xray_trace_id"),
-            "timestamp": powertools_data.get(
-                "timestamp", datetime.utcnow().isoformat() + "Z"
-            ),
-            "level": powertools_data.get("level", record.levelname.lower()),
-            "env": os.getenv("ENV", "dev"),
-            "serviceVersion": os.getenv("AWS_LAMBDA_FUNCTION_VERSION", "$LATEST"),
-            "service": powertools_data.get("service", self.service),
-            "requestId": powertools_data.get("function_request_id", ""),
+            "message": message if message is not None else record.getMessage(),
+            "xRayTraceId": self._get_latest_trace_id(),
+            "timestamp": powertools_data.get("timestamp") or datetime.utcnow().isoformat() + "Z",
+            "level": powertools_data.get("level") or record.levelname.lower(),
+            "env": self.env,
+            "serviceVersion": self.function_version,
+            "service": self._value(powertools_data, "service", self.service),
+            "requestId": self._value(powertools_data, "function_request_id", ""),
             "functionInfo": {
-                "memoryLimitInMB": powertools_data.get(
-                    "function_memory_size",
-                    os.getenv("AWS_LAMBDA_FUNCTION_MEMORY_SIZE", "256"),
-                ),
-                "coldStart": powertools_data.get("cold_start", True),
-                "version": os.getenv("AWS_LAMBDA_FUNCTION_VERSION", "$LATEST"),
-                "handler": powertools_data.get(
-                    "function_name", os.getenv("AWS_LAMBDA_FUNCTION_NAME", "")
-                ),
+                "memoryLimitInMB": self._value(powertools_data, "function_memory_size", self.function_memory_size),
+                "coldStart": self._value(powertools_data, "cold_start", True),
+                "version": self.function_version,
+                "handler": self._value(powertools_data, "function_name", self.function_name),
             },
             "loggerName": "Logger",
             "author": self.author,
         }
-        extra_fields = {
-            k: v
-            for k, v in powertools_data.items()
-            if k
-            not in [
-                "level",
-                "location",
-                "message",
-                "timestamp",
-                "service",
-                "function_request_id",
-                "function_memory_size",
-                "cold_start",
-                "function_name",
-                "xray_trace_id",
-                "exception",
-                "exception_name",
-                "stack_trace",
-            ]
-        }
-        custom_event.update(extra_fields)
+        custom_event.update(
+            (key, value)
+            for key, value in powertools_data.items()
+            if value is not None and key not in POWERTOOLS_MAPPED_KEYS
+        )
 
-        return json.dumps(custom_event)
+        return json.dumps(custom_event, default=self.json_default)
+
+    @staticmethod
+    def _value(powertools_data: Dict[str, Any], key: str, default: Any) -> Any:
+        # Powertools descarta las claves en None antes de emitir: se usa el valor por defecto
+        value = powertools_data.get(key)
+        return default if value is None else value
 
 
 class IOLambdaLogger(LoggerInterface):
@@ -209,27 +219,65 @@ class IOLambdaLogger(LoggerInterface):
 
     def create_child(
         self, persistent_log_attributes: Optional[Dict[str, Any]] = None
-    ) -> "IOLambdaLogger":
+    ) -> "IOLambdaChildLogger":
+        return IOLambdaChildLogger(self, persistent_log_attributes)
 
-        child = IOLambdaLogger(
-            service=self.service,
-            environment=self.environment,
-            log_level=None,
-            service_version=self.service_version,
-        )
 
-        child._logger.setLevel(self._logger.level)
-        for handler in child._logger.handlers:
-            handler.setLevel(self._logger.level)
+class IOLambdaChildLogger(LoggerInterface):
+    """
+    Logger hijo liviano: reutiliza el Logger, los handlers y el formatter del
+    padre y solo guarda sus claves ligadas (author, loggerName, ...), que se
+    envían como extra en cada registro. No crea handlers ni modifica el nivel
+    ni las claves del padre, así que puede resolverse en cada invocación.
+    """
+
+    def __init__(
+        self,
+        parent: IOLambdaLogger,
+        persistent_log_attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self._parent = parent
+        self._logger = parent.get_logger()
+        self._bound_keys: Dict[str, Any] = dict(persistent_log_attributes or {})
+
+    def _extra(self, extra: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        # Los extra del registro prevalecen sobre las claves ligadas, como con append_keys
+        return {**self._bound_keys, **extra} if extra else self._bound_keys
+
+    def set_author(self, author: str) -> None:
+        self._bound_keys["author"] = author
+
+    def get_transaction_id(self) -> Optional[str]:
+        return self._parent.get_transaction_id()
+
+    def info(self, message: str, extra: Optional[Dict[str, Any]] = None) -> None:
+        self._logger.info(message, extra=self._extra(extra))
 
-        if persistent_log_attributes:
-            if "author" in persistent_log_attributes:
-                child.set_author(persistent_log_attributes["author"])
+    def error(self, message: str, extra: Optional[Dict[str, Any]] = None) -> None:
+        self._logger.error(message, extra=self._extra(extra))
 
-            other_attrs = {
-                k: v for k, v in persistent_log_attributes.items() if k != "author"
-            }
-            if other_attrs:
-                child.append_keys(**other_attrs)
+    def warning(self, message: str, extra: Optional[Dict[str, Any]] = None) -> None:
+        self._logger.warning(message, extra=self._extra(extra))
+
+    def debug(self, message: str, extra: Optional[Dict[str, Any]] = None) -> None:
+        self._logger.debug(message, extra=self._extra(extra))
 
-        return child
+    def exception(self, message: str, extra: Optional[Dict[str, Any]] = None) -> None:
+        self._logger.exception(message, extra=self._extra(extra))
+
+    def get_logger(self) -> Logger:
+        return self._logger
+
+    def append_keys(self, **additional_keys) -> None:
+        self._bound_keys.update(additional_keys)
+
+    def remove_keys(self, keys) -> None:
+        for key in keys:
+            self._bound_keys.pop(key, None)
+
+    def create_child(
+        self, persistent_log_attributes: Optional[Dict[str, Any]] = None
+    ) -> "IOLambdaChildLogger":
+        return IOLambdaChildLogger(
+            self._parent, {**self._bound_keys, **(persistent_log_attributes or {})}
+        )
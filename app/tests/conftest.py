@@ -0,0 +1,28 @@
+import os
+
+import pytest
+from moto import mock_aws
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: mide tiempos de ejecución; solo corre con RUN_BENCHMARKS=1")
+
+
+def pytest_collection_modifyitems(config, items):
+    # Los benchmarks dependen de la carga de la máquina: fuera de la suite unitaria salvo que se pidan
+    if os.getenv("RUN_BENCHMARKS") == "1":
+        return
+    skip_benchmark = pytest.mark.skip(reason="benchmark: ejecutar con RUN_BENCHMARKS=1")
+    for item in items:
+        if item.get_closest_marker("benchmark"):
+            item.add_marker(skip_benchmark)
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    """Credenciales falsas y servicios AWS simulados con moto durante el test."""
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        yield
@@ -0,0 +1,74 @@
+from app.src.application.usecases.etl_backfill_use_case import BackfillUseCase
+
+
+class _FakeSource:
+    def __init__(self, batches):
+        self.batches = batches
+        self.crawls = 0
+
+    def iter_page_batches(self, cql, cursor=None):
+        self.crawls += 1
+        start = int(cursor or 0)
+        for index in range(start, len(self.batches)):
+            next_cursor = str(index + 1) if index + 1 < len(self.batches) else None
+            yield self.batches[index], next_cursor
+
+
+class _FakeProcess:
+    def __init__(self):
+        self.page_ids = []
+
+    def process_page(self, event, page_data):
+        self.page_ids.append(event.document_id)
+
+
+class _DictCheckpointStore:
+    def __init__(self):
+        self.checkpoints = {}
+
+    def load(self, run_id):
+        return self.checkpoints.get(run_id)
+
+    def save(self, run_id, checkpoint):
+        self.checkpoints[run_id] = dict(checkpoint)
+
+
+def _use_case():
+    source = _FakeSource([[{"id": "1"}, {"id": "2"}], [{"id": "3"}]])
+    process = _FakeProcess()
+    return BackfillUseCase(source, process, _DictCheckpointStore(), max_workers=2), source, process
+
+
+def test_completed_run_is_not_repeated_without_restart():
+    use_case, source, process = _use_case()
+    use_case.run("run", "space = X", should_continue=lambda: True)
+
+    result = use_case.run("run", "space = X", should_continue=lambda: True)
+
+    assert result.completed
+    assert source.crawls == 1
+    assert sorted(process.page_ids) == ["1", "2", "3"]
+
+
+def test_restart_completed_crawls_again_from_the_start():
+    use_case, source, process = _use_case()
+    use_case.run("run", "space = X", should_continue=lambda: True)
+
+    result = use_case.run("run", "space = X", should_continue=lambda: True, restart_completed=True)
+
+    assert result.completed
+    assert result.processed == 3
+    assert source.crawls == 2
+    assert sorted(process.page_ids) == ["1", "1", "2", "2", "3", "3"]
+
+
+def test_restart_does_not_discard_an_unfinished_checkpoint():
+    use_case, source, process = _use_case()
+    first = use_case.run("run", "space = X", should_continue=lambda: False)
+    assert not first.completed and first.processed == 2
+
+    result = use_case.run("run", "space = X", should_continue=lambda: True, restart_completed=True)
+
+    assert result.completed
+    assert result.processed == 3
+    assert sorted(process.page_ids) == ["1", "2", "3"]
@@ -0,0 +1,168 @@
+import json
+import threading
+
+import boto3
+import pytest
+
+from app.src.application.usecases.etl_bulk_delete_use_case import BulkDeleteUseCase
+from app.src.infraestructure.adapters.etls.in_memory_ingestion_adapter import InMemoryIngestionAdapter
+from app.src.infraestructure.adapters.repositories.in_memory_sync_manifest import InMemorySyncManifestAdapter
+from app.src.infraestructure.adapters.repositories.s3_archive_adapter import S3ArchiveAdapter
+from app.src.infraestructure.adapters.repositories.s3_sync_manifest import S3SyncManifestAdapter
+
+BUCKET = "ground-test"
+
+
+class _FakeArchive:
+    def __init__(self, archive_errors=None):
+        self.deleted = []
+        self.archive_errors = archive_errors or {}
+
+    def archive_many(self, object_names):
+        return {name: error for name, error in self.archive_errors.items() if name in object_names}
+
+    def delete_many(self, object_names):
+        self.deleted += object_names
+        return {}
+
+
+class _RecordingQueue:
+    def __init__(self):
+        self.calls = []
+
+    def requeue(self, changes, delay_seconds):
+        self.calls.append((changes, delay_seconds))
+
+
+class _FakeChunkIndex:
+    def __init__(self):
+        self.threads = set()
+
+    def load(self, page_id):
+        self.threads.add(threading.current_thread().name)
+        return {"chunks": {"c1": "hash"}}
+
+    def delete(self, page_id):
+        pass
+
+
+def _busy_ingestion():
+    ingestion = InMemoryIngestionAdapter(job_duration_seconds=3600)
+    ingestion.start_ingestion_job("kb", "ds")
+    return ingestion
+
+
+def test_conflict_sends_the_deletions_to_the_pending_changes_queue():
+    queue = _RecordingQueue()
+    use_case = BulkDeleteUseCase(_FakeArchive(), _busy_ingestion(), "kb", "ds",
+                                 pending_changes=queue, pending_delay_seconds=45)
+
+    result = use_case.delete_pages(["1", "2"])
+
+    assert result.ingestion_status == "QUEUED"
+    assert queue.calls == [([{"document_id": "1", "event_type": "deleted"},
+                             {"document_id": "2", "event_type": "deleted"}], 45)]
+
+
+def test_conflict_without_queue_retries_with_backoff():
+    sleeps = []
+    ingestion = _busy_ingestion()
+    use_case = BulkDeleteUseCase(_FakeArchive(), ingestion, "kb", "ds", conflict_retries=3,
+                                 conflict_backoff_seconds=2, sleep=sleeps.append)
+
+    result = use_case.delete_pages(["1"])
+
+    assert result.ingestion_status == "CONFLICT"
+    assert sleeps == [2, 4, 8]
+    assert ingestion.start_calls == 1 + 4
+
+
+def test_retry_starts_the_job_once_the_data_source_is_free():
+    clock = [0.0]
+    ingestion = InMemoryIngestionAdapter(job_duration_seconds=5, clock=lambda: clock[0])
+    ingestion.start_ingestion_job("kb", "ds")
+
+    def sleep(seconds):
+        clock[0] += seconds
+
+    use_case = BulkDeleteUseCase(_FakeArchive(), ingestion, "kb", "ds", conflict_backoff_seconds=2, sleep=sleep)
+
+    result = use_case.delete_pages(["1"])
+
+    assert result.ingestion_job_id is not None
+    assert clock[0] == 2 + 4
+
+
+def test_index_load_workers_is_configurable():
+    chunk_index = _FakeChunkIndex()
+    archive = _FakeArchive()
+    use_case = BulkDeleteUseCase(archive, InMemoryIngestionAdapter(), "kb", "ds",
+                                 chunk_index=chunk_index, index_load_workers=1)
+
+    use_case.delete_pages([str(page_id) for page_id in range(20)])
+
+    assert len(chunk_index.threads) == 1
+    assert "7.chunk-c1.metadata.html" in archive.deleted
+
+
+def test_deleted_pages_leave_no_sync_manifest_entry():
+    manifest = InMemorySyncManifestAdapter()
+    for page_id in ("1", "2", "3"):
+        manifest.put(page_id, {"version": 1, "content_hash": "h"})
+    use_case = BulkDeleteUseCase(_FakeArchive(archive_errors={"2.html": "AccessDenied"}), InMemoryIngestionAdapter(),
+                                 "kb", "ds", sync_manifest=manifest)
+
+    result = use_case.delete_pages(["1", "2"])
+
+    assert result.deleted_page_ids == ["1"]
+    # Solo se borra la entrada de lo que salió de vigente
+    assert manifest.get("1") is None
+    assert manifest.get("2") is not None
+    assert manifest.get("3") is not None
+
+
+class _FailingManifest(InMemorySyncManifestAdapter):
+    def delete_many(self, page_ids):
+        return {page_ids[0]: "SlowDown: reduzca la tasa"}
+
+
+def test_manifest_errors_are_reported_for_retry():
+    use_case = BulkDeleteUseCase(_FakeArchive(), InMemoryIngestionAdapter(), "kb", "ds",
+                                 sync_manifest=_FailingManifest())
+
+    result = use_case.delete_pages(["1", "2"])
+
+    # La página ya salió de vigente y entra al job; el reintento limpia su entrada
+    assert result.deleted_page_ids == ["1", "2"]
+    assert result.failed_page_ids == {"1": "manifiesto: SlowDown: reduzca la tasa"}
+    assert result.ingestion_job_id is not None
+
+
+@pytest.fixture
+def s3(aws):
+    client = boto3.client("s3", region_name="us-east-1")
+    client.create_bucket(Bucket=BUCKET)
+    yield client
+
+
+def test_s3_bulk_delete_removes_objects_and_manifest_entries_in_batches(s3):
+    page_ids = [str(page_id) for page_id in range(501)]
+    for page_id in page_ids:
+        s3.put_object(Bucket=BUCKET, Key=f"vigente/{page_id}.html", Body=b"<p>x</p>")
+        s3.put_object(Bucket=BUCKET, Key=f"manifest/{page_id}.json", Body=json.dumps({"version": 1}).encode())
+    archive = S3ArchiveAdapter(BUCKET, "vigente", "eliminado", "us-east-1")
+    manifest = S3SyncManifestAdapter(BUCKET, "manifest", "us-east-1")
+    deletes = []
+    for client in (archive.s3_client, manifest.s3_client):
+        client.meta.events.register("provide-client-params.s3.DeleteObjects",
+                                    lambda params, **kwargs: deletes.append(len(params["Delete"]["Objects"])))
+
+    result = BulkDeleteUseCase(archive, InMemoryIngestionAdapter(), "kb", "ds",
+                               sync_manifest=manifest).delete_pages(page_ids)
+
+    assert result.failed_page_ids == {}
+    # 1002 objetos de vigente ({id}.html y {id}.metadata.html) y 501 entradas de manifiesto
+    assert deletes == [1000, 2, 501]
+    assert s3.list_objects_v2(Bucket=BUCKET, Prefix="manifest/").get("KeyCount") == 0
+    assert s3.list_objects_v2(Bucket=BUCKET, Prefix="vigente/").get("KeyCount") == 0
+    assert s3.list_objects_v2(Bucket=BUCKET, Prefix="eliminado/")["KeyCount"] == 501
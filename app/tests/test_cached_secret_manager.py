@@ -0,0 +1,172 @@
+import threading
+import time
+
+import pytest
+import responses
+
+from app.src.infraestructure.adapters.http.pooled_session import PooledHttpSession
+from app.src.infraestructure.adapters.repositories.cached_secret_manager_adapter import CachedSecretManagerAdapter
+from app.src.infraestructure.adapters.repositories.confluence_api import ConfluenceAPIAdapter
+
+BASE_URL = "https://confluence.test/wiki"
+PAGE_URL = f"{BASE_URL}/rest/api/content/1"
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _RotatingSecrets:
+    """Cada lectura devuelve la versión vigente del secreto; registra las lecturas."""
+
+    def __init__(self):
+        self.version = 1
+        self.reads = 0
+        self.fail = False
+        self.loaded = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def get_secret(self, secret_name):
+        self.release.wait(timeout=5)
+        self.reads += 1
+        try:
+            if self.fail:
+                raise ValueError("Secrets Manager no disponible")
+            return {"api_token": f"token-{self.version}", "user_api_mail": "user@example.com"}
+        finally:
+            self.loaded.set()
+
+
+def _cache(secrets, clock):
+    return CachedSecretManagerAdapter(secrets, ttl_seconds=300, stale_seconds=600, clock=clock)
+
+
+def _wait_background_refresh(secrets, cache):
+    assert secrets.loaded.wait(timeout=5)
+    while cache._refreshing:
+        time.sleep(0.001)
+
+
+def test_value_is_served_from_memory_within_the_ttl():
+    clock, secrets = _Clock(), _RotatingSecrets()
+    cache = _cache(secrets, clock)
+
+    cache.get_secret("confluence")
+    clock.now = 300
+    secrets.version = 2
+
+    assert cache.get_secret("confluence")["api_token"] == "token-1"
+    assert (secrets.reads, cache.hits, cache.misses) == (1, 1, 1)
+
+
+def test_stale_value_is_served_while_a_single_background_refresh_runs():
+    clock, secrets = _Clock(), _RotatingSecrets()
+    cache = _cache(secrets, clock)
+    cache.get_secret("confluence")
+    secrets.version = 2
+    secrets.loaded.clear()
+    secrets.release.clear()
+    clock.now = 301
+
+    # Durante la recarga todos los accesos reciben el valor vencido sin bloquearse
+    stale = [cache.get_secret("confluence")["api_token"] for _ in range(5)]
+    secrets.release.set()
+    _wait_background_refresh(secrets, cache)
+
+    assert stale == ["token-1"] * 5
+    assert cache.background_refreshes == 1
+    assert cache.get_secret("confluence")["api_token"] == "token-2"
+    assert secrets.reads == 2
+
+
+def test_failed_background_refresh_keeps_the_stale_value():
+    clock, secrets = _Clock(), _RotatingSecrets()
+    cache = _cache(secrets, clock)
+    cache.get_secret("confluence")
+    secrets.fail = True
+    secrets.loaded.clear()
+    clock.now = 400
+
+    assert cache.get_secret("confluence")["api_token"] == "token-1"
+    _wait_background_refresh(secrets, cache)
+
+    assert cache.get_secret("confluence")["api_token"] == "token-1"
+    # El siguiente vencimiento vuelve a intentarlo
+    assert cache.background_refreshes == 2
+
+
+def test_value_past_the_stale_window_is_reloaded_synchronously():
+    clock, secrets = _Clock(), _RotatingSecrets()
+    cache = _cache(secrets, clock)
+    cache.get_secret("confluence")
+    secrets.version = 2
+    clock.now = 901
+
+    assert cache.get_secret("confluence")["api_token"] == "token-2"
+    assert cache.background_refreshes == 0
+    assert cache.misses == 2
+
+
+@pytest.mark.parametrize("reset", ["invalidate", "refresh"])
+def test_invalidate_and_refresh_force_a_synchronous_read(reset):
+    clock, secrets = _Clock(), _RotatingSecrets()
+    cache = _cache(secrets, clock)
+    cache.get_secret("confluence")
+    secrets.version = 2
+
+    getattr(cache, reset)("confluence")
+
+    assert cache.get_secret("confluence")["api_token"] == "token-2"
+    assert secrets.reads == 2
+
+
+def _confluence(cache):
+    return ConfluenceAPIAdapter(BASE_URL,
+                                credentials_provider=lambda: cache.get_secret("confluence"),
+                                credentials_refresher=lambda: cache.refresh("confluence"),
+                                http_session=PooledHttpSession(max_retries=0))
+
+
+def _authorization(call):
+    return call.request.headers["Authorization"]
+
+
+@responses.activate
+def test_rotated_credentials_are_used_once_the_ttl_expires_without_a_401():
+    clock, secrets = _Clock(), _RotatingSecrets()
+    cache = _cache(secrets, clock)
+    confluence = _confluence(cache)
+    responses.add(responses.GET, PAGE_URL, json={"id": "1"})
+
+    confluence.get_page("1")
+    secrets.version = 2
+    clock.now = 901
+    confluence.get_page("1")
+
+    first, second = responses.calls
+    assert _authorization(first) != _authorization(second)
+    assert secrets.reads == 2
+
+
+@responses.activate
+def test_401_refreshes_the_cached_credentials_and_retries_once():
+    clock, secrets = _Clock(), _RotatingSecrets()
+    cache = _cache(secrets, clock)
+    confluence = _confluence(cache)
+    responses.add(responses.GET, PAGE_URL, status=401)
+    responses.add(responses.GET, PAGE_URL, json={"id": "1"})
+    cache.get_secret("confluence")
+    secrets.version = 2
+
+    assert confluence.get_page("1") == {"id": "1"}
+
+    rejected, accepted = responses.calls
+    assert _authorization(rejected) != _authorization(accepted)
+    # El valor refrescado queda en el cache para los siguientes requests
+    assert cache.get_secret("confluence")["api_token"] == "token-2"
+    assert secrets.reads == 2
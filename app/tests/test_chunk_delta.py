@@ -0,0 +1,162 @@
+import boto3
+import pytest
+
+from app.src.application.usecases.etl_extract_use_case import ExtractDocumentUseCase
+from app.src.domain.model.document_event import DocumentEvent, DocumentEventType
+from app.src.infraestructure.adapters.repositories.in_memory_chunk_index import InMemoryChunkIndexAdapter
+from app.src.infraestructure.adapters.repositories.object_codecs import create_object_codec
+from app.src.infraestructure.adapters.repositories.s3_repository import S3RepositoryAdapter
+from app.src.infraestructure.adapters.transformer.content_chunker import create_content_chunker
+
+BUCKET = "ground-test"
+PATH = "ground"
+
+
+@pytest.fixture
+def s3(aws):
+    client = boto3.client("s3", region_name="us-east-1")
+    client.create_bucket(Bucket=BUCKET)
+    yield client
+
+
+class _ChunkingExtractor:
+    """Entrega la página ya dividida en chunks, como el extractor con chunking activo."""
+
+    def __init__(self):
+        self.chunker = create_content_chunker("text", max_chunk_bytes=6000)
+
+    def extract_data(self, document_object):
+        document_data = {"page_id": document_object["id"], "title": document_object["title"],
+                         "page_version_number": document_object["version"],
+                         "chunks": self.chunker.chunk(document_object["body"]["storage"]["value"])}
+        return document_data, {"metadataAttributes": {"title": document_object["title"]}}
+
+
+def _page(body, version=1):
+    return {"id": "1", "title": "Manual", "version": version, "body": {"storage": {"value": body}}}
+
+
+def _body(**sections):
+    return "".join(f"<h2>{heading}</h2><p>{text}</p>" for heading, text in sections.items())
+
+
+def _use_case(chunk_index=None):
+    ground_truth = S3RepositoryAdapter(BUCKET, PATH, "us-east-1", codec=create_object_codec("identity"))
+    return ExtractDocumentUseCase(None, _ChunkingExtractor(), ground_truth, chunk_index=chunk_index)
+
+
+def _count_calls(use_case):
+    calls = {}
+
+    def count(event_name, **kwargs):
+        operation = event_name.rsplit(".", 1)[-1]
+        calls[operation] = calls.get(operation, 0) + 1
+
+    use_case.ground_truth_zone.s3_client.meta.events.register("before-call.s3", count)
+    return calls
+
+
+def _keys(s3):
+    return sorted(item["Key"][len(PATH) + 1:] for item in s3.list_objects_v2(Bucket=BUCKET).get("Contents", []))
+
+
+def _extract(use_case, body, version=1):
+    return use_case.extract_page(DocumentEvent("1", DocumentEventType.UPDATED), _page(body, version))
+
+
+def test_first_write_stores_every_chunk_and_retires_the_full_page(s3):
+    s3.put_object(Bucket=BUCKET, Key=f"{PATH}/1.html", Body=b"{}")
+    s3.put_object(Bucket=BUCKET, Key=f"{PATH}/1.metadata.html", Body=b"{}")
+    chunk_index = InMemoryChunkIndexAdapter()
+
+    result = _extract(_use_case(chunk_index), _body(Uno="a", Dos="b"))
+
+    assert _keys(s3) == ["1.chunk-dos.html", "1.chunk-dos.metadata.html",
+                         "1.chunk-uno.html", "1.chunk-uno.metadata.html"]
+    assert result.data_object_key == "1.chunk-uno.html"
+    assert (result.skipped, result.chunk_churn_ratio) == (False, 1.0)
+    assert set(chunk_index.load("1")["chunks"]) == {"uno", "dos"}
+
+
+def test_unchanged_chunks_are_not_rewritten(s3):
+    chunk_index = InMemoryChunkIndexAdapter()
+    use_case = _use_case(chunk_index)
+    _extract(use_case, _body(Uno="a", Dos="b", Tres="c"))
+    calls = _count_calls(use_case)
+
+    # Una nueva versión con una sola sección editada
+    result = _extract(use_case, _body(Uno="a", Dos="b editado", Tres="c"), version=2)
+
+    assert calls == {"PutObject": 2}
+    assert result.skipped is False
+    assert result.chunk_churn_ratio == pytest.approx(1 / 3)
+    assert s3.get_object(Bucket=BUCKET, Key=f"{PATH}/1.chunk-dos.html")["Body"].read().count(b"b editado") == 1
+
+
+def test_identical_page_is_skipped_without_any_write(s3):
+    chunk_index = InMemoryChunkIndexAdapter()
+    use_case = _use_case(chunk_index)
+    _extract(use_case, _body(Uno="a", Dos="b"))
+    calls = _count_calls(use_case)
+
+    # Solo cambia la versión de la página, que no forma parte de los chunks
+    result = _extract(use_case, _body(Uno="a", Dos="b"), version=2)
+
+    assert calls == {}
+    assert (result.skipped, result.chunk_churn_ratio) == (True, 0.0)
+
+
+def test_removed_chunks_are_deleted_from_ground_truth(s3):
+    chunk_index = InMemoryChunkIndexAdapter()
+    use_case = _use_case(chunk_index)
+    _extract(use_case, _body(Uno="a", Dos="b", Tres="c"))
+    calls = _count_calls(use_case)
+
+    result = _extract(use_case, _body(Uno="a", Tres="c"), version=2)
+
+    assert calls == {"DeleteObjects": 1}
+    assert _keys(s3) == ["1.chunk-tres.html", "1.chunk-tres.metadata.html",
+                         "1.chunk-uno.html", "1.chunk-uno.metadata.html"]
+    # Eliminar un chunk es un cambio que requiere ingesta
+    assert result.skipped is False
+    assert result.chunk_churn_ratio == pytest.approx(1 / 3)
+
+
+def test_index_records_the_hash_of_every_current_chunk(s3):
+    chunk_index = InMemoryChunkIndexAdapter()
+    use_case = _use_case(chunk_index)
+    _extract(use_case, _body(Uno="a", Dos="b"))
+    first = chunk_index.load("1")
+
+    _extract(use_case, _body(Uno="a", Cuatro="d"), version=2)
+    second = chunk_index.load("1")
+
+    assert first["page_id"] == second["page_id"] == "1"
+    assert list(second["chunks"]) == ["uno", "cuatro"]
+    assert second["chunks"]["uno"] == first["chunks"]["uno"]
+    assert all(len(chunk_hash) == 64 for chunk_hash in second["chunks"].values())
+
+
+def test_failed_delete_leaves_the_index_untouched(s3, monkeypatch):
+    chunk_index = InMemoryChunkIndexAdapter()
+    use_case = _use_case(chunk_index)
+    _extract(use_case, _body(Uno="a", Dos="b"))
+    previous = chunk_index.load("1")
+    monkeypatch.setattr(use_case.ground_truth_zone, "delete_many",
+                        lambda object_names: {name: "AccessDenied" for name in object_names})
+
+    with pytest.raises(ValueError, match="eliminar chunks"):
+        _extract(use_case, _body(Uno="a"), version=2)
+
+    # El reintento vuelve a calcular el mismo delta
+    assert chunk_index.load("1") == previous
+
+
+def test_without_chunk_index_every_chunk_is_written(s3):
+    use_case = _use_case()
+    _extract(use_case, _body(Uno="a", Dos="b"))
+    calls = _count_calls(use_case)
+
+    _extract(use_case, _body(Uno="a", Dos="b editado"), version=2)
+
+    assert calls == {"PutObject": 4}
@@ -0,0 +1,118 @@
+import pytest
+import responses
+from responses import matchers
+
+from app.src.infraestructure.adapters.http.pooled_session import PooledHttpSession
+from app.src.infraestructure.adapters.repositories.confluence_api import ConfluenceAPIAdapter
+
+BASE_URL = "https://confluence.test/wiki"
+SEARCH_URL = f"{BASE_URL}/rest/api/content/search"
+CREDENTIALS = {"api_token": "token", "user_api_mail": "user@example.com"}
+
+
+def _confluence(bulk_batch_size=2):
+    return ConfluenceAPIAdapter(BASE_URL, CREDENTIALS, bulk_batch_size=bulk_batch_size,
+                                http_session=PooledHttpSession(max_retries=0))
+
+
+def _pages(*page_ids):
+    return [{"id": page_id, "title": f"Página {page_id}"} for page_id in page_ids]
+
+
+def _next_link(cql, cursor, limit=2):
+    # Confluence devuelve el siguiente bloque relativo al contexto (/wiki) con cql, cursor y limit
+    return f"/rest/api/content/search?cql={cql}&cursor={cursor}&limit={limit}"
+
+
+def _add_page(params, results, next_link=None, status=200):
+    body = {"results": results, "_links": {"next": next_link} if next_link else {}}
+    responses.add(responses.GET, SEARCH_URL, json=body, status=status,
+                  match=[matchers.query_param_matcher(params)])
+
+
+@responses.activate
+def test_iter_page_batches_follows_next_links_until_the_end():
+    cql = "space=KB"
+    _add_page({"cql": cql, "expand": ConfluenceAPIAdapter.PAGE_EXPAND, "limit": "2"}, _pages("1", "2"),
+              _next_link(cql, "c1"))
+    _add_page({"cql": cql, "cursor": "c1", "limit": "2"}, _pages("3", "4"), _next_link(cql, "c2"))
+    _add_page({"cql": cql, "cursor": "c2", "limit": "2"}, _pages("5"))
+
+    batches = list(_confluence().iter_page_batches(cql))
+
+    assert [[page["id"] for page in pages] for pages, _ in batches] == [["1", "2"], ["3", "4"], ["5"]]
+    assert [cursor for _, cursor in batches] == [_next_link(cql, "c1"), _next_link(cql, "c2"), None]
+
+
+@responses.activate
+def test_iter_page_batches_resumes_from_a_cursor():
+    cql = "space=KB"
+    _add_page({"cql": cql, "cursor": "c2", "limit": "2"}, _pages("5"))
+
+    batches = list(_confluence().iter_page_batches(cql, cursor=_next_link(cql, "c2")))
+
+    assert batches == [(_pages("5"), None)]
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_empty_last_page_ends_the_iteration():
+    cql = "space=KB"
+    _add_page({"cql": cql, "expand": ConfluenceAPIAdapter.PAGE_EXPAND, "limit": "2"}, _pages("1", "2"),
+              _next_link(cql, "c1"))
+    _add_page({"cql": cql, "cursor": "c1", "limit": "2"}, [])
+
+    batches = list(_confluence().iter_page_batches(cql))
+
+    assert batches == [(_pages("1", "2"), _next_link(cql, "c1")), ([], None)]
+
+
+@responses.activate
+def test_error_mid_pagination_keeps_the_pages_already_yielded():
+    cql = "space=KB"
+    _add_page({"cql": cql, "expand": ConfluenceAPIAdapter.PAGE_EXPAND, "limit": "2"}, _pages("1", "2"),
+              _next_link(cql, "c1"))
+    _add_page({"cql": cql, "cursor": "c1", "limit": "2"}, [], status=500)
+    received = []
+
+    with pytest.raises(ValueError, match="500"):
+        for pages, cursor in _confluence().iter_page_batches(cql):
+            received.append((pages, cursor))
+
+    # El cursor del último bloque recibido permite reanudar desde el que falló
+    assert received == [(_pages("1", "2"), _next_link(cql, "c1"))]
+
+
+@responses.activate
+def test_get_pages_groups_ids_and_follows_pagination_within_a_batch():
+    first_cql, second_cql = "id in (1,2)", "id in (3)"
+    _add_page({"cql": first_cql, "expand": ConfluenceAPIAdapter.PAGE_EXPAND, "limit": "2"}, _pages("1"),
+              _next_link(first_cql, "c1"))
+    _add_page({"cql": first_cql, "cursor": "c1", "limit": "2"}, _pages("2"))
+    # Las páginas inexistentes o sin permiso no se devuelven
+    _add_page({"cql": second_cql, "expand": ConfluenceAPIAdapter.PAGE_EXPAND, "limit": "1"}, [])
+
+    pages = list(_confluence().get_pages(["1", "2", "3"]))
+
+    assert [page["id"] for page in pages] == ["1", "2"]
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_get_pages_error_mid_pagination_is_wrapped():
+    cql = "id in (1,2)"
+    _add_page({"cql": cql, "expand": ConfluenceAPIAdapter.PAGE_EXPAND, "limit": "2"}, _pages("1"),
+              _next_link(cql, "c1"))
+    _add_page({"cql": cql, "cursor": "c1", "limit": "2"}, [], status=503)
+    pages = _confluence().get_pages(["1", "2"])
+
+    assert next(pages)["id"] == "1"
+    with pytest.raises(ValueError, match=r"páginas \['1', '2'\]"):
+        next(pages)
+
+
+def test_get_pages_rejects_non_numeric_ids_before_any_request():
+    with responses.RequestsMock() as mock:
+        with pytest.raises(ValueError, match="inválidos"):
+            list(_confluence().get_pages(["1", "1) or (type=page"]))
+        assert len(mock.calls) == 0
@@ -0,0 +1,151 @@
+import re
+
+import pytest
+
+from app.src.application.usecases.etl_extract_use_case import ExtractDocumentUseCase
+from app.src.infraestructure.adapters.transformer.content_chunker import FIRST_SECTION_SLUG, create_content_chunker
+
+
+def _paragraph(words, word="palabra"):
+    return "<p>" + " ".join([word] * words) + "</p>"
+
+
+def _ids(chunks):
+    return [chunk["chunk_id"] for chunk in chunks]
+
+
+@pytest.mark.parametrize("mode", ["text", "markdown", "off"])
+def test_small_blocks_are_packed_within_the_size_budget(mode):
+    chunker = create_content_chunker(mode, max_chunk_bytes=120)
+    html = "<h2>Guía</h2>" + "".join(_paragraph(4, f"bloque{i}") for i in range(10))
+
+    chunks = chunker.chunk(html)
+
+    assert len(chunks) > 1
+    assert all(len(chunk["content"].encode("utf-8")) <= 120 for chunk in chunks)
+    assert _ids(chunks) == ["guia"] + [f"guia-{i}" for i in range(2, len(chunks) + 1)]
+    # El empaquetado no pierde ni reordena bloques
+    assert re.findall(r"bloque\d+", "".join(chunk["content"] for chunk in chunks)) == \
+        [f"bloque{i}" for i in range(10) for _ in range(4)]
+
+
+def test_budget_is_measured_in_utf8_bytes():
+    chunker = create_content_chunker("text", max_chunk_bytes=100)
+    # Cada párrafo ocupa 21 caracteres pero 41 bytes: en caracteres cabrían los tres en un chunk
+    chunks = chunker.chunk(_paragraph(2, "ññññññññññ") * 3)
+
+    assert len(chunks) == 2
+    assert all(len(chunk["content"].encode("utf-8")) <= 100 for chunk in chunks)
+
+
+def test_each_heading_starts_a_new_chunk():
+    chunker = create_content_chunker("text", max_chunk_bytes=6000)
+    html = "<p>Introducción</p><h2>Instalación rápida</h2><p>Pasos</p><h3>Errores comunes</h3><p>Lista</p>"
+
+    chunks = chunker.chunk(html)
+
+    assert [(chunk["chunk_id"], chunk["heading"]) for chunk in chunks] == [
+        (FIRST_SECTION_SLUG, ""),
+        ("instalacion-rapida", "Instalación rápida"),
+        ("errores-comunes", "Errores comunes"),
+    ]
+    assert chunks[1]["content"] == "Instalación rápida\nPasos"
+
+
+def test_repeated_headings_get_an_ordinal():
+    chunker = create_content_chunker("markdown", max_chunk_bytes=6000)
+
+    chunks = chunker.chunk("<h2>FAQ</h2><p>a</p><h2>FAQ</h2><p>b</p><h2>¿FAQ?</h2><p>c</p>")
+
+    assert _ids(chunks) == ["faq", "faq-2", "faq-3"]
+
+
+def test_editing_a_section_keeps_the_other_chunks_identical():
+    chunker = create_content_chunker("text", max_chunk_bytes=6000)
+    before = chunker.chunk("<h2>Uno</h2><p>a</p><h2>Dos</h2><p>b</p><h2>Tres</h2><p>c</p>")
+    after = chunker.chunk("<h2>Uno</h2><p>a</p><h2>Dos</h2><p>b editado</p><h2>Tres</h2><p>c</p>")
+
+    assert _ids(before) == _ids(after)
+    assert [b == a for b, a in zip(before, after)] == [True, False, True]
+
+
+def test_heading_slug_is_ascii_and_truncated():
+    chunker = create_content_chunker("text", max_chunk_bytes=6000)
+
+    (chunk,) = chunker.chunk("<h1>" + "Configuración " * 10 + "</h1><p>x</p>")
+
+    assert chunk["chunk_id"] == "configuracion-configuracion-configuracion-config"
+    assert len(chunk["chunk_id"]) <= 48
+
+
+def test_heading_without_slug_characters_uses_the_first_section_id():
+    chunker = create_content_chunker("text", max_chunk_bytes=6000)
+
+    chunks = chunker.chunk("<p>antes</p><h2>???</h2><p>después</p>")
+
+    assert _ids(chunks) == [FIRST_SECTION_SLUG, f"{FIRST_SECTION_SLUG}-2"]
+
+
+@pytest.mark.parametrize("html", ["", "<ac:structured-macro ac:name=\"toc\"/>"])
+def test_page_without_content_keeps_one_empty_chunk(html):
+    chunker = create_content_chunker("text", max_chunk_bytes=6000)
+
+    assert chunker.chunk(html) == [{"chunk_id": FIRST_SECTION_SLUG, "heading": "", "content": ""}]
+
+
+@pytest.mark.parametrize("mode", ["text", "markdown"])
+def test_oversized_block_is_split_by_words(mode):
+    chunker = create_content_chunker(mode, max_chunk_bytes=200)
+
+    chunks = chunker.chunk("<h2>Largo</h2>" + _paragraph(60) + "<p>fin</p>")
+
+    assert _ids(chunks)[0] == "largo"
+    assert all(len(chunk["content"].encode("utf-8")) <= 200 for chunk in chunks)
+    # Se corta entre palabras, sin partir ninguna
+    words = [word for chunk in chunks for word in chunk["content"].split() if word.strip("#")]
+    assert words == ["Largo"] + ["palabra"] * 60 + ["fin"]
+
+
+def test_oversized_block_is_kept_whole_in_html_mode():
+    chunker = create_content_chunker("off", max_chunk_bytes=200)
+    paragraph = _paragraph(60)
+
+    chunks = chunker.chunk("<h2>Largo</h2>" + paragraph + "<p>fin</p>")
+
+    # En HTML no se corta un bloque para no dejar etiquetas abiertas
+    assert [chunk["content"] for chunk in chunks] == ["<h2>Largo</h2>", paragraph, "<p>fin</p>"]
+    assert _ids(chunks) == ["largo", "largo-2", "largo-3"]
+
+
+def test_single_word_longer_than_the_budget_is_emitted_alone():
+    chunker = create_content_chunker("text", max_chunk_bytes=20)
+
+    chunks = chunker.chunk("<p>corta " + "x" * 50 + " corta</p>")
+
+    assert [chunk["content"] for chunk in chunks] == ["corta", "x" * 50, "corta"]
+
+
+def test_chunk_sidecars_are_named_after_the_page_and_chunk():
+    chunker = create_content_chunker("text", max_chunk_bytes=6000)
+    document_data = {"title": "Manual", "page_version_number": 7,
+                     "chunks": chunker.chunk("<p>Intro</p><h2>Instalación</h2><p>Pasos</p>")}
+    document_metadata = {"metadataAttributes": {"title": "Manual", "space": "KB"}}
+
+    objects = ExtractDocumentUseCase._ground_truth_objects("123", document_data, document_metadata)
+
+    assert list(objects) == ["123.chunk-inicio.html", "123.chunk-inicio.metadata.html",
+                             "123.chunk-instalacion.html", "123.chunk-instalacion.metadata.html"]
+    assert objects["123.chunk-instalacion.html"] == {
+        "title": "Manual", "chunk_id": "instalacion", "chunk_heading": "Instalación",
+        "content": "Instalación\nPasos",
+    }
+    assert objects["123.chunk-instalacion.metadata.html"] == {
+        "metadataAttributes": {"title": "Manual", "space": "KB", "page_id": "123",
+                               "chunk_id": "instalacion", "chunk_heading": "Instalación"},
+    }
+
+
+def test_pages_without_chunks_keep_the_full_page_objects():
+    objects = ExtractDocumentUseCase._ground_truth_objects("123", {"content": "x"}, {"metadataAttributes": {}})
+
+    assert list(objects) == ["123.html", "123.metadata.html"]
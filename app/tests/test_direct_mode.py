@@ -0,0 +1,145 @@
+import json
+import time
+from pathlib import Path
+
+import boto3
+import pytest
+
+from app.src.application.usecases.etl_extract_use_case import ExtractDocumentUseCase
+from app.src.application.usecases.etl_process_use_case import ProcessUseCase
+from app.src.domain.model.document_event import DocumentEvent, DocumentEventType
+from app.src.infraestructure.adapters.repositories.s3_repository import S3RepositoryAdapter
+from app.src.infraestructure.adapters.transformer.extract_page_confluence_adapter import ExtractPageConfluenceAdapter
+from app.src.infraestructure.adapters.transformer.html_parser_backends import create_html_parser_backend
+
+PAGES = json.loads((Path(__file__).parent / "fixtures" / "confluence_pages.json").read_text(encoding="utf-8"))
+BUCKET = "etl-test"
+# Latencia simulada por llamada a S3 en el benchmark
+S3_LATENCY_SECONDS = 0.03
+
+
+class _SlowZone:
+    """Envuelve un LandingZonePort añadiendo latencia fija por llamada y contándolas."""
+
+    def __init__(self, zone, latency=0.0):
+        self.zone = zone
+        self.latency = latency
+        self.calls = {"save": 0, "save_many": 0, "get_document": 0}
+
+    def _call(self, name, *args, **kwargs):
+        self.calls[name] += 1
+        time.sleep(self.latency)
+        return getattr(self.zone, name)(*args, **kwargs)
+
+    def save(self, *args, **kwargs):
+        return self._call("save", *args, **kwargs)
+
+    def save_many(self, *args, **kwargs):
+        return self._call("save_many", *args, **kwargs)
+
+    def get_document(self, *args, **kwargs):
+        return self._call("get_document", *args, **kwargs)
+
+
+@pytest.fixture
+def s3(aws):
+    client = boto3.client("s3", region_name="us-east-1")
+    client.create_bucket(Bucket=BUCKET)
+    yield client
+
+
+class _RecordingQueue:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, changes):
+        self.published += changes
+
+    def requeue(self, changes, delay_seconds):
+        raise AssertionError("requeue")
+
+
+def _pipeline(prefix, latency=0.0, direct=False):
+    landing = _SlowZone(S3RepositoryAdapter(BUCKET, f"{prefix}/landing", "us-east-1"), latency)
+    ground_truth = _SlowZone(S3RepositoryAdapter(BUCKET, f"{prefix}/ground", "us-east-1", skip_unchanged=True),
+                             latency)
+    extract = ExtractDocumentUseCase(landing, ExtractPageConfluenceAdapter(create_html_parser_backend("html.parser")),
+                                     ground_truth)
+    audit = _SlowZone(S3RepositoryAdapter(BUCKET, f"{prefix}/audit", "us-east-1"), latency) if direct else None
+    process = ProcessUseCase(None, landing, None, direct_extract=extract if direct else None,
+                             audit_zone=audit, pending_changes=_RecordingQueue() if direct else None)
+    return process, extract, landing, ground_truth
+
+
+def _run_workflow(process, extract, page):
+    # Camino por workflow: process escribe landing y el extract vuelve a leer el mismo objeto
+    event = DocumentEvent(page["id"], DocumentEventType.UPDATED)
+    result = process.process_page(event, page)
+    landing_uri = f"s3://{BUCKET}/{process.landing_zone.zone.path}/{result.document_uri}"
+    extract.extract_document(DocumentEvent(page["id"], DocumentEventType.UPDATED, landing_uri))
+
+
+def _run_direct(process, page):
+    process.process_page(DocumentEvent(page["id"], DocumentEventType.UPDATED), page)
+
+
+def _objects(s3, prefix):
+    keys = [item["Key"] for item in s3.list_objects_v2(Bucket=BUCKET, Prefix=prefix).get("Contents", [])]
+    return {key[len(prefix):]: s3.get_object(Bucket=BUCKET, Key=key)["Body"].read() for key in keys}
+
+
+def test_direct_mode_writes_the_same_ground_truth_without_reading_landing(s3):
+    workflow = _pipeline("workflow")
+    direct = _pipeline("direct", direct=True)
+
+    for page in PAGES[:10]:
+        _run_workflow(*workflow[:2], page)
+        _run_direct(direct[0], page)
+
+    assert _objects(s3, "direct/ground/") == _objects(s3, "workflow/ground/")
+    # La copia de auditoría se conserva fuera de landing: no dispara el workflow de extracción
+    assert len(_objects(s3, "direct/audit/")) == 10
+    assert _objects(s3, "direct/landing/") == {}
+    assert direct[2].calls == {"save": 0, "save_many": 0, "get_document": 0}
+    assert workflow[2].calls["get_document"] == 10
+
+
+def test_direct_mode_publishes_only_changed_pages_to_the_ingestion_queue(s3):
+    process = _pipeline("direct", direct=True)[0]
+    pages = PAGES[:3]
+
+    results = [process.process_page(DocumentEvent(page["id"], DocumentEventType.UPDATED), page) for page in pages]
+
+    assert [result.skipped for result in results] == [False] * 3
+    assert process.pending_changes.published == [
+        {"document_id": page["id"], "event_type": "updated", "data_object_key": f"{page['id']}.html"}
+        for page in pages
+    ]
+    # Sin manifiesto la página vuelve a procesarse, pero ground truth no cambia: no se publica de nuevo
+    repeated = process.process_page(DocumentEvent(pages[0]["id"], DocumentEventType.UPDATED), pages[0])
+
+    assert repeated.skipped
+    assert len(process.pending_changes.published) == 3
+    assert process.skip_counts() == (4, 1)
+
+
+@pytest.mark.benchmark
+def test_benchmark_direct_mode_saves_the_landing_round_trip(s3):
+    pages = PAGES[:10]
+    workflow = _pipeline("workflow", latency=S3_LATENCY_SECONDS)
+    direct = _pipeline("direct", latency=S3_LATENCY_SECONDS, direct=True)
+
+    started = time.perf_counter()
+    for page in pages:
+        _run_workflow(*workflow[:2], page)
+    workflow_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for page in pages:
+        _run_direct(direct[0], page)
+    direct_seconds = time.perf_counter() - started
+
+    # Por página, el workflow suma PUT landing + GET landing + PUT ground truth; el modo directo
+    # solapa el PUT de auditoría con la extracción
+    print(f"\nworkflow: {workflow_seconds * 1000 / len(pages):.1f} ms/página, "
+          f"directo: {direct_seconds * 1000 / len(pages):.1f} ms/página")
@@ -0,0 +1,107 @@
+import os
+
+import boto3
+import pytest
+
+from app.src.application.usecases import etl_extract_use_case
+from app.src.application.usecases.etl_extract_use_case import ExtractDocumentUseCase
+from app.src.domain.model.document_event import DocumentEvent, DocumentEventType
+from app.src.infraestructure.adapters.repositories.object_codecs import create_object_codec
+from app.src.infraestructure.adapters.repositories.s3_repository import S3RepositoryAdapter
+
+BUCKET = "ground-test"
+PATH = "ground"
+
+
+@pytest.fixture
+def s3(aws):
+    client = boto3.client("s3", region_name="us-east-1")
+    client.create_bucket(Bucket=BUCKET)
+    yield client
+
+
+class _Landing:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def get_document(self, document_uri):
+        if document_uri not in self.documents:
+            raise ValueError(f"No existe {document_uri}")
+        return self.documents[document_uri]
+
+
+class _PidExtractor:
+    """Registra el proceso que parseó cada página; debe ser serializable para el pool."""
+
+    def extract_data(self, document_object):
+        if document_object.get("broken"):
+            raise ValueError(f"Página {document_object['id']} inválida")
+        return ({"page_id": document_object["id"], "parsed_by": os.getpid()},
+                {"metadataAttributes": {"page_id": document_object["id"]}})
+
+
+def _events(*page_ids):
+    return [DocumentEvent(page_id, DocumentEventType.UPDATED, f"s3://landing/{page_id}.json") for page_id in page_ids]
+
+
+def _landing(*page_ids, broken=()):
+    return _Landing({f"s3://landing/{page_id}.json": {"id": page_id, "broken": page_id in broken}
+                     for page_id in page_ids})
+
+
+def _use_case(landing, parse_workers):
+    ground_truth = S3RepositoryAdapter(BUCKET, PATH, "us-east-1", codec=create_object_codec("identity"))
+    return ExtractDocumentUseCase(landing, _PidExtractor(), ground_truth, io_workers=4, parse_workers=parse_workers)
+
+
+def _parsed_by(use_case, page_id):
+    return use_case.ground_truth_zone.get_document(f"s3://{BUCKET}/{PATH}/{page_id}.html")["parsed_by"]
+
+
+def test_pages_are_parsed_in_a_process_pool(s3):
+    use_case = _use_case(_landing("1", "2", "3"), parse_workers=2)
+
+    results = use_case.extract_documents(_events("1", "2", "3"))
+
+    assert [(result.document_id, result.status) for result in results] == [("1", "OK"), ("2", "OK"), ("3", "OK")]
+    assert all(_parsed_by(use_case, page_id) != os.getpid() for page_id in ("1", "2", "3"))
+
+
+def test_a_failing_page_in_the_pool_does_not_stop_the_batch(s3):
+    use_case = _use_case(_landing("1", "2", "3", broken={"2"}), parse_workers=2)
+
+    results = use_case.extract_documents(_events("1", "2", "4", "3"))
+
+    assert [(result.document_id, result.status) for result in results] == [
+        ("1", "OK"), ("2", "ERROR"), ("4", "ERROR"), ("3", "OK")]
+    assert results[1].error == "Página 2 inválida"
+    assert "No existe" in results[2].error
+    assert results[1].data_object_key == "2.html"
+
+
+@pytest.mark.parametrize("error", [OSError(38, "Function not implemented"), NotImplementedError()])
+def test_unavailable_process_pool_falls_back_to_serial_parsing(s3, monkeypatch, error):
+    def unavailable_pool(max_workers):
+        # Lambda no expone /dev/shm: el pool falla al crear sus semáforos
+        raise error
+
+    monkeypatch.setattr(etl_extract_use_case, "ProcessPoolExecutor", unavailable_pool)
+    use_case = _use_case(_landing("1", "2", broken={"2"}), parse_workers=4)
+
+    results = use_case.extract_documents(_events("1", "2"))
+
+    assert [(result.document_id, result.status) for result in results] == [("1", "OK"), ("2", "ERROR")]
+    assert results[1].error == "Página 2 inválida"
+    assert _parsed_by(use_case, "1") == os.getpid()
+
+
+@pytest.mark.parametrize("parse_workers, page_ids", [(0, ("1", "2")), (1, ("1", "2")), (4, ("1",))])
+def test_process_pool_is_not_created_when_it_cannot_help(s3, monkeypatch, parse_workers, page_ids):
+    monkeypatch.setattr(etl_extract_use_case, "ProcessPoolExecutor",
+                        lambda max_workers: pytest.fail("ProcessPoolExecutor"))
+    use_case = _use_case(_landing(*page_ids), parse_workers=parse_workers)
+
+    results = use_case.extract_documents(_events(*page_ids))
+
+    assert all(result.status == "OK" for result in results)
+    assert all(_parsed_by(use_case, page_id) == os.getpid() for page_id in page_ids)
@@ -0,0 +1,36 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.src.infraestructure.adapters.transformer.extract_page_confluence_adapter import ExtractPageConfluenceAdapter
+from app.src.infraestructure.adapters.transformer.html_parser_backends import create_html_parser_backend
+
+FIXTURES = Path(__file__).parent / "fixtures"
+# Páginas en storage format y la salida del extractor original (parseos múltiples con html.parser)
+PAGES = json.loads((FIXTURES / "confluence_pages.json").read_text(encoding="utf-8"))
+EXPECTED = json.loads((FIXTURES / "confluence_pages_expected.json").read_text(encoding="utf-8"))
+PAGE_IDS = [page["id"] for page in PAGES]
+
+
+@pytest.mark.parametrize("early_exit_header", [True, False], ids=["early-exit", "full-parse"])
+@pytest.mark.parametrize("index", range(len(PAGES)), ids=PAGE_IDS)
+def test_single_parse_matches_original_extractor(index, early_exit_header):
+    adapter = ExtractPageConfluenceAdapter(create_html_parser_backend("html.parser"),
+                                           early_exit_header=early_exit_header)
+
+    assert list(adapter.extract_data(PAGES[index])) == EXPECTED[index]
+
+
+@pytest.mark.parametrize("index", range(len(PAGES)), ids=PAGE_IDS)
+def test_header_scan_finds_the_same_table_as_the_full_parse(index):
+    adapter = ExtractPageConfluenceAdapter(create_html_parser_backend("html.parser"))
+    body = PAGES[index]["body"]["storage"]["value"]
+
+    scanned = adapter.scan_cabecera_table_html(body)
+    cabecera_html_str, _ = adapter.split_html_content(body)
+
+    if scanned is None:
+        # Tabla sin cierre: el extractor recurre al parseo completo
+        return
+    assert str(adapter.parser_backend.parse(scanned)) == cabecera_html_str
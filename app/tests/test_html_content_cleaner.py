@@ -0,0 +1,81 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.src.infraestructure.adapters.transformer.html_content_cleaner import CONTENT_MODES, HtmlContentCleaner
+
+PAGES = json.loads((Path(__file__).parent / "fixtures" / "confluence_pages.json").read_text(encoding="utf-8"))
+
+LINK = ('<p>Ver <ac:link><ri:page ri:content-title="Otra"/>'
+        '<ac:plain-text-link-body><![CDATA[ver otra]]></ac:plain-text-link-body></ac:link> fin</p>')
+NESTED_LIST = "<ul><li>a<ul><li>b</li></ul></li><li>c</li></ul>"
+SPACED_BLOCKS = ("<h1>T</h1>\n  \n<p>uno</p>\n   \n<p> </p><div>\n \n</div><ul><li>x</li></ul>\n\n"
+                 "<table><tbody><tr><td>a</td><td>b</td></tr></tbody></table>\n \n<p>dos</p>")
+INLINE_SPACES = "<p><b>a</b> <i>b</i> a<b> </b>c</p>"
+CELL_BLOCKS = "<table><tr><td><p>z</p><p>w</p></td><td>1</td></tr></table>"
+
+
+@pytest.mark.parametrize("mode, expected", [
+    ("html", "<p>Ver ver otra fin</p>"),
+    ("text", "Ver ver otra fin"),
+    ("markdown", "Ver ver otra fin"),
+])
+def test_link_body_cdata_becomes_plain_text(mode, expected):
+    assert HtmlContentCleaner(mode).clean(LINK) == expected
+
+
+def test_html_escapes_cdata_text():
+    cleaned = HtmlContentCleaner("html").clean(
+        "<p><ac:link><ac:plain-text-link-body><![CDATA[a < b]]></ac:plain-text-link-body></ac:link></p>")
+
+    assert cleaned == "<p>a &lt; b</p>"
+
+
+@pytest.mark.parametrize("mode, expected", [
+    ("html", NESTED_LIST),
+    ("text", "a\nb\nc"),
+    ("markdown", "- a\n  - b\n- c"),
+])
+def test_nested_list_items_stay_separate(mode, expected):
+    assert HtmlContentCleaner(mode).clean(NESTED_LIST) == expected
+
+
+@pytest.mark.parametrize("mode, expected", [
+    ("html", "<h1>T</h1><p>uno</p><ul><li>x</li></ul><table><tr><td>a</td><td>b</td></tr></table><p>dos</p>"),
+    ("text", "T\nuno\nx\na\tb\t\ndos"),
+    ("markdown", "# T\n\nuno\n\n- x\n\n| a | b |\n| --- | --- |\n\ndos"),
+])
+def test_whitespace_between_blocks_is_dropped(mode, expected):
+    assert HtmlContentCleaner(mode).clean(SPACED_BLOCKS) == expected
+
+
+@pytest.mark.parametrize("mode, expected", [
+    ("html", INLINE_SPACES),
+    ("text", "a b a c"),
+    ("markdown", "**a** *b* a c"),
+])
+def test_spaces_between_inline_elements_are_kept(mode, expected):
+    assert HtmlContentCleaner(mode).clean(INLINE_SPACES) == expected
+
+
+@pytest.mark.parametrize("mode, expected", [
+    ("text", "z w\t1"),
+    ("markdown", "| z w | 1 |\n| --- | --- |"),
+])
+def test_blocks_inside_cells_keep_the_row_on_one_line(mode, expected):
+    assert HtmlContentCleaner(mode).clean(CELL_BLOCKS) == expected
+
+
+@pytest.mark.parametrize("mode", CONTENT_MODES)
+@pytest.mark.parametrize("page", PAGES, ids=[page["id"] for page in PAGES])
+def test_corpus_output_has_no_cdata_or_blank_whitespace_lines(mode, page):
+    cleaner = HtmlContentCleaner(mode)
+    body = page["body"]["storage"]["value"]
+
+    cleaned = cleaner.clean(body)
+
+    assert "CDATA" not in cleaned
+    assert all(line.strip() or not line for line in cleaned.split("\n"))
+    sections = cleaner.sections(body)
+    assert cleaner.finish("".join(block for section in sections for block in section.blocks)) == cleaned
@@ -0,0 +1,173 @@
+import json
+import time
+import types
+
+import pytest
+from botocore.stub import Stubber
+
+from app.src.application.usecases.ingestion_coordinator import IngestionCoordinator
+from app.src.application.usecases.ingestion_job_notifier import IngestionJobNotifier
+from app.src.application.usecases.ingestion_job_watcher import IngestionJobWatcher
+from app.src.infraestructure.adapters.etls.in_memory_ingestion_adapter import InMemoryIngestionAdapter
+from app.src.infraestructure.adapters.etls.step_function_callback import StepFunctionCallbackAdapter
+from app.src.infraestructure.entrypoints.etl_ingestion import handler as ingestion_handler
+
+
+class _RecordingCallback:
+    def __init__(self):
+        self.successes = []
+        self.failures = []
+
+    def notify_success(self, task_token, output):
+        self.successes.append((task_token, output))
+
+    def notify_failure(self, task_token, error, cause):
+        self.failures.append((task_token, error))
+
+
+class _RecordingQueue:
+    def __init__(self):
+        self.calls = []
+
+    def requeue(self, changes, delay_seconds):
+        self.calls.append((changes, delay_seconds))
+
+
+class _StatusIngestion:
+    def __init__(self, status):
+        self.status = status
+
+    def get_ingestion_job(self, knowledge_base_id, data_source_id, ingestion_job_id):
+        return {"ingestion_job_id": ingestion_job_id, "status": self.status}
+
+
+def _fast_watcher(ingestion):
+    return IngestionJobWatcher(ingestion, "kb", "ds", min_interval=0.01, max_interval=0.01,
+                               initial_expected_duration=0.01)
+
+
+@pytest.fixture
+def ingestion(monkeypatch):
+    adapter = InMemoryIngestionAdapter(job_duration_seconds=0.05)
+    coordinator = IngestionCoordinator(adapter, "kb", "ds", window_seconds=30, clock=time.time)
+    callback = _RecordingCallback()
+    queue = _RecordingQueue()
+    config = {"aws_region_name": "us-east-1", "knowledge_base_id": "kb", "data_source_id": "ds",
+              "ingestion_window_seconds": "30", "ingestion_max_batch_size": "100",
+              "ingestion_queue_url": "https://sqs.test/ingestion", "ingestion_poll_min_seconds": "1",
+              "ingestion_poll_max_seconds": "30", "ingestion_expected_duration_seconds": "5",
+              "ingestion_poll_max_errors": "3"}
+    monkeypatch.setattr(ingestion_handler, "_config_resource", lambda: config)
+    monkeypatch.setattr(ingestion_handler._coordinator_graph, "get", lambda config_resource: coordinator)
+    monkeypatch.setattr(ingestion_handler._notifier_graph, "get",
+                        lambda config_resource: IngestionJobNotifier(_fast_watcher(adapter), callback))
+    monkeypatch.setattr(ingestion_handler._queue_graph, "get", lambda config_resource: queue)
+    return types.SimpleNamespace(adapter=adapter, callback=callback, queue=queue)
+
+
+def _record(message_id, body, sent_seconds_ago=40):
+    sent_timestamp = int((time.time() - sent_seconds_ago) * 1000)
+    return {"messageId": message_id, "body": json.dumps(body), "attributes": {"SentTimestamp": str(sent_timestamp)}}
+
+
+def _context():
+    return types.SimpleNamespace(aws_request_id="req", get_remaining_time_in_millis=lambda: 60000)
+
+
+def test_one_job_notifies_every_waiting_execution(ingestion):
+    records = [_record("m1", {"document_id": "1", "event_type": "updated", "task_token": "t1"}),
+               _record("m2", {"document_id": "1", "event_type": "updated", "task_token": "t2"}),
+               _record("m3", {"document_id": "2", "event_type": "deleted", "task_token": "t3"})]
+
+    result = ingestion_handler.handler({"Records": records}, _context())
+
+    assert ingestion.adapter.start_calls == 1
+    assert result["ingestionJobs"] == [{"ingestion_job_id": "job-1", "status": "COMPLETE", "documents": 2}]
+    assert sorted(token for token, _ in ingestion.callback.successes) == ["t1", "t2", "t3"]
+    assert ingestion.callback.successes[0][1] == {"ingestion_job_id": "job-1", "status": "COMPLETE"}
+    assert result["batchItemFailures"] == []
+
+
+def test_requeued_changes_keep_the_task_tokens_of_every_message(ingestion):
+    records = [_record("m1", {"document_id": "1", "task_token": "t1"}, sent_seconds_ago=5),
+               _record("m2", {"document_id": "1", "task_token": "t2"}, sent_seconds_ago=1)]
+
+    ingestion_handler.handler({"Records": records}, _context())
+
+    ((changes, _),) = ingestion.queue.calls
+    assert [change["task_tokens"] for change in changes] == [["t1", "t2"]]
+    assert ingestion.callback.successes == []
+
+
+def test_running_job_is_handed_off_to_a_delayed_watch_message(ingestion, monkeypatch):
+    monkeypatch.setattr(ingestion_handler, "INGESTION_CALLBACK_WAIT_SECONDS", 0)
+    ingestion.adapter.job_duration_seconds = 0.2
+
+    result = ingestion_handler.handler({"Records": [_record("m1", {"document_id": "1", "task_token": "t1"})]},
+                                       _context())
+
+    ((watches, delay_seconds),) = ingestion.queue.calls
+    assert result["ingestionJobs"][0]["status"] == "STARTING"
+    assert delay_seconds == 30
+    assert [(watch["ingestion_job_id"], watch["task_tokens"]) for watch in watches] == [("job-1", ["t1"])]
+    assert watches[0]["watch_until"] > time.time()
+    assert ingestion.callback.successes == []
+
+    # La reentrega del seguimiento retoma la espera sin lanzar otro job
+    monkeypatch.setattr(ingestion_handler, "INGESTION_CALLBACK_WAIT_SECONDS", 5)
+    ingestion_handler.handler({"Records": [_record("m2", watches[0], sent_seconds_ago=0)]}, _context())
+
+    assert ingestion.adapter.start_calls == 1
+    assert ingestion.callback.successes == [("t1", {"ingestion_job_id": "job-1", "status": "COMPLETE"})]
+
+
+def test_watch_past_its_deadline_fails_the_executions(ingestion):
+    ingestion.adapter.start_ingestion_job("kb", "ds")
+    watch = {"ingestion_job_id": "job-1", "task_tokens": ["t1"], "watch_until": time.time() - 1}
+
+    ingestion_handler.handler({"Records": [_record("m1", watch)]}, _context())
+
+    assert ingestion.callback.failures == [("t1", "IngestionJobTimeout")]
+    assert ingestion.queue.calls == []
+    assert ingestion.adapter.get_calls == 0
+
+
+def test_failed_watch_requeue_retries_the_messages_that_carried_the_tokens(ingestion, monkeypatch):
+    monkeypatch.setattr(ingestion_handler, "INGESTION_CALLBACK_WAIT_SECONDS", 0)
+    ingestion.adapter.job_duration_seconds = 60
+    monkeypatch.setattr(ingestion.queue, "requeue", lambda changes, delay_seconds: pytest.fail("sin cola"))
+    config = dict(ingestion_handler._config_resource(), ingestion_queue_url="")
+    monkeypatch.setattr(ingestion_handler, "_config_resource", lambda: config)
+    records = [_record("m1", {"document_id": "1", "task_token": "t1"}), _record("m2", {"document_id": "2"})]
+
+    result = ingestion_handler.handler({"Records": records}, _context())
+
+    assert result["batchItemFailures"] == [{"itemIdentifier": "m1"}]
+
+
+def test_changes_without_task_token_are_not_watched(ingestion):
+    result = ingestion_handler.handler({"Records": [_record("m1", {"document_id": "1"})]}, _context())
+
+    assert result["ingestionJobs"][0]["status"] == "STARTING"
+    assert ingestion.adapter.get_calls == 0
+
+
+@pytest.mark.parametrize("status", ["FAILED", "STOPPED"])
+def test_unsuccessful_jobs_fail_the_executions(status):
+    callback = _RecordingCallback()
+    notifier = IngestionJobNotifier(_fast_watcher(_StatusIngestion(status)), callback)
+
+    assert notifier.notify({"job-1": ["t1", "t2"]}, timeout=5) == {"job-1": status}
+    assert callback.failures == [("t1", "IngestionJobFailed"), ("t2", "IngestionJobFailed")]
+    assert callback.successes == []
+
+
+def test_expired_task_tokens_are_ignored(aws):
+    adapter = StepFunctionCallbackAdapter("us-east-1")
+    with Stubber(adapter.step_functions_client) as stubber:
+        stubber.add_client_error("send_task_success", service_error_code="TaskTimedOut")
+        stubber.add_client_error("send_task_failure", service_error_code="ServiceUnavailable")
+
+        adapter.notify_success("t1", {"status": "COMPLETE"})
+        with pytest.raises(ValueError, match="ServiceUnavailable"):
+            adapter.notify_failure("t2", "IngestionJobFailed", "x" * 40000)
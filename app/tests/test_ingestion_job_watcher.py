@@ -0,0 +1,115 @@
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import pytest
+
+from app.src.application.usecases.ingestion_job_watcher import IngestionJobWatcher
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _FlakyIngestion:
+    """Falla las primeras `failures` consultas y después responde con `status`."""
+
+    def __init__(self, failures, status="COMPLETE"):
+        self.failures = failures
+        self.status = status
+        self.get_calls = 0
+
+    def get_ingestion_job(self, knowledge_base_id, data_source_id, ingestion_job_id):
+        self.get_calls += 1
+        if self.get_calls <= self.failures:
+            raise ValueError("ThrottlingException")
+        return {"ingestion_job_id": ingestion_job_id, "status": self.status}
+
+
+def _watcher(ingestion, clock, **kwargs):
+    return IngestionJobWatcher(ingestion, "kb", "ds", min_interval=1, max_interval=30, clock=clock, **kwargs)
+
+
+def _poll_until_idle(watcher, clock):
+    while True:
+        delay = watcher.poll_once()
+        if delay is None:
+            return
+        clock.now += delay
+
+
+def test_transient_errors_are_retried_with_backoff():
+    clock = _Clock()
+    ingestion = _FlakyIngestion(failures=2)
+    watcher = _watcher(ingestion, clock)
+    future = watcher.subscribe("job-1")
+
+    _poll_until_idle(watcher, clock)
+
+    assert future.result(timeout=0)["status"] == "COMPLETE"
+    assert ingestion.get_calls == 3
+    # Primera consulta al 80% de 5 s y reintentos a 2 s y 4 s
+    assert clock.now == pytest.approx(4 + 2 + 4)
+
+
+def test_job_fails_after_max_consecutive_errors():
+    clock = _Clock()
+    ingestion = _FlakyIngestion(failures=10)
+    watcher = _watcher(ingestion, clock, max_consecutive_errors=3)
+    future = watcher.subscribe("job-1")
+
+    _poll_until_idle(watcher, clock)
+
+    with pytest.raises(ValueError):
+        future.result(timeout=0)
+    assert ingestion.get_calls == 3
+    assert watcher.active_jobs() == 0
+
+
+def test_successful_poll_resets_the_error_count():
+    clock = _Clock()
+    ingestion = _FlakyIngestion(failures=0, status="IN_PROGRESS")
+    watcher = _watcher(ingestion, clock, max_consecutive_errors=2)
+    future = watcher.subscribe("job-1")
+    clock.now += watcher.poll_once()
+
+    for _ in range(3):
+        ingestion.failures = ingestion.get_calls + 1
+        clock.now += watcher.poll_once()
+        clock.now += watcher.poll_once()
+
+    assert not future.done()
+    assert watcher.active_jobs() == 1
+
+
+def test_timed_out_waiter_is_unsubscribed():
+    ingestion = _FlakyIngestion(failures=0, status="IN_PROGRESS")
+    watcher = IngestionJobWatcher(ingestion, "kb", "ds", min_interval=0.01, max_interval=0.01,
+                                  initial_expected_duration=0.01)
+
+    with pytest.raises(FutureTimeoutError):
+        watcher.wait("job-1", timeout=0.05)
+
+    assert watcher.active_jobs() == 0
+
+
+def test_unsubscribe_keeps_the_job_while_other_waiters_remain():
+    watcher = _watcher(_FlakyIngestion(failures=0), _Clock())
+    first = watcher.subscribe("job-1")
+    second = watcher.subscribe("job-1")
+
+    watcher.unsubscribe("job-1", first)
+
+    assert watcher.active_jobs() == 1
+    watcher.unsubscribe("job-1", second)
+    assert watcher.active_jobs() == 0
+
+
+def test_first_poll_is_scheduled_from_the_initial_expected_duration():
+    clock = _Clock()
+    watcher = _watcher(_FlakyIngestion(failures=0), clock, initial_expected_duration=2)
+    watcher.subscribe("job-1")
+
+    assert watcher.poll_once() == pytest.approx(1.6)
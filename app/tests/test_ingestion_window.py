@@ -0,0 +1,151 @@
+import json
+import time
+import types
+
+import boto3
+import pytest
+
+from app.src.application.usecases.ingestion_coordinator import IngestionCoordinator
+from app.src.infraestructure.adapters.etls.in_memory_ingestion_adapter import InMemoryIngestionAdapter
+from app.src.infraestructure.adapters.etls.sqs_pending_change_queue import SqsPendingChangeQueueAdapter
+from app.src.infraestructure.entrypoints.etl_ingestion import handler as ingestion_handler
+
+
+class _Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_window_counts_from_the_first_reception():
+    clock = _Clock()
+    coordinator = IngestionCoordinator(InMemoryIngestionAdapter(clock=clock), "kb", "ds",
+                                       window_seconds=30, clock=clock)
+
+    coordinator.submit({"document_id": "1"}, received_at=clock.now - 20)
+
+    assert not coordinator.is_due()
+    assert coordinator.seconds_until_due() == 10
+    clock.now += 10
+    assert coordinator.flush_if_due().document_ids == ["1"]
+
+
+def test_release_pending_changes_returns_the_changes_and_resets_the_window():
+    clock = _Clock()
+    coordinator = IngestionCoordinator(InMemoryIngestionAdapter(clock=clock), "kb", "ds", clock=clock)
+    coordinator.submit({"document_id": "1", "event_type": "updated"})
+
+    assert coordinator.release_pending_changes() == [{"document_id": "1", "event_type": "updated"}]
+    assert coordinator.pending_count() == 0
+    assert coordinator.seconds_until_due() == 0.0
+
+
+@pytest.fixture
+def queue_url(aws):
+    yield boto3.client("sqs", region_name="us-east-1").create_queue(QueueName="ingestion")["QueueUrl"]
+
+
+@pytest.fixture
+def ingestion(monkeypatch, queue_url):
+    adapter = InMemoryIngestionAdapter(job_duration_seconds=60, clock=time.time)
+    coordinator = IngestionCoordinator(adapter, "kb", "ds", window_seconds=30, clock=time.time)
+    config = {"aws_region_name": "us-east-1", "knowledge_base_id": "kb", "data_source_id": "ds",
+              "ingestion_window_seconds": "30", "ingestion_max_batch_size": "100",
+              "ingestion_queue_url": queue_url, "ingestion_poll_min_seconds": "1",
+              "ingestion_poll_max_seconds": "30", "ingestion_expected_duration_seconds": "5",
+              "ingestion_poll_max_errors": "3"}
+    monkeypatch.setattr(ingestion_handler, "_config_resource", lambda: config)
+    monkeypatch.setattr(ingestion_handler._coordinator_graph, "get", lambda config_resource: coordinator)
+    ingestion_handler._queue_graph.invalidate()
+    return adapter
+
+
+def _record(message_id, document_id, sent_seconds_ago):
+    sent_timestamp = int((time.time() - sent_seconds_ago) * 1000)
+    return {"messageId": message_id, "body": json.dumps({"document_id": document_id}),
+            "attributes": {"SentTimestamp": str(sent_timestamp)}}
+
+
+def _queued_messages(queue_url):
+    response = boto3.client("sqs", region_name="us-east-1").receive_message(
+        QueueUrl=queue_url, MaxNumberOfMessages=10, WaitTimeSeconds=0, AttributeNames=["All"])
+    return response.get("Messages", [])
+
+
+def _context():
+    return types.SimpleNamespace(aws_request_id="req", get_remaining_time_in_millis=lambda: 60000)
+
+
+def test_open_window_is_requeued_with_delay_instead_of_flushed(ingestion, queue_url):
+    result = ingestion_handler.handler({"Records": [_record("m1", "1", 5)]}, _context())
+
+    assert ingestion.start_calls == 0
+    assert result["ingestionJobs"] == []
+    assert result["batchItemFailures"] == []
+    assert result["pending_document_ids"] == ["1"]
+    # El mensaje reencolado queda retrasado hasta que vence la ventana
+    assert _queued_messages(queue_url) == []
+
+
+def test_published_changes_are_delivered_without_delay(queue_url):
+    changes = [{"document_id": str(index), "event_type": "updated"} for index in range(12)]
+
+    SqsPendingChangeQueueAdapter(queue_url, "us-east-1").publish(changes)
+
+    received = _queued_messages(queue_url) + _queued_messages(queue_url)
+    assert sorted((json.loads(message["Body"]) for message in received), key=lambda change: int(change["document_id"])) \
+        == changes
+
+
+class _RecordingQueue:
+    def __init__(self):
+        self.calls = []
+
+    def requeue(self, changes, delay_seconds):
+        self.calls.append((changes, delay_seconds))
+
+
+def test_requeued_change_keeps_its_window_start(ingestion, monkeypatch):
+    queue = _RecordingQueue()
+    monkeypatch.setattr(ingestion_handler._queue_graph, "get", lambda config_resource: queue)
+    first = _record("m1", "1", 20)
+
+    ingestion_handler.handler({"Records": [first]}, _context())
+
+    ((changes, delay_seconds),) = queue.calls
+    assert delay_seconds == 10
+    assert changes == [{"document_id": "1", "window_started_at": int(first["attributes"]["SentTimestamp"]) / 1000}]
+    # Reentrega tras el retardo (se simula desplazando el inicio de ventana 10 s): trae un
+    # SentTimestamp nuevo, pero la ventana sigue contando desde el primer envío
+    redelivered = _record("m2", "1", 0)
+    redelivered["body"] = json.dumps(dict(changes[0], window_started_at=changes[0]["window_started_at"] - 10))
+    result = ingestion_handler.handler({"Records": [redelivered]}, _context())
+    assert [job["documents"] for job in result["ingestionJobs"]] == [1]
+
+
+def test_elapsed_window_starts_a_single_job(ingestion, queue_url):
+    records = [_record("m1", "1", 40), _record("m2", "2", 1)]
+
+    result = ingestion_handler.handler({"Records": records}, _context())
+
+    assert ingestion.start_calls == 1
+    assert [job["documents"] for job in result["ingestionJobs"]] == [2]
+    assert result["pending_document_ids"] == []
+
+
+def test_without_queue_pending_changes_are_reported_as_failures(ingestion, monkeypatch):
+    config = dict(ingestion_handler._config_resource(), ingestion_queue_url="")
+    monkeypatch.setattr(ingestion_handler, "_config_resource", lambda: config)
+
+    result = ingestion_handler.handler({"Records": [_record("m1", "1", 5)]}, _context())
+
+    assert result["batchItemFailures"] == [{"itemIdentifier": "m1"}]
+
+
+def test_direct_invocation_can_force_the_flush(ingestion):
+    result = ingestion_handler.handler({"changes": [{"document_id": "1"}], "flush": True}, _context())
+
+    assert ingestion.start_calls == 1
+    assert [job["documents"] for job in result["ingestionJobs"]] == [1]
@@ -0,0 +1,95 @@
+import json
+import time
+from pathlib import Path
+
+import boto3
+import pytest
+
+from app.src.infraestructure.adapters.repositories.object_codecs import create_object_codec
+from app.src.infraestructure.adapters.repositories.s3_repository import S3RepositoryAdapter
+from app.src.infraestructure.entrypoints.etl_backfill import handler as backfill_handler
+from app.src.infraestructure.entrypoints.etl_process import handler as process_handler
+
+PAGES = json.loads((Path(__file__).parent / "fixtures" / "confluence_pages.json").read_text(encoding="utf-8"))
+BUCKET = "landing-test"
+CODECS = ["identity", "gzip", "zstd"]
+# Ancho de banda S3 de referencia para estimar el tiempo de transferencia
+S3_BYTES_PER_SECOND = 50 * 1024 * 1024
+
+
+@pytest.fixture
+def s3(aws):
+    client = boto3.client("s3", region_name="us-east-1")
+    client.create_bucket(Bucket=BUCKET)
+    yield client
+
+
+def _adapter(codec):
+    return S3RepositoryAdapter(BUCKET, "landing", "us-east-1", codec=create_object_codec(codec))
+
+
+def _space_page():
+    # Página representativa de un espacio grande: el storage format de todo el corpus en un documento
+    body = "".join(page["body"]["storage"]["value"] for page in PAGES)
+    return dict(PAGES[0], body={"storage": {"value": body, "representation": "storage"}})
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_round_trip_sets_content_encoding(s3, codec):
+    adapter = _adapter(codec)
+
+    result = adapter.save("page.json", PAGES[0])
+
+    head = s3.head_object(Bucket=BUCKET, Key="landing/page.json")
+    assert head.get("ContentEncoding") == adapter.codec.content_encoding
+    assert adapter.get_document(result["uri"]) == PAGES[0]
+
+
+@pytest.mark.parametrize("written_with", CODECS)
+@pytest.mark.parametrize("read_with", CODECS)
+def test_reader_follows_the_stored_content_encoding(s3, written_with, read_with):
+    # Objetos ya existentes sin comprimir (o con otro codec) se siguen leyendo
+    uri = _adapter(written_with).save("page.json", PAGES[1])["uri"]
+
+    assert _adapter(read_with).get_document(uri) == PAGES[1]
+
+
+def test_default_landing_codec_is_identity():
+    # Un extract desplegado antes que el codec no sabe leer objetos comprimidos
+    assert process_handler._config_resource()["landing_codec"] == "identity"
+    assert backfill_handler._config_resource()["landing_codec"] == "identity"
+
+
+@pytest.mark.parametrize("codec", ["gzip", "zstd"])
+def test_compression_at_least_halves_the_stored_bytes(s3, codec):
+    page = _space_page()
+    _adapter("identity").save("identity.json", page)
+    _adapter(codec).save(f"{codec}.json", page)
+
+    identity_bytes = s3.head_object(Bucket=BUCKET, Key="landing/identity.json")["ContentLength"]
+    stored = s3.head_object(Bucket=BUCKET, Key=f"landing/{codec}.json")["ContentLength"]
+    # El storage format es muy repetitivo: ambos codecs deben reducir al menos a la mitad los bytes
+    assert stored < identity_bytes / 2
+
+
+@pytest.mark.benchmark
+def test_benchmark_codec_bytes_and_latency(s3):
+    page = _space_page()
+    report = {}
+    for codec in CODECS:
+        adapter = _adapter(codec)
+        started = time.perf_counter()
+        uri = adapter.save(f"{codec}.json", page)["uri"]
+        write_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        assert adapter.get_document(uri) == page
+        read_seconds = time.perf_counter() - started
+        stored = s3.head_object(Bucket=BUCKET, Key=f"landing/{codec}.json")["ContentLength"]
+        report[codec] = (stored, write_seconds, read_seconds)
+
+    identity_bytes = report["identity"][0]
+    print()
+    for codec, (stored, write_seconds, read_seconds) in report.items():
+        print(f"{codec:>8}: {stored / 1024:8.1f} KiB ({stored / identity_bytes:5.1%}), "
+              f"escritura {write_seconds * 1000:6.1f} ms, lectura {read_seconds * 1000:6.1f} ms, "
+              f"transferencia estimada {stored / S3_BYTES_PER_SECOND * 2000:6.1f} ms")
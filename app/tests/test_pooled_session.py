@@ -0,0 +1,131 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+import responses
+
+from app.src.infraestructure.adapters.http.pooled_session import PooledHttpSession
+
+URL = "https://confluence.test/wiki/rest/api/content/1"
+
+
+def _session(**kwargs):
+    sleeps = []
+    session = PooledHttpSession(backoff_base=0.5, backoff_max=20, sleep=sleeps.append, **kwargs)
+    return session, sleeps
+
+
+@responses.activate
+def test_429_waits_the_retry_after_seconds():
+    session, sleeps = _session()
+    responses.add(responses.GET, URL, status=429, headers={"Retry-After": "7"})
+    responses.add(responses.GET, URL, json={"id": "1"})
+
+    assert session.get(URL).json() == {"id": "1"}
+    assert sleeps == [7.0]
+
+
+@responses.activate
+def test_retry_after_as_http_date():
+    session, sleeps = _session()
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=15)
+    responses.add(responses.GET, URL, status=503, headers={"Retry-After": format_datetime(retry_at, usegmt=True)})
+    responses.add(responses.GET, URL, json={"id": "1"})
+
+    session.get(URL)
+
+    assert sleeps == [pytest.approx(15, abs=2)]
+
+
+@responses.activate
+def test_retry_after_is_capped_at_backoff_max():
+    session, sleeps = _session()
+    responses.add(responses.GET, URL, status=429, headers={"Retry-After": "3600"})
+    responses.add(responses.GET, URL, json={"id": "1"})
+
+    session.get(URL)
+
+    assert sleeps == [20]
+
+
+@responses.activate
+def test_exhausted_retries_return_the_last_response():
+    session, sleeps = _session(max_retries=2)
+    responses.add(responses.GET, URL, status=500)
+
+    assert session.get(URL).status_code == 500
+    assert len(responses.calls) == 3
+    # Backoff exponencial con full jitter: 0 <= espera <= base * 2^intento
+    assert [0 <= wait <= 0.5 * 2 ** attempt for attempt, wait in enumerate(sleeps)] == [True, True]
+
+
+@responses.activate
+def test_exhausted_retries_raise_the_connection_error():
+    session, sleeps = _session(max_retries=1)
+    responses.add(responses.GET, URL, body=requests.exceptions.ConnectionError("conexión rechazada"))
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        session.get(URL)
+    assert len(sleeps) == 1
+
+
+@responses.activate
+def test_non_retryable_status_is_returned_immediately():
+    session, sleeps = _session()
+    responses.add(responses.GET, URL, status=404)
+
+    assert session.get(URL).status_code == 404
+    assert sleeps == []
+
+
+@responses.activate
+def test_stats_count_requests_and_retries():
+    session, _ = _session()
+    responses.add(responses.GET, URL, status=429, headers={"Retry-After": "0"})
+    responses.add(responses.GET, URL, status=502)
+    responses.add(responses.GET, URL, json={"id": "1"})
+
+    session.get(URL)
+    session.get(URL)
+
+    stats = session.connection_stats()
+    assert (stats["requests_sent"], stats["retries"]) == (4, 2)
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"id": "1"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/rest/api/content/1"
+    server.shutdown()
+    server.server_close()
+
+
+def test_keep_alive_reuses_the_pooled_connection(local_server):
+    session, _ = _session()
+
+    for _ in range(5):
+        assert session.get(local_server).json() == {"id": "1"}
+
+    assert session.connection_stats() == {"requests_sent": 5, "retries": 0,
+                                          "connections_opened": 1, "connections_reused": 4}
+    session.close()
@@ -0,0 +1,127 @@
+import datetime
+import decimal
+import json
+import logging
+import os
+import sys
+import time
+from logging import LogRecord
+
+import pytest
+from aws_lambda_powertools.logging.formatter import LambdaPowertoolsFormatter
+
+from app.src.shared.logger.powertools_logger import CustomPowertoolsFormatter
+
+
+class _LegacyFormatter(CustomPowertoolsFormatter):
+    """Formatter anterior: serializa con Powertools, relee el JSON y lo vuelve a serializar."""
+
+    def format(self, record: LogRecord) -> str:
+        formatted_log_str = LambdaPowertoolsFormatter.format(self, record)
+
+        try:
+            powertools_data = json.loads(formatted_log_str)
+        except Exception:
+            powertools_data = {}
+
+        custom_event = {
+            "message": powertools_data.get("message", record.getMessage()),
+            "xRayTraceId": powertools_data.get("xray_trace_id"),
+            "timestamp": powertools_data.get("timestamp", datetime.datetime.utcnow().isoformat() + "Z"),
+            "level": powertools_data.get("level", record.levelname.lower()),
+            "env": os.getenv("ENV", "dev"),
+            "serviceVersion": os.getenv("AWS_LAMBDA_FUNCTION_VERSION", "$LATEST"),
+            "service": powertools_data.get("service", self.service),
+            "requestId": powertools_data.get("function_request_id", ""),
+            "functionInfo": {
+                "memoryLimitInMB": powertools_data.get(
+                    "function_memory_size", os.getenv("AWS_LAMBDA_FUNCTION_MEMORY_SIZE", "256")),
+                "coldStart": powertools_data.get("cold_start", True),
+                "version": os.getenv("AWS_LAMBDA_FUNCTION_VERSION", "$LATEST"),
+                "handler": powertools_data.get("function_name", os.getenv("AWS_LAMBDA_FUNCTION_NAME", "")),
+            },
+            "loggerName": "Logger",
+            "author": self.author,
+        }
+        custom_event.update({
+            k: v for k, v in powertools_data.items()
+            if k not in ["level", "location", "message", "timestamp", "service", "function_request_id",
+                         "function_memory_size", "cold_start", "function_name", "xray_trace_id",
+                         "exception", "exception_name", "stack_trace"]
+        })
+        return json.dumps(custom_event)
+
+
+class _Opaque:
+    def __str__(self):
+        return "opaque-object"
+
+
+def _record(message, args=None, extra=None, exc_info=None, level=logging.INFO):
+    logger = logging.getLogger("formatter-test")
+    return logger.makeRecord("formatter-test", level, __file__, 10, message, args, exc_info, "fn", extra)
+
+
+def _exc_info():
+    try:
+        error = ValueError("boom")
+        error.add_note("nota de contexto")
+        raise error
+    except ValueError:
+        return sys.exc_info()
+
+
+RECORDS = {
+    "plain": lambda: _record("- Obteniendo documento"),
+    "percent-args": lambda: _record("Documento %s en %d ms", ("123", 45)),
+    "dict-message": lambda: _record({"step": "extract", "count": 3}),
+    "json-string-message": lambda: _record('{"step": "extract"}'),
+    "metric-extra": lambda: _record(" METRIC : sync_skip_rate", extra={"metric": "sync_skip_rate", "value": 0.25}),
+    "non-json-extras": lambda: _record("extras", extra={
+        "when": datetime.datetime(2026, 1, 2, 3, 4, 5),
+        "amount": decimal.Decimal("1.50"),
+        "pair": ("a", 1),
+        "opaque": _Opaque(),
+        "missing": None,
+    }),
+    "extra-overrides-custom-keys": lambda: _record("override", extra={"author": "extract", "loggerName": "Child"}),
+    "exception-with-notes": lambda: _record("fallo", exc_info=_exc_info(), level=logging.ERROR),
+    "warning": lambda: _record("aviso", level=logging.WARNING),
+}
+
+
+@pytest.fixture
+def lambda_env(monkeypatch):
+    monkeypatch.setenv("ENV", "qa")
+    monkeypatch.setenv("AWS_LAMBDA_FUNCTION_VERSION", "7")
+    monkeypatch.setenv("AWS_LAMBDA_FUNCTION_MEMORY_SIZE", "1024")
+    monkeypatch.setenv("AWS_LAMBDA_FUNCTION_NAME", "lmb-etl-process")
+    monkeypatch.setenv("_X_AMZN_TRACE_ID", "Root=1-5759e988-bd862e3fe1be46a994272793;Parent=1;Sampled=1")
+
+
+@pytest.mark.parametrize("with_keys", [False, True], ids=["no-keys", "append-keys"])
+@pytest.mark.parametrize("name", list(RECORDS))
+def test_one_pass_formatter_matches_legacy_output(lambda_env, name, with_keys):
+    legacy = _LegacyFormatter("etl-process", author="process")
+    current = CustomPowertoolsFormatter("etl-process", author="process")
+    if with_keys:
+        for formatter in (legacy, current):
+            formatter.append_keys(function_request_id="req-1", cold_start=False, page_id="42")
+    record = RECORDS[name]()
+
+    assert current.format(record) == legacy.format(record)
+
+
+@pytest.mark.benchmark
+def test_benchmark_one_pass_formatter(lambda_env):
+    records = [_record(" METRIC : sync_skip_rate", extra={"metric": "sync_skip_rate", "value": 0.25, "page": i})
+               for i in range(3000)]
+    rates = {}
+    formatters = {"legacy": _LegacyFormatter("etl-process"), "one-pass": CustomPowertoolsFormatter("etl-process")}
+    for name, formatter in formatters.items():
+        started = time.perf_counter()
+        for record in records:
+            formatter.format(record)
+        rates[name] = len(records) / (time.perf_counter() - started)
+
+    print(f"\nlegacy: {rates['legacy']:.0f} registros/s, one-pass: {rates['one-pass']:.0f} registros/s")
@@ -0,0 +1,116 @@
+import io
+import json
+import time
+import uuid
+
+import pytest
+
+from app.src.shared.logger import powertools_logger
+from app.src.shared.logger.powertools_logger import IOLambdaLogger
+
+
+@pytest.fixture
+def lambda_env(monkeypatch):
+    monkeypatch.setenv("POWERTOOLS_TRACE_DISABLED", "1")
+    monkeypatch.delenv("_X_AMZN_TRACE_ID", raising=False)
+
+
+def _parent(environment="dev", log_level="INFO"):
+    # Nombre de servicio único por test: Powertools reutiliza el logger por nombre
+    parent = IOLambdaLogger(f"logger-test-{uuid.uuid4().hex[:8]}", environment=environment, log_level=log_level)
+    stream = io.StringIO()
+    for handler in parent.get_logger().handlers:
+        handler.setStream(stream)
+    return parent, stream
+
+
+def _records(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_children_share_the_parent_handlers_and_formatter(lambda_env):
+    parent, _ = _parent()
+    underlying = parent.get_logger()
+    handlers = list(underlying.handlers)
+
+    # Invocaciones warm: un hijo nuevo por invocación
+    children = [parent.create_child({"author": f"user-{i}", "loggerName": "Process"}) for i in range(50)]
+
+    assert all(child.get_logger() is underlying for child in children)
+    assert underlying.handlers == handlers
+    assert [handler.formatter for handler in underlying.handlers] == [parent.custom_formatter] * len(handlers)
+
+
+def test_creating_children_keeps_the_parent_level(lambda_env):
+    parent, stream = _parent(environment="dev", log_level="INFO")
+
+    parent.create_child({"author": "process"})
+    parent.create_child({"author": "extract"}).create_child({"loggerName": "Nested"})
+    parent.info("- Padre sigue emitiendo")
+
+    assert [record["message"] for record in _records(stream)] == ["- Padre sigue emitiendo"]
+
+
+def test_bound_keys_appear_in_child_records_and_do_not_leak(lambda_env):
+    parent, stream = _parent()
+    child = parent.create_child({"author": "process", "loggerName": "Process"})
+
+    child.info("- Hijo")
+    parent.info("- Padre")
+
+    child_record, parent_record = _records(stream)
+    assert (child_record["author"], child_record["loggerName"]) == ("process", "Process")
+    assert (parent_record["author"], parent_record["loggerName"]) == ("", "Logger")
+
+
+def test_call_extra_overrides_bound_keys(lambda_env):
+    parent, stream = _parent()
+    child = parent.create_child({"author": "process", "page_id": "1"})
+
+    child.info("- Con extra", extra={"page_id": "42", "metric": "m"})
+    child.info("- Sin extra")
+
+    with_extra, without_extra = _records(stream)
+    assert (with_extra["author"], with_extra["page_id"], with_extra["metric"]) == ("process", "42", "m")
+    assert without_extra["page_id"] == "1" and "metric" not in without_extra
+
+
+def test_grandchildren_merge_bound_keys(lambda_env):
+    parent, stream = _parent()
+    child = parent.create_child({"author": "process", "loggerName": "Process"})
+    grandchild = child.create_child({"loggerName": "Confluence"})
+    grandchild.set_author("extract")
+
+    grandchild.info("- Nieto")
+    child.info("- Hijo")
+
+    grandchild_record, child_record = _records(stream)
+    assert (grandchild_record["author"], grandchild_record["loggerName"]) == ("extract", "Confluence")
+    assert (child_record["author"], child_record["loggerName"]) == ("process", "Process")
+
+
+def test_child_creation_builds_no_logger_or_tracer(lambda_env, monkeypatch):
+    parent, _ = _parent()
+    monkeypatch.setattr(powertools_logger, "Logger", lambda *args, **kwargs: pytest.fail("Logger"))
+    monkeypatch.setattr(powertools_logger, "Tracer", lambda *args, **kwargs: pytest.fail("Tracer"))
+
+    parent.create_child({"author": "process"}).create_child({"loggerName": "Nested"})
+
+
+@pytest.mark.benchmark
+def test_benchmark_child_creation_vs_full_logger(lambda_env):
+    parent, _ = _parent()
+    iterations = 500
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        parent.create_child({"author": "process", "loggerName": "Process"})
+    child_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        IOLambdaLogger(parent.service, environment="dev", log_level="INFO")
+    full_seconds = time.perf_counter() - started
+
+    print(f"\nhijo: {child_seconds * 1e6 / iterations:.1f} us, "
+          f"logger completo: {full_seconds * 1e6 / iterations:.1f} us")
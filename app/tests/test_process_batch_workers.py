@@ -0,0 +1,87 @@
+import json
+import types
+
+import pytest
+
+from app.src.infraestructure.entrypoints.etl_process import handler as process_handler
+
+CONTEXT = types.SimpleNamespace(aws_request_id="req")
+
+
+@pytest.mark.parametrize("batch_max_workers, pool_maxsize, record_count, expected", [
+    (8, 16, 10, 8),
+    (32, 16, 40, 16),
+    (32, 16, 3, 3),
+    (8, 16, 0, 1),
+])
+def test_batch_workers_never_exceed_the_confluence_pool(monkeypatch, batch_max_workers, pool_maxsize,
+                                                        record_count, expected):
+    monkeypatch.setattr(process_handler, "PROCESS_BATCH_MAX_WORKERS", batch_max_workers)
+    monkeypatch.setattr(process_handler, "CONFLUENCE_POOL_MAXSIZE", pool_maxsize)
+
+    assert process_handler._batch_workers(record_count) == expected
+
+
+class _RecordingUseCase:
+    """Falla las páginas de failing_page_ids; registra las procesadas."""
+
+    def __init__(self, failing_page_ids=()):
+        self.failing_page_ids = set(failing_page_ids)
+        self.processed = []
+
+    def skip_counts(self):
+        return 0, 0
+
+    def skip_rate(self, since=(0, 0)):
+        return 0.0
+
+    def process(self, event):
+        if event.document_id in self.failing_page_ids:
+            raise ValueError(f"Confluence 500 para {event.document_id}")
+        self.processed.append((event.document_id, event.event_type.value))
+
+
+def _sqs_record(message_id, body):
+    record = {"body": json.dumps(body)}
+    if message_id:
+        record["messageId"] = message_id
+    return record
+
+
+@pytest.fixture
+def use_case(monkeypatch):
+    use_case = _RecordingUseCase(failing_page_ids={"2", "4"})
+    monkeypatch.setattr(process_handler._use_case_graph, "get", lambda config: use_case)
+    return use_case
+
+
+
+def test_batch_reports_only_the_failed_records(use_case):
+    records = [
+        _sqs_record("m1", {"page_id": "1", "event_type": "updated"}),
+        _sqs_record("m2", {"page_id": "2", "event_type": "updated"}),
+        # EventBridge -> SQS: el evento llega en "detail"
+        _sqs_record("m3", {"source": "confluence", "detail": {"page_id": "3", "event_type": "deleted"}}),
+        _sqs_record("m4", {"detail": {"page_id": "4", "event_type": "updated"}}),
+        _sqs_record("m5", {"page_id": "5"}),
+    ]
+
+    result = process_handler.batch_handler({"Records": records}, CONTEXT)
+
+    assert result == {"batchItemFailures": [{"itemIdentifier": "m2"}, {"itemIdentifier": "m4"},
+                                            {"itemIdentifier": "m5"}]}
+    assert sorted(use_case.processed) == [("1", "updated"), ("3", "deleted")]
+
+
+def test_failed_record_without_message_id_fails_the_whole_batch(use_case):
+    records = [_sqs_record("m1", {"page_id": "1", "event_type": "updated"}),
+               _sqs_record(None, {"page_id": "2", "event_type": "updated"})]
+
+    with pytest.raises(ValueError, match="sin messageId"):
+        process_handler.batch_handler({"Records": records}, CONTEXT)
+
+
+def test_successful_record_without_message_id_is_not_an_error(use_case):
+    records = [_sqs_record(None, {"page_id": "1", "event_type": "updated"})]
+
+    assert process_handler.batch_handler({"Records": records}, CONTEXT) == {"batchItemFailures": []}
@@ -0,0 +1,74 @@
+import importlib
+import json
+import types
+
+import boto3
+import pytest
+
+from app.src.application.ports.process.process_use_case import ProcessUseCaseInterface
+from app.src.application.ports.shared.logger_interface import LoggerInterface
+from app.src.infraestructure.adapters.etls.step_function_trigger import StepFunctionTriggerAdapter
+from app.src.infraestructure.adapters.repositories.confluence_api import ConfluenceAPIAdapter
+from app.src.infraestructure.adapters.repositories.secrets_manager_adapter import SecretsManagerAdapter
+
+BUCKET = "landing-test"
+SECRET_NAME = "confluence-test"
+CONTEXT = types.SimpleNamespace(aws_request_id="req-1", function_name="lmb-process", memory_limit_in_mb=256,
+                                invoked_function_arn="arn:aws:lambda:us-east-1:123456789012:function:lmb-process")
+EVENT = {"page_id": "42", "event_type": "updated"}
+
+
+@pytest.fixture
+def process_handler(aws, monkeypatch):
+    monkeypatch.setenv("POWERTOOLS_TRACE_DISABLED", "1")
+    monkeypatch.setenv("AWS_S3_BUCKET_NAME", BUCKET)
+    monkeypatch.setenv("CONFLUENCE_SECRET_NAME", SECRET_NAME)
+    boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET)
+    boto3.client("secretsmanager", region_name="us-east-1").create_secret(
+        Name=SECRET_NAME, SecretString=json.dumps({"api_token": "token", "user_api_mail": "mail"}))
+
+    calls = {"clients": [], "secrets": []}
+    real_client, real_get_secret = boto3.client, SecretsManagerAdapter.get_secret
+    monkeypatch.setattr(boto3, "client",
+                        lambda name, *args, **kwargs: calls["clients"].append(name)
+                        or real_client(name, *args, **kwargs))
+    monkeypatch.setattr(SecretsManagerAdapter, "get_secret",
+                        lambda self, name: calls["secrets"].append(name) or real_get_secret(self, name))
+    # Cada request lee las credenciales a través del cache de secretos
+    monkeypatch.setattr(ConfluenceAPIAdapter, "get_page",
+                        lambda self, page_id: self._get_auth() and {"id": page_id, "title": "t"})
+    monkeypatch.setattr(StepFunctionTriggerAdapter, "trigger", lambda self, *args: None)
+
+    # Recarga para construir el contenedor con el entorno del test (cold start)
+    from app.src.infraestructure.entrypoints.process import handler
+    yield importlib.reload(handler), calls
+
+
+def test_warm_invocations_create_no_clients_and_read_no_secrets(process_handler):
+    handler, calls = process_handler
+
+    assert handler.handler(EVENT, CONTEXT)["statusCode"] == 200
+    cold_clients, cold_secrets = list(calls["clients"]), list(calls["secrets"])
+    for _ in range(3):
+        assert handler.handler(EVENT, CONTEXT)["statusCode"] == 200
+
+    assert sorted(cold_clients) == ["s3", "secretsmanager", "stepfunctions"]
+    assert cold_secrets == [SECRET_NAME]
+    assert calls["clients"] == cold_clients
+    assert calls["secrets"] == cold_secrets
+
+
+def test_use_case_receives_the_scoped_child_logger(process_handler):
+    handler, _ = process_handler
+    services = handler._services
+
+    with services.create_scope() as first, services.create_scope() as second:
+        first_use_case = services.get(ProcessUseCaseInterface, first)
+        second_use_case = services.get(ProcessUseCaseInterface, second)
+
+        assert first_use_case.logger is services.get(LoggerInterface, first)
+        assert first_use_case.logger is not second_use_case.logger
+        assert first_use_case.logger.get_logger() is handler.io_logger.get_logger()
+    # Los adapters siguen siendo singletons compartidos entre invocaciones
+    assert first_use_case.landing_zone is second_use_case.landing_zone
+    assert first_use_case.document_source is second_use_case.document_source
@@ -0,0 +1,157 @@
+import boto3
+import pytest
+
+from app.src.application.usecases.etl_extract_use_case import ExtractDocumentUseCase
+from app.src.domain.model.document_event import DocumentEvent, DocumentEventType
+from app.src.infraestructure.adapters.repositories.object_codecs import create_object_codec
+from app.src.infraestructure.adapters.repositories.s3_repository import S3RepositoryAdapter
+
+BUCKET = "ground-test"
+PATH = "ground"
+# Un set no es serializable a JSON: la escritura de este objeto falla
+UNSERIALIZABLE = {"value": {1, 2}}
+
+
+@pytest.fixture
+def s3(aws):
+    client = boto3.client("s3", region_name="us-east-1")
+    client.create_bucket(Bucket=BUCKET)
+    yield client
+
+
+def _adapter(codec="identity", **kwargs):
+    return S3RepositoryAdapter(BUCKET, PATH, "us-east-1", codec=create_object_codec(codec), **kwargs)
+
+
+def _keys(s3):
+    return sorted(item["Key"] for item in s3.list_objects_v2(Bucket=BUCKET).get("Contents", []))
+
+
+def test_rollback_restores_overwritten_objects(s3):
+    adapter = _adapter()
+    adapter.save("1.html", {"version": 1})
+    before = s3.get_object(Bucket=BUCKET, Key=f"{PATH}/1.html")
+
+    with pytest.raises(ValueError, match="revertido"):
+        adapter.save_many({"1.html": {"version": 2}, "1.metadata.html": UNSERIALIZABLE}, all_or_nothing=True)
+
+    after = s3.get_object(Bucket=BUCKET, Key=f"{PATH}/1.html")
+    assert adapter.get_document(f"s3://{BUCKET}/{PATH}/1.html") == {"version": 1}
+    assert after["ContentType"] == before["ContentType"]
+    assert _keys(s3) == [f"{PATH}/1.html"]
+
+
+def test_rollback_keeps_the_encoding_of_the_previous_version(s3):
+    _adapter("gzip").save("1.html", {"version": 1})
+
+    with pytest.raises(ValueError):
+        _adapter().save_many({"1.html": {"version": 2}, "2.html": UNSERIALIZABLE}, all_or_nothing=True)
+
+    restored = s3.get_object(Bucket=BUCKET, Key=f"{PATH}/1.html")
+    assert restored["ContentEncoding"] == "gzip"
+    assert restored["Metadata"] == {"codec": "gzip"}
+    assert _adapter().get_document(f"s3://{BUCKET}/{PATH}/1.html") == {"version": 1}
+
+
+def test_rollback_deletes_objects_that_did_not_exist(s3):
+    with pytest.raises(ValueError):
+        _adapter().save_many({"1.html": {"version": 1}, "1.metadata.html": UNSERIALIZABLE}, all_or_nothing=True)
+
+    assert _keys(s3) == []
+
+
+def test_rollback_leaves_unchanged_objects_untouched(s3):
+    adapter = _adapter(skip_unchanged=True)
+    adapter.save("1.html", {"version": 1})
+    last_modified = s3.head_object(Bucket=BUCKET, Key=f"{PATH}/1.html")["LastModified"]
+
+    with pytest.raises(ValueError):
+        adapter.save_many({"1.html": {"version": 1}, "2.html": UNSERIALIZABLE}, all_or_nothing=True)
+
+    assert s3.head_object(Bucket=BUCKET, Key=f"{PATH}/1.html")["LastModified"] == last_modified
+
+
+def test_best_effort_reports_errors_without_reverting(s3):
+    adapter = _adapter()
+    adapter.save("1.html", {"version": 1})
+
+    results = adapter.save_many({"1.html": {"version": 2}, "2.html": UNSERIALIZABLE})
+
+    assert [bool(result["error"]) for result in results] == [False, True]
+    assert adapter.get_document(f"s3://{BUCKET}/{PATH}/1.html") == {"version": 2}
+
+
+def test_successful_all_or_nothing_results_do_not_expose_snapshots(s3):
+    adapter = _adapter()
+    adapter.save("1.html", {"version": 1})
+
+    results = adapter.save_many({"1.html": {"version": 2}, "2.html": {"version": 1}}, all_or_nothing=True)
+
+    assert [sorted(result) for result in results] == [["error", "key", "request_id", "skipped", "uri"]] * 2
+    assert adapter.get_document(f"s3://{BUCKET}/{PATH}/1.html") == {"version": 2}
+
+
+def _count_calls(adapter):
+    calls = {}
+
+    def count(event_name, **kwargs):
+        operation = event_name.rsplit(".", 1)[-1]
+        calls[operation] = calls.get(operation, 0) + 1
+
+    adapter.s3_client.meta.events.register("before-call.s3", count)
+    return calls
+
+
+def test_best_effort_ground_truth_write_is_one_put_per_object(s3):
+    adapter = _adapter()
+    calls = _count_calls(adapter)
+
+    adapter.save_many({"1.html": {"version": 1}, "1.metadata.html": {"page_id": "1"}})
+
+    assert calls == {"PutObject": 2}
+
+
+def test_skip_unchanged_reuses_a_single_head_per_object(s3):
+    adapter = _adapter(skip_unchanged=True)
+    contents = {"1.html": {"version": 1}, "1.metadata.html": {"page_id": "1"}}
+    calls = _count_calls(adapter)
+
+    adapter.save_many(contents, all_or_nothing=True)
+    first_write = dict(calls)
+    calls.clear()
+    results = adapter.save_many(contents, all_or_nothing=True)
+
+    # Objetos nuevos: no hay cuerpo previo que leer
+    assert first_write == {"HeadObject": 2, "PutObject": 2}
+    assert calls == {"HeadObject": 2}
+    assert all(result["skipped"] for result in results)
+
+
+def test_all_or_nothing_on_a_versioned_bucket_reverts_without_reading_bodies(s3):
+    s3.put_bucket_versioning(Bucket=BUCKET, VersioningConfiguration={"Status": "Enabled"})
+    adapter = _adapter()
+    adapter.save("1.html", {"version": 1})
+    calls = _count_calls(adapter)
+
+    with pytest.raises(ValueError, match="revertido"):
+        adapter.save_many({"1.html": {"version": 2}, "2.html": {"version": 1}, "3.html": UNSERIALIZABLE},
+                          all_or_nothing=True)
+
+    assert "GetObject" not in calls
+    assert adapter.get_document(f"s3://{BUCKET}/{PATH}/1.html") == {"version": 1}
+    assert _keys(s3) == [f"{PATH}/1.html"]
+
+
+class _UnserializableMetadataExtractor:
+    def extract_data(self, document_object):
+        return {"page_id": "1"}, UNSERIALIZABLE
+
+
+def test_extract_fails_when_a_best_effort_ground_truth_write_fails(s3):
+    use_case = ExtractDocumentUseCase(None, _UnserializableMetadataExtractor(), _adapter())
+
+    with pytest.raises(ValueError, match="ground truth"):
+        use_case.extract_page(DocumentEvent("1", DocumentEventType.UPDATED), {})
+
+    # Sin all_or_nothing no se revierte: el reintento de la extracción reescribe ambos objetos
+    assert _keys(s3) == [f"{PATH}/1.html"]
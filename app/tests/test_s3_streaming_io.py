@@ -0,0 +1,135 @@
+import json
+
+import boto3
+import pytest
+
+from app.src.infraestructure.adapters.repositories import s3_repository
+from app.src.infraestructure.adapters.repositories.object_codecs import create_object_codec
+from app.src.infraestructure.adapters.repositories.s3_repository import MIN_MULTIPART_PART_SIZE, S3RepositoryAdapter
+
+BUCKET = "landing-test"
+PATH = "landing"
+MIB = 1024 * 1024
+
+
+@pytest.fixture
+def s3(aws):
+    client = boto3.client("s3", region_name="us-east-1")
+    client.create_bucket(Bucket=BUCKET)
+    yield client
+
+
+def _adapter(codec="identity"):
+    # Umbral y parte mínimos permitidos por S3 para mantener los objetos de prueba pequeños
+    return S3RepositoryAdapter(BUCKET, PATH, "us-east-1", multipart_threshold=MIN_MULTIPART_PART_SIZE,
+                               part_size=MIN_MULTIPART_PART_SIZE, codec=create_object_codec(codec))
+
+
+def _count_calls(adapter):
+    calls = {}
+
+    def count(event_name, **kwargs):
+        operation = event_name.rsplit(".", 1)[-1]
+        calls[operation] = calls.get(operation, 0) + 1
+
+    adapter.s3_client.meta.events.register("before-call.s3", count)
+    return calls
+
+
+def _large_page(size):
+    return {"id": "1", "title": "Página grande", "body": {"storage": {"value": "ñ<p>x</p>" * (size // 9)}}}
+
+
+def test_small_documents_use_a_single_put(s3):
+    adapter = _adapter()
+    calls = _count_calls(adapter)
+
+    adapter.save("page.json", {"id": "1", "title": "ñandú", "ratio": 0.5})
+
+    assert calls == {"PutObject": 1}
+
+
+def test_large_documents_are_streamed_in_parts(s3, monkeypatch):
+    adapter = _adapter()
+    calls = _count_calls(adapter)
+    page = _large_page(12 * MIB)
+    with monkeypatch.context() as patch:
+        # Sobre el umbral no se construye el JSON completo
+        patch.setattr(s3_repository.json, "dumps", lambda *args, **kwargs: pytest.fail("json.dumps"))
+        uri = adapter.save("page.json", page)["uri"]
+
+    assert calls["UploadPart"] == 3
+    assert calls["CompleteMultipartUpload"] == 1
+    assert "PutObject" not in calls
+    assert s3.head_object(Bucket=BUCKET, Key=f"{PATH}/page.json")["ETag"].endswith('-3"')
+    assert adapter.get_document(uri) == page
+
+
+def test_buffered_documents_above_the_threshold_are_also_uploaded_in_parts(s3):
+    # Sin cadenas grandes la estimación no alcanza el umbral: se serializa de una vez y se sube en partes
+    adapter = _adapter()
+    calls = _count_calls(adapter)
+    page = {"values": list(range(1_000_000, 2_000_000))}
+
+    uri = adapter.save("numbers.json", page)["uri"]
+
+    assert calls["UploadPart"] == 2
+    assert adapter.get_document(uri) == page
+
+
+def test_compressed_multipart_round_trip(s3):
+    adapter = _adapter("gzip")
+    page = {"id": "1", "blocks": [f"<p>bloque {index} {'x' * (index % 97)}</p>" for index in range(400_000)]}
+
+    uri = adapter.save("page.json", page)["uri"]
+
+    assert s3.head_object(Bucket=BUCKET, Key=f"{PATH}/page.json")["ContentEncoding"] == "gzip"
+    assert adapter.get_document(uri) == page
+
+
+def test_failed_part_aborts_the_multipart_upload(s3):
+    adapter = _adapter()
+    calls = _count_calls(adapter)
+
+    def fail_second_part(params, **kwargs):
+        if params["PartNumber"] == 2:
+            raise ConnectionError("conexión cerrada")
+
+    adapter.s3_client.meta.events.register("provide-client-params.s3.UploadPart", fail_second_part)
+
+    with pytest.raises(ValueError, match="conexión cerrada"):
+        adapter.save("page.json", _large_page(12 * MIB))
+
+    assert calls["AbortMultipartUpload"] == 1
+    assert s3.list_multipart_uploads(Bucket=BUCKET).get("Uploads", []) == []
+    assert s3.list_objects_v2(Bucket=BUCKET).get("KeyCount") == 0
+
+
+@pytest.mark.parametrize("codec", ["identity", "gzip", "zstd"])
+def test_streaming_read_matches_the_buffered_decoder(s3, monkeypatch, codec):
+    page = {"id": "1", "title": "Título ñ ☃", "ratio": 0.1, "count": 2 ** 40, "nested": [{"a": None}, True],
+            "body": {"storage": {"value": "<p>" + "texto " * 50_000 + "</p>"}}}
+    adapter = _adapter(codec)
+    # Fragmentos pequeños: el cuerpo se decodifica en muchas lecturas
+    adapter.read_chunk_size = 1024
+    uri = adapter.save("page.json", page)["uri"]
+    calls = _count_calls(adapter)
+
+    streamed = adapter.get_document(uri)
+    monkeypatch.setattr(s3_repository, "ijson", None)
+    buffered = adapter.get_document(uri)
+
+    assert calls == {"GetObject": 2}
+    assert streamed == buffered == page
+    assert json.dumps(streamed) == json.dumps(page)
+
+
+def test_integers_beyond_64_bits_are_read_with_json_loads(s3):
+    adapter = _adapter()
+    page = {"id": "1", "big": 2 ** 70}
+    uri = adapter.save("page.json", page)["uri"]
+    calls = _count_calls(adapter)
+
+    assert adapter.get_document(uri) == page
+    # yajl2_c rechaza el entero; se relee el objeto y se decodifica completo
+    assert calls["GetObject"] == (2 if getattr(s3_repository.ijson, "backend", None) == "yajl2_c" else 1)
@@ -0,0 +1,153 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.src.infraestructure.entrypoints.etl_ingestion import handler as ingestion_handler
+
+STATE_MACHINE = json.loads((Path(__file__).parents[2] / "step-function.json").read_text(encoding="utf-8"))
+STATES = STATE_MACHINE["States"]
+
+
+def _get(data, path):
+    value = data
+    for part in path.lstrip("$.").split("."):
+        if not isinstance(value, dict) or part not in value:
+            raise KeyError(path)
+        value = value[part]
+    return value
+
+
+def _set(data, path, value):
+    parts = path.lstrip("$.").split(".")
+    target = data
+    for part in parts[:-1]:
+        target = target.setdefault(part, {})
+    target[parts[-1]] = value
+
+
+def _matches(rule, data):
+    if "And" in rule:
+        return all(_matches(inner, data) for inner in rule["And"])
+    try:
+        value = _get(data, rule["Variable"])
+    except KeyError:
+        return rule.get("IsPresent") is False
+    if "IsPresent" in rule:
+        return rule["IsPresent"]
+    if "BooleanEquals" in rule:
+        return value is rule["BooleanEquals"]
+    raise NotImplementedError(rule)
+
+
+def _run_after_extract(extract_body, stop_at=("EnqueueIngestionChange", "Success", "formatError")):
+    """Recorre la máquina desde la salida del extract; retorna los estados visitados."""
+    data = {"invokeLmbExtractDoc": {"Payload": {"statusCode": 200, "body": json.dumps(extract_body)}}}
+    visited = []
+    name = STATES["InvokeLambdaExtractDocument"]["Next"]
+    while name not in stop_at:
+        visited.append(name)
+        state = STATES[name]
+        if state["Type"] == "Pass":
+            if "Parameters" in state:
+                result = {}
+                for key, expression in state["Parameters"].items():
+                    assert expression.startswith("States.StringToJson(")
+                    result[key[:-2]] = json.loads(_get(data, expression[len("States.StringToJson("):-1]))
+            else:
+                result = state["Result"]
+            _set(data, state["ResultPath"], result)
+            name = state["Next"]
+        elif state["Type"] == "Choice":
+            name = next((choice["Next"] for choice in state["Choices"] if _matches(choice, data)), state["Default"])
+        else:
+            raise NotImplementedError(state["Type"])
+    return visited + [name]
+
+
+def test_skipped_extract_is_not_enqueued_for_ingestion():
+    path = _run_after_extract({"document_id": "1", "skipped": True})
+
+    assert path[-1] == "Success"
+    assert "EnqueueIngestionChange" not in path
+
+
+@pytest.mark.parametrize("extract_body", [
+    {"document_id": "1", "skipped": False},
+    {"error": "sin campo skipped"},
+])
+def test_changed_or_unknown_extract_is_enqueued_for_ingestion(extract_body):
+    assert _run_after_extract(extract_body)[-1] == "EnqueueIngestionChange"
+
+
+def test_deleted_pages_are_enqueued_for_ingestion():
+    assert STATES["DeleteObjectEventDeleted"]["Next"] == "EnqueueIngestionChange"
+
+
+def test_executions_do_not_start_or_poll_ingestion_jobs():
+    # El coordinador de ingesta agrupa los cambios: ninguna ejecución lanza su propio job
+    resources = [state.get("Resource", "") for state in STATES.values()]
+
+    assert not any("bedrockagent" in resource for resource in resources)
+    assert not any(state["Type"] == "Wait" for state in STATES.values())
+
+
+def test_enqueued_message_matches_the_ingestion_handler_contract():
+    body = STATES["EnqueueIngestionChange"]["Parameters"]["MessageBody"]
+
+    assert body["document_id.$"] == "$.state_input.document_id"
+    assert body["event_type.$"] == "$.state_input.event_type"
+    assert body["task_token.$"] == "$$.Task.Token"
+
+
+def test_execution_waits_for_the_ingestion_callback():
+    # El resultado del job llega con SendTaskSuccess / SendTaskFailure desde etl_ingestion
+    state = STATES["EnqueueIngestionChange"]
+
+    assert state["Resource"] == "arn:aws:states:::sqs:sendMessage.waitForTaskToken"
+    assert state["TimeoutSeconds"] == ingestion_handler.INGESTION_CALLBACK_TIMEOUT_SECONDS
+    assert [catch["Next"] for catch in state["Catch"]] == ["formatError"]
+
+
+@pytest.mark.parametrize("event_type, expected", [
+    ("updated", ["ChoiceIngestionEventType", "PENDposteoComment", "ingestionJobCompleted", "notifyEvent"]),
+    ("deleted", ["ChoiceIngestionEventType", "ingestionJobCompleted", "notifyEvent"]),
+])
+def test_completed_callback_notifies_the_event(event_type, expected):
+    data = {"state_input": {"event_type": event_type},
+            "configConstants": STATES["PassConfigConstants"]["Parameters"]}
+    visited = []
+    name = STATES["EnqueueIngestionChange"]["Next"]
+    while name != "notifyEvent":
+        visited.append(name)
+        state = STATES[name]
+        if state["Type"] == "Choice":
+            name = next((choice["Next"] for choice in state["Choices"]
+                         if _get(data, choice["Variable"]) == _get(data, choice["StringEqualsPath"])),
+                        state["Default"])
+        else:
+            name = state["Next"]
+
+    assert visited + [name] == expected
+
+
+def _targets(state):
+    return [state.get("Next"), state.get("Default")] + [choice["Next"] for choice in state.get("Choices", [])] \
+        + [catch["Next"] for catch in state.get("Catch", [])]
+
+
+def test_every_next_state_exists():
+    for state in STATES.values():
+        assert all(target in STATES for target in _targets(state) if target)
+
+
+def test_every_state_is_reachable():
+    # Step Functions rechaza definiciones con estados inalcanzables
+    reachable, pending = set(), [STATE_MACHINE["StartAt"]]
+    while pending:
+        name = pending.pop()
+        if name not in reachable:
+            reachable.add(name)
+            pending += [target for target in _targets(STATES[name]) if target]
+
+    assert reachable == set(STATES)
@@ -0,0 +1,65 @@
+import logging
+import types
+
+from app.src.application.usecases.etl_process_use_case import ProcessUseCase
+from app.src.infraestructure.adapters.repositories.in_memory_sync_manifest import InMemorySyncManifestAdapter
+from app.src.infraestructure.entrypoints.etl_process import handler as process_handler
+
+
+class _FakeSource:
+    def get_page(self, page_id):
+        return {"id": page_id, "version": {"number": 1}, "body": {"storage": {"value": "<p>x</p>"}}}
+
+
+class _FakeLanding:
+    def save(self, object_key, page_data):
+        return {"uri": f"s3://landing/{object_key}"}
+
+
+def _use_case():
+    return ProcessUseCase(_FakeSource(), _FakeLanding(), None, InMemorySyncManifestAdapter())
+
+
+def _skip_metrics(caplog):
+    return [record for record in caplog.records if getattr(record, "metric", None) == "sync_skip_rate"]
+
+
+def test_skip_rate_since_snapshot_only_counts_new_pages():
+    use_case = _use_case()
+    for page_id in ("1", "2", "1", "2"):
+        use_case.process(process_handler._build_document_event({"page_id": page_id, "event_type": "updated"}))
+    snapshot = use_case.skip_counts()
+
+    use_case.process(process_handler._build_document_event({"page_id": "3", "event_type": "updated"}))
+
+    assert use_case.skip_rate() == 2 / 5
+    assert use_case.skip_rate(snapshot) == 0.0
+
+
+def test_handler_logs_skip_rate_of_the_current_invocation(monkeypatch, caplog):
+    use_case = _use_case()
+    monkeypatch.setattr(process_handler._use_case_graph, "get", lambda config: use_case)
+    context = types.SimpleNamespace(aws_request_id="req")
+    caplog.set_level(logging.INFO, logger=process_handler.logger.name)
+
+    for _ in range(3):
+        process_handler.handler({"page_id": "1", "event_type": "updated"}, context)
+    process_handler.handler({"page_id": "2", "event_type": "updated"}, context)
+
+    metrics = _skip_metrics(caplog)
+    assert [record.value for record in metrics] == [0.0, 1.0, 1.0, 0.0]
+    assert all(record.processed == 1 for record in metrics)
+
+
+def test_batch_handler_logs_skip_rate_of_the_current_batch(monkeypatch, caplog):
+    use_case = _use_case()
+    monkeypatch.setattr(process_handler._use_case_graph, "get", lambda config: use_case)
+    context = types.SimpleNamespace(aws_request_id="req")
+    caplog.set_level(logging.INFO, logger=process_handler.logger.name)
+    records = [{"messageId": page_id, "body": f'{{"page_id": "{page_id}", "event_type": "updated"}}'}
+               for page_id in ("1", "2")]
+
+    process_handler.batch_handler({"Records": records}, context)
+    process_handler.batch_handler({"Records": records}, context)
+
+    assert [record.value for record in _skip_metrics(caplog)] == [0.0, 1.0]
@@ -0,0 +1,131 @@
+import json
+
+import boto3
+import pytest
+
+from app.src.shared.lifecycle.warm_object_graph import WarmObjectGraph
+
+
+class _RecordingConfig(dict):
+    """Config que registra qué claves lee el builder."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.read_keys = set()
+
+    def __getitem__(self, key):
+        self.read_keys.add(key)
+        return super().__getitem__(key)
+
+
+@pytest.fixture
+def confluence_secret(aws):
+    boto3.client("secretsmanager", region_name="us-east-1").create_secret(
+        Name="sm-io-ipkn-kno-exchange-confluence-00",
+        SecretString=json.dumps({"api_token": "token", "user_api_mail": "user@example.com"}),
+    )
+    yield
+
+
+def test_reuses_instance_while_config_is_unchanged():
+    builds = []
+    graph = WarmObjectGraph(lambda config: builds.append(config) or object())
+
+    first = graph.get({"bucket": "a"})
+    second = graph.get({"bucket": "a"})
+
+    assert first is second
+    assert len(builds) == 1
+    assert graph.stats()["cold"] is False
+
+
+def test_rebuilds_when_any_config_value_changes():
+    graph = WarmObjectGraph(lambda config: object())
+
+    first = graph.get({"bucket": "a", "html_parser_backend": "html.parser"})
+    second = graph.get({"bucket": "a", "html_parser_backend": "lxml"})
+
+    assert first is not second
+    assert graph.build_count == 2
+    assert graph.stats()["cold"] is True
+
+
+def test_invalidate_forces_rebuild():
+    graph = WarmObjectGraph(lambda config: object())
+    first = graph.get({"bucket": "a"})
+
+    graph.invalidate()
+
+    assert graph.get({"bucket": "a"}) is not first
+
+
+@pytest.mark.parametrize("module_name", ["etl_process", "etl_extract_document", "etl_backfill"])
+def test_make_use_case_reads_every_setting_from_config_resource(confluence_secret, monkeypatch, module_name):
+    module = __import__(f"app.src.infraestructure.entrypoints.{module_name}.handler", fromlist=["handler"])
+    config = module._config_resource()
+    # Se activan todas las ramas del builder (modo directo y chunking)
+    for key in ("process_direct_mode", "extract_chunking"):
+        if key in config:
+            config[key] = "true"
+    recording = _RecordingConfig(config)
+
+    module._make_use_case(recording)
+
+    assert recording.read_keys == set(config)
+
+
+def test_empty_fingerprint_keys_build_once():
+    graph = WarmObjectGraph(lambda config: object(), fingerprint_keys=())
+    first = graph.get({"bucket": "a"})
+
+    assert graph.get({"bucket": "b"}) is first
+    assert graph.build_count == 1
+
+
+def test_rebuilds_only_when_a_fingerprinted_value_changes():
+    graph = WarmObjectGraph(lambda config: object(), fingerprint_keys=("knowledge_base_id",))
+    first = graph.get({"knowledge_base_id": "kb-1", "bucket": "a"})
+
+    assert graph.get({"knowledge_base_id": "kb-1", "bucket": "b"}) is first
+    assert graph.get({"knowledge_base_id": "kb-2", "bucket": "b"}) is not first
+    assert graph.build_count == 2
+
+
+@pytest.mark.parametrize("module_name, graph_names", [
+    ("etl_process", ["_use_case_graph"]),
+    ("etl_extract_document", ["_use_case_graph"]),
+    ("etl_backfill", ["_use_case_graph"]),
+    ("etl_ingestion", ["_queue_graph"]),
+])
+def test_graphs_built_from_environment_variables_are_not_fingerprinted(module_name, graph_names):
+    module = __import__(f"app.src.infraestructure.entrypoints.{module_name}.handler", fromlist=["handler"])
+
+    assert [getattr(module, name)._fingerprint_keys for name in graph_names] == [()] * len(graph_names)
+
+
+class _Settings:
+    def __init__(self):
+        self.values = {"knowledgeBaseId": "kb-1", "dataSourceId": "ds-1"}
+
+    def get_secret(self, name):
+        return dict(self.values)
+
+
+@pytest.mark.parametrize("module_name, graph_names", [
+    ("etl_delete_documents", ["_use_case_graph"]),
+    ("etl_ingestion", ["_coordinator_graph", "_notifier_graph"]),
+])
+def test_ssm_settings_changes_rebuild_the_graph(monkeypatch, module_name, graph_names):
+    module = __import__(f"app.src.infraestructure.entrypoints.{module_name}.handler", fromlist=["handler"])
+    settings = _Settings()
+    monkeypatch.setattr(module, "_settings_provider", settings)
+    first_config = module._config_resource()
+    settings.values["dataSourceId"] = "ds-2"
+    second_config = module._config_resource()
+
+    # Los settings de SSM son los únicos valores que cambian entre invocaciones
+    assert {key for key in first_config if first_config[key] != second_config[key]} <= set(module.SETTINGS_KEYS)
+    for name in graph_names:
+        graph = WarmObjectGraph(lambda config: object(), fingerprint_keys=getattr(module, name)._fingerprint_keys)
+        assert graph.get(first_config) is not graph.get(second_config)
+        assert graph.get(second_config) is graph.get(dict(second_config))